@@ -0,0 +1,56 @@
+import os
+import sys
+import time
+import random
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage import GSheetsStore, SIGHTING_COLUMNS, make_row
+from fake_gsheets import FakeGSheetsConnection
+
+# --- [save_data 쓰기 비용 벤치마크] ---
+# 기존 방식(전체 concat + conn.update) vs 행 추가(append_rows)를 기록 크기별로 비교
+# 실행: python benchmarks/bench_append.py
+
+SIZES = [100, 1000, 5000, 20000]
+REPEAT = 5
+
+
+def history(n):
+    rnd = random.Random(n)
+    rows = [make_row(rnd.randint(1, 602), f"새{i}", "미구분", "2024-05-01 07:30",
+                     round(rnd.uniform(33, 38), 5), round(rnd.uniform(126, 130), 5), None) for i in range(n)]
+    return pd.DataFrame(rows, columns=SIGHTING_COLUMNS)
+
+
+def legacy_save(conn, current_df, row):
+    updated_df = pd.concat([current_df, pd.DataFrame([row])], ignore_index=True)
+    conn.update(spreadsheet="fake", data=updated_df)
+
+
+def main():
+    print(f"{'rows':>7} | {'legacy ms':>10} {'bytes':>10} | {'append ms':>10} {'bytes':>8}")
+    for n in SIZES:
+        base = history(n)
+        row = make_row(1, "개리", "수컷", "2024-05-02 06:10", 37.5, 127.0, None)
+
+        conn = FakeGSheetsConnection(base.copy())
+        t0 = time.perf_counter()
+        for _ in range(REPEAT): legacy_save(conn, base, row)
+        legacy_ms = (time.perf_counter() - t0) / REPEAT * 1000
+        legacy_bytes = conn.bytes_sent // REPEAT
+
+        conn = FakeGSheetsConnection(base.copy())
+        store = GSheetsStore(conn, "fake")
+        store.append(row)  # 워크시트 핸들/헤더 워밍업
+        conn.bytes_sent = 0
+        t0 = time.perf_counter()
+        for _ in range(REPEAT): store.append(row)
+        append_ms = (time.perf_counter() - t0) / REPEAT * 1000
+        append_bytes = conn.bytes_sent // REPEAT
+
+        print(f"{n:>7} | {legacy_ms:>10.1f} {legacy_bytes:>10} | {append_ms:>10.1f} {append_bytes:>8}")
+
+
+if __name__ == "__main__":
+    main()
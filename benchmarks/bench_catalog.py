@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+import catalog
+
+# --- [카탈로그 로딩 벤치마크] ---
+# data.csv 파싱(기존 방식) vs 미리 구운 assets/catalog.pkl 로딩
+# 실행: python benchmarks/bench_catalog.py
+
+REPEAT = 20
+
+COLD_SNIPPET = """
+import time, sys
+sys.path.insert(0, {root!r})
+import pandas, catalog
+t0 = time.perf_counter()
+{call}
+print((time.perf_counter() - t0) * 1000)
+"""
+
+
+def warm(fn):
+    t0 = time.perf_counter()
+    for _ in range(REPEAT): fn()
+    return (time.perf_counter() - t0) / REPEAT * 1000
+
+
+def cold(call):
+    # 새 프로세스에서 한 번 (pandas import 비용은 양쪽 모두 제외)
+    out = subprocess.run([sys.executable, "-c", COLD_SNIPPET.format(root=ROOT, call=call)],
+                         capture_output=True, text=True, cwd=ROOT, check=True)
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    if not os.path.exists(catalog.ARTIFACT_FILE): catalog.write_artifact(catalog.build_catalog())
+    print(f"artifact: {os.path.getsize(catalog.ARTIFACT_FILE):,} bytes / csv: {os.path.getsize(catalog.CSV_FILE):,} bytes")
+    print(f"{'':>10} | {'warm ms':>8} | {'cold ms':>8}")
+    print(f"{'csv':>10} | {warm(catalog.build_catalog):>8.2f} | {cold('catalog.build_catalog()'):>8.2f}")
+    print(f"{'artifact':>10} | {warm(catalog.load_catalog):>8.2f} | {cold('catalog.load_catalog()'):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import os
+import sys
+import random
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import catalog
+from sighting_frame import SightingSchema
+from storage import SIGHTING_COLUMNS, make_row
+
+# --- [기록 프레임 메모리/변환 벤치마크] ---
+# 시트에서 읽은 그대로의 object 프레임 vs SightingSchema.normalize로 타입을 맞춘 프레임
+#  - 메모리(deep), 불러올 때 한 번 드는 변환 시간
+#  - 기존 방식(real_no를 apply(lambda)로, 과는 쓸 때마다 .map(FAMILY_MAP))과 비교
+# 실행: python benchmarks/bench_frame.py [행 수]
+
+ROWS = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+PLACES = ["주남저수지 (경상남도 창원시)", "서울특별시 중구", "순천만 (전라남도 순천시)", "강원특별자치도 강릉시", None]
+
+
+def history(n, names):
+    rnd = random.Random(n)
+    rows = []
+    for _ in range(n):
+        located = rnd.random() < 0.8
+        rows.append(make_row(rnd.randint(1, 602), rnd.choice(names), rnd.choice(["미구분", "수컷", "암컷"]),
+                             f"2024-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d} {rnd.randint(5, 19):02d}:{rnd.choice(['00', '30'])}",
+                             round(rnd.uniform(33, 38), 6) if located else None, round(rnd.uniform(126, 130), 6) if located else None,
+                             rnd.choice(PLACES)))
+    return pd.DataFrame(rows, columns=SIGHTING_COLUMNS).astype(object)
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000, out
+
+
+def mb(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+def main():
+    os.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    bird_map, family_map = catalog.load_bird_map()[:2]
+    schema = SightingSchema(bird_map, family_map, {})
+    raw = history(ROWS, list(bird_map))
+
+    def legacy():
+        df = raw.copy()
+        df['real_no'] = df['bird_name'].apply(lambda x: bird_map.get(str(x).strip(), 9999))
+        return df.sort_values(by='real_no', ascending=True)
+
+    legacy_ms, legacy_df = timed(legacy)
+    typed_ms, typed = timed(lambda: schema.normalize(raw))
+    print(f"{ROWS:,}행")
+    print(f"  메모리: 시트 그대로(object) {mb(legacy_df):6.1f} MB  ->  정규화 {mb(typed):5.1f} MB (과/희귀도 컬럼 포함)")
+    print(f"  불러올 때 한 번: 기존 real_no apply+정렬 {legacy_ms:6.1f} ms  /  normalize {typed_ms:6.1f} ms")
+    for col in typed.columns: print(f"    {col:10s} {str(typed[col].dtype):16s} {typed[col].memory_usage(deep=True, index=False) / 1e6:6.2f} MB")
+
+    remap_ms, _ = timed(lambda: legacy_df['bird_name'].map(family_map).value_counts())
+    coded_ms, _ = timed(lambda: typed['family'].value_counts())
+    print(f"  과별 집계(매 rerun): .map(FAMILY_MAP) {remap_ms:6.2f} ms  /  family 코드 {coded_ms:6.2f} ms")
+    num_ms, _ = timed(lambda: pd.to_numeric(legacy_df['lat'], errors='coerce'))
+    print(f"  좌표 숫자 변환(매 지도/인덱스 빌드): {num_ms:6.2f} ms  ->  float32 그대로 0 ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+import random
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from geo_index import SpatialIndex, haversine_km
+from storage import SIGHTING_COLUMNS, make_row
+
+# --- [근처 기록 질의 벤치마크] ---
+# 격자 인덱스 질의 vs 전체 기록 하버사인(벡터화) 스캔, 결과가 같은지도 확인
+# 실행: python benchmarks/bench_geo.py
+
+SIZES = [1000, 10000, 100000]
+RADII_KM = [1, 5, 20]
+QUERIES = 200
+# 탐조지처럼 몇몇 핫스팟에 몰리고 나머지는 전국에 흩어진 분포
+HOTSPOTS = [(37.55, 126.97), (35.10, 129.03), (33.45, 126.56), (37.75, 128.90), (35.95, 126.70)]
+
+
+def history(n):
+    rnd = random.Random(n)
+    rows = []
+    for i in range(n):
+        if rnd.random() < 0.6:
+            lat, lon = rnd.choice(HOTSPOTS)
+            lat, lon = lat + rnd.gauss(0, 0.08), lon + rnd.gauss(0, 0.08)
+        else:
+            lat, lon = rnd.uniform(33, 38.5), rnd.uniform(125.5, 130)
+        rows.append(make_row(rnd.randint(1, 602), f"새{rnd.randint(1, 300)}", "미구분", "2024-05-01 07:30",
+                             round(lat, 5), round(lon, 5), None))
+    return pd.DataFrame(rows, columns=SIGHTING_COLUMNS)
+
+
+def brute_force(df, lat, lon, km):
+    dist = haversine_km(lat, lon, df['lat'].to_numpy(float), df['lon'].to_numpy(float))
+    return np.flatnonzero(dist <= km)
+
+
+def main():
+    print(f"{'rows':>7} {'build ms':>9} | " + " | ".join(f"{r:>3}km idx µs  scan µs   hits" for r in RADII_KM))
+    for n in SIZES:
+        df = history(n)
+        index = SpatialIndex()
+        t0 = time.perf_counter()
+        index.rebuild(df, version=1)
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        rnd = random.Random(0)
+        points = [(df['lat'].iloc[i], df['lon'].iloc[i]) for i in (rnd.randrange(n) for _ in range(QUERIES))]
+        cols = []
+        for km in RADII_KM:
+            t0 = time.perf_counter()
+            for lat, lon in points: index.species_near(lat, lon, km)
+            idx_us = (time.perf_counter() - t0) / QUERIES * 1e6
+
+            t0 = time.perf_counter()
+            hits = [brute_force(df, lat, lon, km) for lat, lon in points]
+            scan_us = (time.perf_counter() - t0) / QUERIES * 1e6
+
+            for (lat, lon), expected in zip(points, hits):
+                got, _ = index.within_idx(lat, lon, km)
+                assert sorted(got.tolist()) == expected.tolist(), (lat, lon, km)
+            cols.append(f"{idx_us:>10.0f} {scan_us:>8.0f} {np.mean([len(h) for h in hits]):>6.0f}")
+        print(f"{n:>7} {build_ms:>9.1f} | " + " | ".join(cols))
+
+
+if __name__ == "__main__":
+    main()
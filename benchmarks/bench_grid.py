@@ -0,0 +1,97 @@
+import os
+import sys
+import time
+import statistics
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# --- [도감 그리드 벤치마크] ---
+# 전체 종(600+)을 한 페이지씩 넘겨 볼 때의 rerun 수/지연과 프론트엔드로 가는 요소 바이트 비교
+#  - 기존: 페이지마다 number_input rerun + 컨테이너/마크다운/버튼 20개씩
+#  - 컴포넌트: 첫 실행 한 번에 전체 목록을 넘기고, 페이지 이동은 브라우저 안에서 (rerun 0회)
+# 실행: python benchmarks/bench_grid.py
+
+
+def legacy_app(root):
+    import os, sys
+    sys.path.insert(0, root)
+    import streamlit as st
+    import catalog
+    id_to_name = catalog.load_bird_map(os.path.join(root, "data.csv"), os.path.join(root, "assets", "catalog.pkl"))[5]
+    collected = {name for bid, name in id_to_name.items() if bid % 2}
+    max_bird_id = max(id_to_name)
+    items_per_page = 20
+    total_pages = max(1, (max_bird_id - 1) // items_per_page + 1)
+    page = st.number_input("페이지 이동", min_value=1, max_value=total_pages, step=1, label_visibility="collapsed")
+    start_idx = (page - 1) * items_per_page + 1
+    end_idx = min(start_idx + items_per_page, max_bird_id + 1)
+    grid_cols = st.columns(5)
+    valid_ids_on_page = [i for i in range(start_idx, end_idx) if i in id_to_name]
+    for i, current_id in enumerate(valid_ids_on_page):
+        bird_name = id_to_name[current_id]
+        is_caught = bird_name in collected
+        with grid_cols[i % 5]:
+            with st.container(border=True):
+                st.markdown(f"""
+                <div style='text-align:center; padding:10px; background-color:{"#e8f5e9" if is_caught else "#f5f5f5"}; border-radius:10px;'>
+                    <span style='font-size:2rem;'>{"🐦" if is_caught else "❓"}</span><br>
+                    <span style='font-size:0.8rem; color:#666;'>No.{current_id}</span><br>
+                    <strong style='font-size:1rem;'>{bird_name if is_caught else '???'}</strong>
+                </div>
+                """, unsafe_allow_html=True)
+                st.button("자세히 보기", key=f"btn_{current_id}", use_container_width=True)
+    st.caption(f"총 {max_bird_id}종 중 {start_idx} ~ {end_idx-1}번 표시")
+
+
+def component_app(root):
+    import os, sys
+    sys.path.insert(0, root)
+    import catalog
+    import collection_grid
+    import sprites
+    id_to_name = catalog.load_bird_map(os.path.join(root, "data.csv"), os.path.join(root, "assets", "catalog.pkl"))[5]
+    collected = {name for bid, name in id_to_name.items() if bid % 2}
+    atlas = sprites.load_atlas_index(os.path.join(root, sprites.STATIC_DIR))
+    collection_grid.bird_grid(collection_grid.grid_payload(id_to_name, collected, lambda name: "🐦", atlas))
+
+
+def _walk(node):
+    yield node
+    for child in getattr(node, "children", {}).values(): yield from _walk(child)
+
+
+def frontend_stats(at):
+    # (요소 수, 요소 proto 바이트 합)
+    protos = [n.proto for n in _walk(at._tree) if getattr(n, "proto", None) is not None]
+    return len(protos), sum(p.ByteSize() for p in protos)
+
+
+def timed_run(at, action=None):
+    t0 = time.perf_counter()
+    (action(at) if action else at).run()
+    return (time.perf_counter() - t0) * 1000
+
+
+def main():
+    at = AppTest.from_function(legacy_app, args=(ROOT,), default_timeout=60)
+    first_ms = timed_run(at)
+    elements, first_bytes = frontend_stats(at)
+    pages = int(at.number_input[0].max)
+    page_ms, total_bytes = [], first_bytes
+    for page in range(2, pages + 1):
+        page_ms.append(timed_run(at, lambda a: a.number_input[0].set_value(page)))
+        total_bytes += frontend_stats(at)[1]
+    print(f"기존 그리드   : 첫 실행 {first_ms:.0f} ms · 페이지당 요소 {elements}개 / {first_bytes:,} B")
+    print(f"  전체 {pages}페이지 넘기기: rerun {pages - 1}회 · p50 {statistics.median(page_ms):.0f} ms · 합계 {sum(page_ms):.0f} ms · 전송 {total_bytes:,} B")
+
+    at = AppTest.from_function(component_app, args=(ROOT,), default_timeout=60)
+    first_ms = timed_run(at)
+    elements, first_bytes = frontend_stats(at)
+    print(f"컴포넌트 그리드: 첫 실행 {first_ms:.0f} ms · 요소 {elements}개 / {first_bytes:,} B (전체 종 데이터 + JS/CSS 포함)")
+    print(f"  전체 {pages}페이지 넘기기: rerun 0회 · 추가 전송 0 B (브라우저 안에서 처리)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from identify import StubClient, identify_many, identify_one
+
+# --- [AI 판별 동시 처리 벤치마크] ---
+# 가짜 모델(StubClient)로 사진 N장을 한 장씩(기존) vs 동시에 보냈을 때 걸리는 시간 비교
+# 실행: python benchmarks/bench_identify.py
+
+PHOTOS = 20
+LATENCY = 0.8  # Gemini 한 번 왕복에 걸리는 시간(초) 가정
+
+
+def main():
+    jobs = [(f"IMG_{i:04d}.jpg", None, None) for i in range(PHOTOS)]
+
+    client = StubClient(latency=LATENCY)
+    t0 = time.perf_counter()
+    for _, image, doubt in jobs: identify_one(client, image, doubt)
+    serial = time.perf_counter() - t0
+    print(f"serial            : {serial:6.2f}s ({client.calls} calls)")
+
+    for workers, rate in [(4, 5.0), (8, 10.0)]:
+        client = StubClient(latency=LATENCY, fail_rate=0.1, seed=0)
+        t0 = time.perf_counter()
+        results = list(identify_many(client, jobs, max_workers=workers, per_second=rate, backoff=0.2))
+        took = time.perf_counter() - t0
+        errors = sum(1 for _, r in results if r.startswith("Error"))
+        print(f"pool {workers} @ {rate:>4}/s : {took:6.2f}s ({client.calls} calls, 실패율 10%, 최종 오류 {errors})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import io
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from imaging import prepare_image
+
+# --- [사진 전처리 벤치마크] ---
+# 원본 그대로 보낼 때 vs prepare_image를 거칠 때 전송 바이트와 예상 종단 지연 비교
+# 실행: python benchmarks/bench_imaging.py [사진 폴더]   (폴더가 없으면 합성 카메라 사진 사용)
+
+UPLINK_BYTES_PER_SEC = 2_500_000  # 20 Mbps 업로드 가정
+MODEL_LATENCY = 1.5               # Gemini 응답 시간(초) 가정
+
+
+def synthetic_photos():
+    # 24MP / 12MP 카메라 JPEG 흉내: 부드러운 배경 + 센서 노이즈, 한 장은 세로(EXIF 회전) 사진
+    rnd = np.random.default_rng(0)
+    for i, (w, h, q) in enumerate([(6000, 4000, 95), (6000, 4000, 92), (4032, 3024, 95), (4032, 3024, 90)]):
+        y, x = np.mgrid[0:h, 0:w]
+        base = np.stack([(x * 255 // w), (y * 255 // h), ((x + y) * 255 // (w + h))], axis=-1)
+        noise = rnd.integers(-40, 40, size=(h, w, 3))
+        arr = np.clip(base + noise, 0, 255).astype(np.uint8)
+        buf = io.BytesIO()
+        exif = Image.Exif()
+        if i == 2: exif[0x0112] = 6  # Orientation: 90° 회전
+        Image.fromarray(arr).save(buf, format="JPEG", quality=q, exif=exif)
+        yield f"synthetic_{w}x{h}_q{q}.jpg", buf.getvalue()
+
+
+def folder_photos(path):
+    for name in sorted(os.listdir(path)):
+        if name.lower().endswith((".jpg", ".jpeg", ".png")):
+            with open(os.path.join(path, name), "rb") as f:
+                yield name, f.read()
+
+
+def main():
+    photos = folder_photos(sys.argv[1]) if len(sys.argv) > 1 else synthetic_photos()
+    print(f"{'photo':<28} | {'raw MB':>7} {'raw s':>6} | {'sent MB':>7} {'prep ms':>8} {'total s':>7} | size")
+    tot_raw = tot_sent = 0
+    for name, data in photos:
+        t0 = time.perf_counter()
+        out = prepare_image(data)
+        prep = time.perf_counter() - t0
+        raw_s = len(data) / UPLINK_BYTES_PER_SEC + MODEL_LATENCY
+        new_s = prep + len(out) / UPLINK_BYTES_PER_SEC + MODEL_LATENCY
+        size = Image.open(io.BytesIO(out)).size
+        tot_raw += len(data)
+        tot_sent += len(out)
+        print(f"{name:<28} | {len(data)/1e6:>7.2f} {raw_s:>6.2f} | {len(out)/1e6:>7.2f} {prep*1000:>8.1f} {new_s:>7.2f} | {size[0]}x{size[1]}")
+    print(f"전송량 합계: {tot_raw/1e6:.1f} MB -> {tot_sent/1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
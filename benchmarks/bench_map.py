@@ -0,0 +1,85 @@
+import os
+import sys
+import time
+import random
+import folium
+import pandas as pd
+from folium.plugins import MarkerCluster, Geocoder, LocateControl
+from streamlit_folium import generate_leaflet_string
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import map_render
+import sighting_map
+from storage import SIGHTING_COLUMNS, make_row
+
+# --- [탐조 지도 렌더링 벤치마크] ---
+# 기존 방식(iterrows + 기록마다 Marker/Popup, 매 rerun마다 전부 다시 생성) vs
+# 열 단위 JSON 배열 + 브라우저 클러스터링(직렬화는 버전별 캐시, rerun은 지도 틀만 렌더)
+# 실행: python benchmarks/bench_map.py [--legacy-max 10000]
+
+SIZES = [1000, 10000, 100000]
+NAMES = ["개리", "큰고니", "흰꼬리수리", "수리부엉이", "청둥오리", "멧비둘기", "쇠딱다구리", "꼬마물떼새"]
+
+
+def history(n):
+    rnd = random.Random(n)
+    rows = [make_row(rnd.randint(1, 602), rnd.choice(NAMES), "미구분", "2024-05-01 07:30",
+                     round(rnd.uniform(33, 38), 5), round(rnd.uniform(126, 130), 5), None) for i in range(n)]
+    return pd.DataFrame(rows, columns=SIGHTING_COLUMNS)
+
+
+def icon_for(name):
+    return "🦆" if "오리" in name else "🐦"
+
+
+def legacy_render(df):
+    map_df = df.dropna(subset=['lat', 'lon'])
+    m = folium.Map(location=[map_df['lat'].mean(), map_df['lon'].mean()], zoom_start=7)
+    LocateControl(auto_start=True).add_to(m)
+    Geocoder(add_marker=False).add_to(m)
+    marker_cluster = MarkerCluster().add_to(m)
+    for idx, row in map_df.iterrows():
+        popup_html = f"""
+        <div style="width:150px; text-align:center;">
+            <div style="font-size:20px;">{icon_for(row['bird_name'])}</div>
+            <b>{row['bird_name']}</b><br>
+            <span style="font-size:12px; color:#555;">{row['date']}</span>
+        </div>
+        """
+        folium.Marker(location=[row['lat'], row['lon']], popup=folium.Popup(popup_html, max_width=200),
+                      tooltip=row['bird_name']).add_to(marker_cluster)
+    return serve(m)
+
+
+def serve(m):
+    # st_folium이 rerun마다 서버에서 하는 일: 전체 렌더 + 프론트엔드로 보낼 Leaflet 스크립트 생성
+    m.get_root().render()
+    return generate_leaflet_string(m)
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return (time.perf_counter() - t0) * 1000, out
+
+
+def main():
+    legacy_max = int(sys.argv[sys.argv.index("--legacy-max") + 1]) if "--legacy-max" in sys.argv else 10000
+    print(f"{'points':>7} | {'legacy ms':>10} {'JS MB':>8} | {'payload ms':>10} {'rerun ms':>9} {'JS MB':>8}")
+    for n in SIZES:
+        df = history(n)
+        if n <= legacy_max:
+            legacy_ms, html = timed(lambda: legacy_render(df))
+            legacy = f"{legacy_ms:>10.0f} {len(html.encode()) / 1e6:>8.2f}"
+        else:
+            legacy = f"{'skipped':>10} {'-':>8}"
+
+        # 버전이 바뀔 때 한 번: 열 단위 직렬화
+        payload_ms, (payload, center) = timed(lambda: sighting_map.marker_payload(sighting_map.located(df), icon_for))
+        # 매 rerun: 캐시된 문자열로 지도 틀만 만들어 렌더
+        rerun_ms, html = timed(lambda: serve(map_render.build_map(payload, center)))
+        print(f"{n:>7} | {legacy} | {payload_ms:>10.0f} {rerun_ms:>9.1f} {len(html.encode()) / 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import tempfile
+import multiprocessing
+import time
+import statistics
+
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import catalog
+
+# --- [등록 알림 부하 테스트] ---
+# 실제 앱(bird_quiz.py, SQLite 저장소)에 동시 사용자 N명이 직접 이름 입력으로 새를 연달아 등록할 때,
+# 등록 한 번(rerun)이 스크립트 스레드를 붙잡는 시간과 스레드당/전체 처리량을 잽니다.
+# 알림은 토스트 큐로 가므로 rerun은 바로 끝나고, 기존 time.sleep(3) 방식은 같은 작업 + 3초로 계산해 비교합니다.
+# AppTest는 프로세스마다 런타임 하나만 둘 수 있어서 사용자 한 명 = 프로세스 하나 (저장소 SQLite 파일은 공유)
+# 실행: python benchmarks/bench_notices.py
+
+USERS = (1, 4, 8)
+PER_USER = 10
+LEGACY_SLEEP = 3.0
+
+
+def user_session(db_path, names):
+    os.chdir(ROOT)
+    latencies, errors = [], []
+    at = AppTest.from_file(os.path.join(ROOT, "bird_quiz.py"), default_timeout=120)
+    at.secrets["storage"] = {"backend": "sqlite", "sqlite_path": db_path}
+    at.secrets["GOOGLE_API_KEY"] = "x"
+    at.run()
+    for name in names:
+        t0 = time.perf_counter()
+        at.text_input(key="input_bird").set_value(name).run()
+        latencies.append(time.perf_counter() - t0)
+        if at.exception or not any("등록 완료" in t.value for t in at.toast): errors.append(name)
+    return latencies, errors
+
+
+def run(users, species, db_path):
+    chunks = [species[i * PER_USER:(i + 1) * PER_USER] for i in range(users)]
+    with multiprocessing.get_context("spawn").Pool(users) as pool:
+        results = pool.starmap(user_session, [(db_path, chunk) for chunk in chunks])
+    # 프로세스 시작/첫 실행은 빼고, 가장 오래 걸린 사용자의 등록 시간 합을 전체 소요 시간으로
+    took = max(sum(lat) for lat, _ in results)
+    return took, [x for lat, _ in results for x in lat], [x for _, err in results for x in err]
+
+
+def main():
+    os.chdir(ROOT)
+    species = list(catalog.load_bird_map()[0])
+    offset = 0
+    for users in USERS:
+        with tempfile.TemporaryDirectory() as tmp:
+            names = species[offset:offset + users * PER_USER]
+            offset += users * PER_USER
+            took, latencies, errors = run(users, names, os.path.join(tmp, "sightings.db"))
+        p50 = statistics.median(latencies)
+        p99 = sorted(latencies)[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"동시 {users}명 x {PER_USER}건: 등록 rerun p50 {p50 * 1000:.0f} ms · p99 {p99 * 1000:.0f} ms · "
+              f"전체 {len(latencies) / took:.1f}건/s (기존 추정 {users / (p50 + LEGACY_SLEEP):.1f}건/s) · 실패 {len(errors)}")
+        print(f"  스크립트 스레드 1개당: 토스트 큐 {1 / p50:.1f}건/s  vs  기존 sleep({LEGACY_SLEEP:.0f}) {1 / (p50 + LEGACY_SLEEP):.2f}건/s")
+
+
+if __name__ == "__main__":
+    main()
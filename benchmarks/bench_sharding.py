@@ -0,0 +1,107 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from check_progress import RARE_BIRDS
+from fake_gsheets import FakeGSheetsConnection
+from storage import GSheetsStore, SQLiteStore, ROLLUP_COLUMNS, ROLLUP_SHEET, USER_SHEET_PREFIX, user_key
+from synthetic import load_catalog, sighting_log
+
+# --- [사용자별 저장소 벤치마크] ---
+# 사용자 U명 x 사용자당 기록 R행인 커뮤니티에서, 한 사용자의 rerun이 읽는 비용을 비교합니다.
+#  - 공유: 모든 사용자의 기록이 한 워크시트/한 테이블에 있고 읽은 뒤 그 사용자 것만 거르는 경우
+#  - 사용자별: for_user()로 연 파티션(시트는 u_<키> 워크시트, SQLite는 (user_id, bird_name) 인덱스)만 읽는 경우
+#  - 순위표: 전체 기록을 읽어 사용자별로 집계 vs 사용자별 요약(rollups) 한 줄씩 읽기
+# 구글 시트는 fake_gsheets(요청당 --latency초 + 2MB/s 전송)로 대신합니다.
+# 실행: python benchmarks/bench_sharding.py [--users 10,100] [--records 200]
+
+REPEAT = 5
+
+
+def timed(fn, repeat=REPEAT):
+    t0 = time.perf_counter()
+    for _ in range(repeat): fn()
+    return (time.perf_counter() - t0) / repeat * 1000
+
+
+def community(users, records, catalog_data):
+    # 사용자 이름 -> 기록 프레임 (사용자마다 씨앗을 달리해서 서로 다른 기록)
+    return {f"birder{i}@example.com": sighting_log(records, RARE_BIRDS, seed=i, catalog_data=catalog_data) for i in range(users)}
+
+
+def rollup_row(user, df):
+    return {'user_id': user_key(user), 'name': user.split("@")[0], 'species': df['bird_name'].nunique(),
+            'records': len(df), 'rare': int(df['bird_name'].isin(RARE_BIRDS).sum()), 'achievements': 0,
+            'level': 1, 'xp': 0, 'updated': "2025-01-01 00:00"}
+
+
+def bench_sheets(logs, latency):
+    me = next(iter(logs))
+    shared = pd.concat([df.assign(user_id=user_key(u)) for u, df in logs.items()], ignore_index=True)
+    sheets = {USER_SHEET_PREFIX + user_key(u): df for u, df in logs.items()}
+    sheets[ROLLUP_SHEET] = pd.DataFrame([rollup_row(u, df) for u, df in logs.items()], columns=ROLLUP_COLUMNS)
+    conn = FakeGSheetsConnection(shared, latency=latency, sheets=sheets)
+    base = GSheetsStore(conn, "bench")
+    mine = base.for_user(me)
+    mine.read()   # 워크시트 핸들 워밍업
+    base.rollups()
+    key = user_key(me)
+
+    def read_shared():
+        df = base.read()
+        return df[df["user_id"] == key]
+
+    return {
+        "read_shared": timed(read_shared),
+        "read_user": timed(mine.read),
+        "board_scan": timed(lambda: base.read().groupby("user_id")["bird_name"].nunique()),
+        "board_rollup": timed(base.rollups),
+    }
+
+
+def bench_sqlite(logs):
+    me = next(iter(logs))
+    with tempfile.TemporaryDirectory() as tmp:
+        shared = SQLiteStore(os.path.join(tmp, "shared.db"))
+        for df in logs.values(): shared.append_many(df.to_dict('records'))
+        base = SQLiteStore(os.path.join(tmp, "sharded.db"))
+        for user, df in logs.items():
+            base.for_user(user).append_many(df.to_dict('records'))
+            base.put_rollup(rollup_row(user, df))
+        mine = base.for_user(me)
+        # 공유 쪽은 사용자 구분 없는 한 테이블이라 전체를 읽고 앞의 R행(그 사용자 몫)만 남김
+        records = len(logs[me])
+        return {
+            "read_shared": timed(lambda: shared.read().head(records)),
+            "read_user": timed(mine.read),
+            "board_scan": timed(lambda: base._query("SELECT user_id, COUNT(DISTINCT bird_name) FROM sightings GROUP BY user_id")),
+            "board_rollup": timed(base.rollups),
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", default="10,100")
+    parser.add_argument("--records", type=int, default=200, help="사용자당 기록 수")
+    parser.add_argument("--latency", type=float, default=0.05, help="가짜 시트 요청당 지연(초)")
+    args = parser.parse_args()
+
+    catalog_data = load_catalog()
+    print(f"{'저장소':7s} {'사용자':>5} {'전체 행':>8} | {'공유 읽기':>10} {'내 것만':>9} | {'순위 전체집계':>12} {'rollup':>8}  (ms)")
+    for users in [int(u) for u in args.users.split(",") if u]:
+        logs = community(users, args.records, catalog_data)
+        rows = users * args.records
+        for backend, r in (("sheets", bench_sheets(logs, args.latency)), ("sqlite", bench_sqlite(logs))):
+            print(f"{backend:7s} {users:>5} {rows:>8,} | {r['read_shared']:>10.1f} {r['read_user']:>9.1f} | "
+                  f"{r['board_scan']:>12.1f} {r['board_rollup']:>8.1f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# --- [콜드 스타트 / import 시간 프로파일] ---
+# 새 프로세스에서 앱(bird_quiz.py)의 첫 화면을 AppTest로 한 번 그리면서 python -X importtime으로
+# 모듈별 import 시간(누적)을 잽니다. 두 가지를 나란히 비교합니다.
+#  - before: 예전처럼 무거운 의존성(Gemini, folium, streamlit_folium, gsheets)을 스크립트 맨 위에서 먼저 import
+#  - after : 지금 앱 그대로 (AI 분석 / 지도 선택 / 탐조 지도 탭에서 처음 쓸 때 import)
+# 첫 화면은 종 추가 탭 + 위치 입력 접힘 + sqlite 저장소(빈 DB) + AI stub 설정입니다.
+# 실행: python benchmarks/bench_startup.py [--repeat 3] [--json out.json]
+
+HEAVY = ["google.generativeai", "folium", "folium.plugins", "streamlit_folium", "streamlit_gsheets"]
+APP_MODULES = ["streamlit", "pandas", "numpy", "PIL", "catalog", "collection_grid", "gazetteer", "sighting_map",
+               "geo_index", "sprites", "progress", "imaging", "identify", "bulk_import", "sighting_frame", "storage",
+               "tracing", "map_render"]
+
+
+def child(eager, db_path):
+    # -X importtime으로 실행되는 쪽: 첫 화면을 그리고 결과를 stdout에 JSON으로
+    began = time.perf_counter()
+    if eager:
+        # importlib.import_module은 -X importtime 기록에 최상위 줄이 남지 않아서 __import__로
+        for name in HEAVY: __import__(name)
+    from streamlit.testing.v1 import AppTest
+    os.chdir(ROOT)
+    at = AppTest.from_file(os.path.join(ROOT, "bird_quiz.py"), default_timeout=120)
+    at.secrets["GOOGLE_API_KEY"] = "stub"
+    at.secrets["storage"] = {"backend": "sqlite", "sqlite_path": db_path, "migrate_from_sheet": False}
+    at.secrets["ai"] = {"backend": "stub"}
+    t0 = time.perf_counter()
+    at.run()
+    first_run = time.perf_counter() - t0
+    print(json.dumps({"first_run_ms": first_run * 1000, "total_ms": (time.perf_counter() - began) * 1000,
+                      "errors": [str(e.value) for e in at.exception],
+                      "loaded": {name: name in sys.modules for name in HEAVY}}))
+
+
+def import_times(stderr):
+    # "import time: self [us] | cumulative | imported package" -> 처음 import된 곳의 누적 ms
+    out = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line: continue
+        _, cumulative, name = line[len("import time:"):].split("|", 2)
+        name = name.strip()
+        if name not in out and cumulative.strip().isdigit(): out[name] = int(cumulative) / 1000
+    return out
+
+
+def profile(eager):
+    with tempfile.TemporaryDirectory() as tmp:
+        cmd = [sys.executable, "-X", "importtime", "-W", "ignore", os.path.abspath(__file__), "--child",
+               "--db", os.path.join(tmp, "startup.db")] + (["--eager"] if eager else [])
+        t0 = time.perf_counter()
+        proc = subprocess.run(cmd, capture_output=True, text=True, cwd=ROOT)
+        wall = (time.perf_counter() - t0) * 1000
+    if proc.returncode != 0: raise RuntimeError(proc.stderr[-2000:])
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["process_ms"] = wall
+    result["imports_ms"] = import_times(proc.stderr)
+    return result
+
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--eager", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--db", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child: return child(args.eager, args.db)
+
+    runs = {mode: [profile(mode == "before") for _ in range(args.repeat)] for mode in ("before", "after")}
+    summary = {}
+    for mode, results in runs.items():
+        errors = [e for r in results for e in r["errors"]]
+        if errors: print(f"⚠️ {mode}: {errors[0]}")
+        summary[mode] = {
+            "process_ms": round(median([r["process_ms"] for r in results]), 1),
+            "first_run_ms": round(median([r["first_run_ms"] for r in results]), 1),
+            "loaded": results[0]["loaded"],
+            "imports_ms": {name: round(median([r["imports_ms"].get(name, 0.0) for r in results]), 1)
+                           for name in HEAVY + APP_MODULES},
+        }
+
+    before, after = summary["before"], summary["after"]
+    print(f"{'모듈':24s} | {'before ms':>10} | {'after ms':>10} | 첫 화면에서 import")
+    for name in HEAVY + APP_MODULES:
+        b, a = before["imports_ms"][name], after["imports_ms"][name]
+        if not b and not a: continue
+        loaded = after["loaded"].get(name)
+        mark = "" if loaded is None else ("예" if loaded else "아니오 (쓸 때 import)")
+        print(f"{name:24s} | {b:>10.1f} | {a:>10.1f} | {mark}")
+    print(f"\n{'첫 화면 AppTest.run':24s} | {before['first_run_ms']:>10.1f} | {after['first_run_ms']:>10.1f}")
+    print(f"{'프로세스 전체':24s} | {before['process_ms']:>10.1f} | {after['process_ms']:>10.1f}")
+    print("(import 시간은 -X importtime 누적값, 모듈이 처음 import된 자리 기준 / 반복 중앙값)")
+    print("(before는 streamlit 하위 모듈 일부를 첫 화면 전에 이미 불러오므로, 비교는 프로세스 전체 시간으로)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=1)
+        print(f"결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
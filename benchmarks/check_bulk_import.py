@@ -0,0 +1,80 @@
+import io
+import os
+import sys
+import tempfile
+import zipfile
+
+from PIL import Image
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from bulk_import import count_photos, iter_photos, resolve_folder, scan
+from identify import StubClient
+
+# --- [일괄 가져오기 경로/사진 검증] ---
+#  - resolve_folder는 사진 루트 아래 폴더만 허용 (.. / 절대 경로 / 밖을 가리키는 심볼릭 링크 / 파일이면 None)
+#  - 폴더 안에서 밖의 파일을 가리키는 링크는 iter_photos / count_photos 둘 다 건너뜀
+#  - zip 안의 깨진 사진(사진이 아닌 바이트, 잘린 JPEG)은 그 한 장만 "판독 불가"이고 나머지는 계속 판별
+# 실행: python benchmarks/check_bulk_import.py
+
+
+def jpeg(color):
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 48), color).save(buf, "JPEG")
+    return buf.getvalue()
+
+
+def write(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def check_paths(tmp):
+    root = os.path.join(tmp, "photos")
+    outside = os.path.join(tmp, "outside")
+    write(os.path.join(root, "trip", "a.jpg"), jpeg("red"))
+    write(os.path.join(root, "trip", "day2", "b.jpg"), jpeg("green"))
+    write(os.path.join(outside, "secret.jpg"), jpeg("blue"))
+    os.symlink(outside, os.path.join(root, "escape"))
+    os.symlink(os.path.join(outside, "secret.jpg"), os.path.join(root, "trip", "linked.jpg"))
+
+    trip = os.path.realpath(os.path.join(root, "trip"))
+    assert resolve_folder(root, "trip") == trip
+    assert resolve_folder(root, "trip/day2/..") == trip
+    assert resolve_folder(root, "") == os.path.realpath(root)
+    for bad in ("..", "../outside", "trip/../../outside", outside, "/", "escape", "missing", "trip/a.jpg"):
+        assert resolve_folder(root, bad) is None, bad
+
+    names = sorted(name for name, _ in iter_photos(trip))
+    assert names == ["a.jpg", os.path.join("day2", "b.jpg")], names
+    assert count_photos(trip) == len(names)
+
+
+def check_corrupt_zip():
+    buf = io.BytesIO()
+    good = jpeg("red")
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("1.jpg", good)
+        zf.writestr("2.jpg", b"not a photo")
+        zf.writestr("3.jpg", good[:len(good) // 2])
+        zf.writestr("4.jpg", jpeg("green"))
+        zf.writestr("__MACOSX/._4.jpg", b"resource fork")
+    buf.seek(0)
+    assert count_photos(buf) == 4 and buf.tell() == 0
+
+    rows = scan(buf, StubClient(answers=("참새 | 갈색 머리",)), batch_size=2, max_workers=2, per_second=0)
+    assert [r["file"] for r in rows] == ["1.jpg", "2.jpg", "3.jpg", "4.jpg"], rows
+    assert [r["valid"] for r in rows] == [True, False, False, True], rows
+    assert [r["bird_name"] for r in rows] == ["참새", "판독 불가", "판독 불가", "참새"], rows
+
+
+def check():
+    with tempfile.TemporaryDirectory() as tmp:
+        check_paths(tmp)
+    check_corrupt_zip()
+    print("✅ 사진 루트 밖 경로 거부 (.., 절대 경로, 심볼릭 링크) + zip 안 깨진 사진만 판독 불가")
+
+
+if __name__ == "__main__":
+    check()
@@ -0,0 +1,148 @@
+import os
+import random
+import sys
+import time
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+import catalog
+from progress import ProgressEngine
+
+# --- [업적 엔진 검증 + 벤치마크] ---
+# 무작위 탐조 기록으로 ProgressEngine 결과가 기존 calculate_achievements / calculate_xp_and_level과
+# 같은지 확인하고, 한 마리 등록 비용(전체 재계산 vs 증분)을 비교합니다.
+# 실행: python benchmarks/check_progress.py
+
+# bird_quiz.py의 RARE_BIRDS (스크립트를 import하면 앱이 실행되므로 그대로 옮겨둠)
+RARE_BIRDS = {
+    "황새": "class1", "저어새": "class1", "노랑부리백로": "class1", "매": "class1", "흰꼬리수리": "class1",
+    "참수리": "class1", "검독수리": "class1", "두루미": "class1", "넓적부리도요": "class1", "청다리도요사촌": "class1",
+    "크낙새": "class1", "혹고니": "class1", "호사비오리": "class1", "먹황새": "class1",
+    "개리": "class2", "큰기러기": "class2", "흑기러기": "class2", "고니": "class2", "큰고니": "class2",
+    "가창오리": "class2", "붉은가슴흰죽지": "class2", "검은머리물떼새": "class2", "알락꼬리마도요": "class2",
+    "뿔쇠오리": "class2", "흑비둘기": "class2", "섬개개비": "class2", "붉은배새매": "class2",
+    "수리부엉이": "class2", "참매": "class2", "까막딱따구리": "class2", "팔색조": "class2",
+    "솔개": "class2", "큰말똥가리": "class2", "독수리": "class2", "새호리기": "class2", "물수리": "class2",
+    "잿빛개구리매": "class2", "긴점박이올빼미": "class2", "쇠부엉이": "class2", "올빼미": "class2",
+    "조롱이": "class2", "털발말똥가리": "class2", "흰목물떼새": "class2", "뜸부기": "class2",
+    "재두루미": "class2", "흑두루미": "class2", "검은머리갈매기": "class2", "무당새": "class2",
+    "긴꼬리딱새": "class2", "삼광조": "class2", "양비둘기": "class2", "따오기": "class2", "붉은해오라기": "class2",
+    "원앙": "natural", "황조롱이": "natural", "소쩍새": "natural", "솔부엉이": "natural",
+    "큰소쩍새": "natural", "어치": "natural"
+}
+
+BIRD_MAP, FAMILY_MAP, *_ = catalog.load_bird_map()
+
+
+# --- 기존 구현 (기준값) ---
+def legacy_calculate_achievements(df):
+    achievements = []
+    count = len(df)
+
+    if count >= 1: achievements.append("🐣 탐조 입문")
+    if count >= 10: achievements.append("🌱 새싹 탐조가")
+    if count >= 50: achievements.append("🥉 아마추어 탐조가")
+    if count >= 150: achievements.append("🥈 베테랑 탐조가")
+    if count >= 300: achievements.append("🥇 마스터 탐조가")
+    if count >= 500: achievements.append("💎 전설의 탐조가")
+
+    if not df.empty and FAMILY_MAP:
+        df['family'] = df['bird_name'].map(FAMILY_MAP)
+        fam_counts = df['family'].value_counts()
+
+        if df['family'].nunique() >= 20: achievements.append("🌈 다채로운 시선")
+        if fam_counts.get('오리과', 0) >= 15: achievements.append("🦆 호수의 지배자")
+        if fam_counts.get('수리과', 0) + fam_counts.get('매과', 0) >= 10: achievements.append("🦅 하늘의 제왕")
+        if fam_counts.get('백로과', 0) >= 5: achievements.append("🦢 우아한 백로")
+        if fam_counts.get('딱다구리과', 0) >= 3: achievements.append("🌲 숲속의 드러머")
+        if fam_counts.get('올빼미과', 0) >= 3: achievements.append("🦉 밤의 추적자")
+        if fam_counts.get('까마귀과', 0) >= 3: achievements.append("🧠 똑똑한 새")
+        if fam_counts.get('박새과', 0) >= 3: achievements.append("👔 넥타이 신사")
+        if fam_counts.get('도요과', 0) >= 15: achievements.append("🏖️ 갯벌의 나그네")
+
+    rare_count = 0
+    for name in df['bird_name']:
+        if name in RARE_BIRDS: rare_count += 1
+    if rare_count >= 3: achievements.append("🍀 럭키 탐조가")
+    if rare_count >= 10: achievements.append("🛡️ 자연의 수호자")
+
+    return achievements
+
+
+def legacy_calculate_xp_and_level(df, achievements):
+    total_xp = 0
+    if not df.empty:
+        for name in df['bird_name']:
+            if name in RARE_BIRDS:
+                rarity = RARE_BIRDS[name]
+                if rarity == "class1": total_xp += 50
+                else: total_xp += 30
+            else:
+                total_xp += 10
+    total_xp += len(achievements) * 50
+    level = (total_xp // 100) + 1
+    current_xp_in_level = total_xp % 100
+    next_level_xp = 100
+    return level, current_xp_in_level, next_level_xp, total_xp
+
+
+def random_log(rnd, n):
+    names = list(BIRD_MAP)
+    rare = list(RARE_BIRDS)
+    out = []
+    for _ in range(n):
+        r = rnd.random()
+        if r < 0.15: out.append(rnd.choice(rare))
+        elif r < 0.18: out.append("모르는새")  # 목록에 없는 이름
+        else: out.append(rnd.choice(names))
+    return out
+
+
+def check(trials=300):
+    rnd = random.Random(42)
+    engine = ProgressEngine(FAMILY_MAP, RARE_BIRDS)
+    for t in range(trials):
+        names = random_log(rnd, rnd.choice([0, 1, 5, 30, 120, 400, 900]))
+        df = pd.DataFrame({'bird_name': names})
+        expected = legacy_calculate_achievements(df.copy())
+        engine.rebuild(names)
+        assert engine.achievements() == expected, (t, engine.achievements(), expected)
+        assert engine.xp_and_level() == legacy_calculate_xp_and_level(df, expected)
+
+        # 증분 추가/삭제 후에도 전체 재계산과 같아야 함
+        extra = random_log(rnd, rnd.randint(1, 20))
+        engine.add(extra)
+        dropped = set(rnd.sample(names, min(3, len(names))))
+        engine.remove(dropped)
+        final = [n for n in names + extra if n not in dropped]
+        df = pd.DataFrame({'bird_name': final})
+        expected = legacy_calculate_achievements(df.copy())
+        assert engine.achievements() == expected, (t, engine.achievements(), expected)
+        assert engine.xp_and_level() == legacy_calculate_xp_and_level(df, expected)
+    print(f"✅ {trials}개 무작위 기록에서 기존 함수와 결과 일치")
+
+
+def bench():
+    rnd = random.Random(7)
+    print(f"{'rows':>8} | {'legacy ms':>10} | {'engine add ms':>13}")
+    for n in [1_000, 10_000, 100_000]:
+        df = pd.DataFrame({'bird_name': random_log(rnd, n)})
+        t0 = time.perf_counter()
+        ach = legacy_calculate_achievements(df)
+        legacy_calculate_xp_and_level(df, ach)
+        legacy_ms = (time.perf_counter() - t0) * 1000
+
+        engine = ProgressEngine(FAMILY_MAP, RARE_BIRDS)
+        engine.rebuild(df['bird_name'], version=1)
+        t0 = time.perf_counter()
+        engine.add(["참새"], 1, 2)
+        engine.xp_and_level(engine.achievements())
+        engine_ms = (time.perf_counter() - t0) * 1000
+        print(f"{n:>8} | {legacy_ms:>10.2f} | {engine_ms:>13.4f}")
+
+
+if __name__ == "__main__":
+    check()
+    bench()
@@ -0,0 +1,62 @@
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+from wiki_fetch import API_URL, Fetcher
+
+# --- [위키백과 응답 재생 검증] ---
+# benchmarks/fixtures/http에 저장해 둔 응답(.cache/http와 같은 형식)만으로 Fetcher(offline=True)가
+#  - 처음 묶음 그대로 재생하고
+#  - 이어하기로 묶음 구성이 달라져도(제목 일부만) 제목별 기록으로 재생하고
+#  - 기록이 없는 묶음은 예외 없이 "사진 없음"으로 돌려주는지
+# 확인합니다. 네트워크가 필요 없습니다.
+# 실행: python benchmarks/check_replay.py  (--record: 네트워크에서 픽스처를 다시 녹화)
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "http")
+TITLES = ["참새", "까치", "없는새이름"]
+THUMB_SIZE = 1000
+
+
+def record():
+    # 예전 실행이 남긴 것처럼 묶음 응답과 이미지만 남김 (제목별 기록은 재생하면서 채워져야 함)
+    shutil.rmtree(FIXTURE_DIR, ignore_errors=True)
+    fetcher = Fetcher(cache_dir=FIXTURE_DIR)
+    urls = fetcher.lookup_images(TITLES, thumb_size=THUMB_SIZE)
+    for title in TITLES:
+        for path in fetcher.cache._paths(fetcher._title_url(title, THUMB_SIZE)): os.remove(path)
+    for url in filter(None, urls.values()): fetcher.get(url)
+    print(f"녹화: {FIXTURE_DIR} ({json.dumps(urls, ensure_ascii=False)})")
+
+
+def check():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = os.path.join(tmp, "http")
+        shutil.copytree(FIXTURE_DIR, cache_dir)
+
+        fetcher = Fetcher(cache_dir=cache_dir, offline=True)
+        urls = fetcher.lookup_images(TITLES, thumb_size=THUMB_SIZE)
+        assert set(urls) == set(TITLES), urls
+        assert urls["참새"] and urls["까치"] and urls["없는새이름"] is None, urls
+        for title in ("참새", "까치"): assert fetcher.get(urls[title]), title
+
+        # 이어하기: 앞 종은 끝났다고 보고 나머지만 -> 묶음 URL이 달라도 제목별 기록으로
+        fetcher = Fetcher(cache_dir=cache_dir, offline=True)
+        assert fetcher.lookup_images(TITLES[1:], thumb_size=THUMB_SIZE) == {t: urls[t] for t in TITLES[1:]}
+        assert fetcher.stats == {"network": 0, "revalidated": 0, "replayed": 2}, fetcher.stats
+
+        # 녹화에 없는 묶음은 예외 대신 사진 없음
+        assert Fetcher(cache_dir=cache_dir, offline=True).lookup_images(["황새"], thumb_size=THUMB_SIZE) == {"황새": None}
+        assert Fetcher(cache_dir=cache_dir, offline=True).lookup_images(["황새"], thumb_size=THUMB_SIZE + 1) == {"황새": None}
+    print(f"✅ 저장된 응답 재생 확인 ({API_URL} 묶음 조회 {len(TITLES)}종, 이어하기, 녹화 없는 묶음)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--record", action="store_true", help="네트워크에서 픽스처를 다시 녹화")
+    if parser.parse_args().record: record()
+    check()
@@ -0,0 +1,143 @@
+import os
+import sys
+import tempfile
+import threading
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from check_progress import RARE_BIRDS
+from fake_gsheets import FakeGSheetsConnection
+from storage import GSheetsStore, SQLiteStore, SIGHTING_COLUMNS, USER_SHEET_PREFIX, migrate_from_sheet, user_key
+from synthetic import load_catalog, sighting_log
+
+# --- [저장소 동작 검증] ---
+# SQLiteStore / GSheetsStore가 같은 기록에 대해 DataFrame으로 직접 거른 결과와 같은 답을 내는지 확인합니다.
+#  - has_bird / records_for / count가 read()를 훑은 결과와 일치
+#  - migrate_from_sheet는 여러 번(동시에) 불러도 한 번만 옮김
+#  - 헤더가 없거나 컬럼이 빠진 옛 시트에 append_many하면 기존 행을 살린 채 헤더를 맞춤
+#  - claim_legacy는 주인 없는 기록만 옮기고, for_user로 연 사용자끼리는 서로의 기록이 안 보임
+# 구글 시트는 fake_gsheets(지연 0)로 대신합니다. 네트워크가 필요 없습니다.
+# 실행: python benchmarks/check_storage.py
+
+ROWS = 300
+USERS = ["a@example.com", "b@example.com"]
+
+
+def check_queries(store, expected, label):
+    # 저장소의 인덱스 질의 결과 == 기대 프레임을 직접 거른 결과
+    df = store.read()
+    assert store.count() == len(df) == len(expected), (label, store.count(), len(df), len(expected))
+    assert sorted(df["bird_name"]) == sorted(expected["bird_name"]), label
+    for name in list(expected["bird_name"].unique()[:30]) + ["없는새이름"]:
+        scan = expected[expected["bird_name"] == name]
+        assert store.has_bird(name) == (not scan.empty), (label, name)
+        got = store.records_for(name)
+        assert len(got) == len(scan), (label, name, len(got), len(scan))
+        assert sorted(got["date"]) == sorted(scan["date"]), (label, name)
+
+
+def check_sqlite(tmp, log):
+    store = SQLiteStore(os.path.join(tmp, "queries.db"))
+    store.append_many(log.to_dict("records"))
+    check_queries(store, log, "sqlite")
+    gone = list(log["bird_name"].unique()[:3])
+    store.delete_names(gone)
+    check_queries(store, log[~log["bird_name"].isin(gone)], "sqlite 삭제 후")
+
+
+def check_migration(tmp, log):
+    # 서버 프로세스 여럿이 동시에 시작한 경우: 각자 자기 연결 풀로 같은 파일을 열고 옮기기를 시도
+    path = os.path.join(tmp, "migrate.db")
+    source = GSheetsStore(FakeGSheetsConnection(log.copy(), latency=0), "check")
+    targets = [SQLiteStore(path) for _ in range(4)]
+    moved = [None] * len(targets)
+    barrier = threading.Barrier(len(targets))
+
+    def run(i):
+        barrier.wait()
+        moved[i] = migrate_from_sheet(source, targets[i])
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(targets))]
+    for t in threads: t.start()
+    for t in threads: t.join()
+    assert sorted(moved) == [0] * (len(targets) - 1) + [len(log)], moved
+    assert migrate_from_sheet(source, SQLiteStore(path)) == 0
+    check_queries(SQLiteStore(path), log, "옮긴 뒤")
+
+
+def check_header_fallback(log):
+    # 헤더가 없는(빈) 시트, 위치 컬럼이 생기기 전의 옛 시트
+    rows = log.head(5).to_dict("records")
+    for label, old in (("빈 시트", None), ("옛 헤더", log.head(10)[["No", "bird_name", "sex", "date"]])):
+        conn = FakeGSheetsConnection(old, latency=0)
+        store = GSheetsStore(conn, "check")
+        store.append_many(rows)
+        kept = 0 if old is None else len(old)
+        sheet = conn.df
+        assert list(sheet.columns) == SIGHTING_COLUMNS, (label, list(sheet.columns))
+        assert len(sheet) == kept + len(rows), (label, len(sheet))
+        if kept: assert list(sheet["bird_name"].head(kept)) == list(old["bird_name"]), label
+        # 헤더가 맞춰진 뒤에는 재작성 없이 뒤에 덧붙임
+        before = conn.calls
+        store.append_many(rows)
+        assert len(conn.df) == kept + 2 * len(rows), label
+        assert conn.calls - before == 1, (label, conn.calls - before)
+
+
+def check_users_sqlite(tmp, log):
+    base = SQLiteStore(os.path.join(tmp, "users.db"))
+    legacy = log.head(40)
+    base.append_many(legacy.to_dict("records"))
+    a, b = (base.for_user(u) for u in USERS)
+    a_log = log.iloc[40:70]
+    b_log = log.iloc[70:120]
+    a.append_many(a_log.to_dict("records"))
+    b.append_many(b_log.to_dict("records"))
+    check_queries(a, a_log, "sqlite a")
+    check_queries(b, b_log, "sqlite b")
+
+    assert base.claim_legacy(USERS[0]) == len(legacy)
+    assert base.claim_legacy(USERS[0]) == 0
+    assert base.count() == 0
+    check_queries(a, pd.concat([legacy, a_log]), "sqlite a (옛 기록 포함)")
+    check_queries(b, b_log, "sqlite b (옛 기록 안 보임)")
+    # 한 사용자가 지워도 다른 사용자의 같은 종 기록은 그대로
+    shared = sorted(set(a_log["bird_name"]) & set(b_log["bird_name"])) or [b_log["bird_name"].iloc[0]]
+    a.delete_names(shared)
+    check_queries(b, b_log, "sqlite b (a 삭제 후)")
+
+
+def check_users_sheets(log):
+    legacy = log.head(40)
+    conn = FakeGSheetsConnection(legacy.copy(), latency=0)
+    base = GSheetsStore(conn, "check")
+    a, b = (base.for_user(u) for u in USERS)
+    a_log = log.iloc[40:70]
+    b_log = log.iloc[70:120]
+    a.append_many(a_log.to_dict("records"))
+    b.append_many(b_log.to_dict("records"))
+    assert set(conn.sheets) == {None} | {USER_SHEET_PREFIX + user_key(u) for u in USERS}, set(conn.sheets)
+    check_queries(a, a_log, "sheets a")
+    check_queries(b, b_log, "sheets b")
+    # 기본 워크시트(옛 기록)의 주인은 사용자별 시트 대신 기본 워크시트를 그대로 씀
+    base.claim_legacy(USERS[0])
+    check_queries(base.for_user(USERS[0]), legacy, "sheets 옛 주인")
+    check_queries(base.for_user(USERS[1]), b_log, "sheets b (옛 기록 안 보임)")
+
+
+def check():
+    log = sighting_log(ROWS, RARE_BIRDS, seed=7, catalog_data=load_catalog())
+    with tempfile.TemporaryDirectory() as tmp:
+        check_sqlite(tmp, log)
+        check_migration(tmp, log)
+        check_users_sqlite(tmp, log)
+    check_header_fallback(log)
+    check_users_sheets(log)
+    print(f"✅ 저장소 질의/옮기기/헤더 맞춤/사용자 구분 확인 ({ROWS}행, 사용자 {len(USERS)}명)")
+
+
+if __name__ == "__main__":
+    check()
@@ -0,0 +1,151 @@
+import time
+import pandas as pd
+from streamlit.connections import BaseConnection
+
+# --- [로컬 가짜 GSheetsConnection] ---
+# 네트워크 대신 메모리에 시트를 들고, 요청마다 지연 + 전송량/대역폭 만큼 잠듭니다.
+
+
+class FakeCell:
+    def __init__(self, row, col):
+        self.row = row
+        self.col = col
+
+
+class FakeWorksheet:
+    # 워크시트 하나 = owner.sheets[title] 프레임 하나 (1행은 헤더, title이 None이면 기본 워크시트)
+    def __init__(self, owner, title=None):
+        self.owner = owner
+        self.title = title
+
+    @property
+    def frame(self):
+        return self.owner.sheets.get(self.title)
+
+    @property
+    def spreadsheet(self):
+        return FakeBook(self.owner)
+
+    def row_values(self, row):
+        self.owner._charge(0)
+        if row != 1 or self.frame is None: return []
+        return list(self.frame.columns)
+
+    def append_rows(self, values, value_input_option=None):
+        payload = sum(len(str(v)) + 1 for r in values for v in r)
+        self.owner._charge(payload)
+        frame = self.frame
+        if frame is None or not len(frame.columns):
+            # 빈 워크시트에 처음 쓰는 줄은 헤더
+            frame, values = pd.DataFrame(columns=values[0]), values[1:]
+        new = pd.DataFrame(values, columns=frame.columns)
+        self.owner.sheets[self.title] = pd.concat([frame, new], ignore_index=True) if len(frame) else new
+
+    def append_row(self, values, value_input_option=None):
+        self.append_rows([values], value_input_option)
+
+    def find(self, query, in_column=None, **kwargs):
+        self.owner._charge(0)
+        frame = self.frame
+        if frame is None or frame.empty: return None
+        col = (in_column or 1) - 1
+        hits = (frame.iloc[:, col].astype(str) == str(query)).to_numpy().nonzero()[0]
+        return FakeCell(int(hits[0]) + 2, col + 1) if len(hits) else None
+
+    def update(self, range_name=None, values=None, **kwargs):
+        # "A<행>" 부터 한 줄을 덮어씀 (A1은 헤더 — _ensure_worksheet / put_rollup이 쓰는 모양만)
+        self.owner._charge(sum(len(str(v)) + 1 for r in values for v in r))
+        row = int(range_name.lstrip("A")) - 2
+        frame = self.frame
+        if row < 0:
+            if frame is None or frame.empty: self.owner.sheets[self.title] = pd.DataFrame(columns=values[0])
+            else: frame.columns = values[0]
+            return
+        frame.iloc[row, :len(values[0])] = values[0]
+
+
+class FakeBook:
+    def __init__(self, owner):
+        self.owner = owner
+
+    def worksheets(self):
+        self.owner._charge(0)
+        return [FakeWorksheet(self.owner, title) for title in self.owner.sheets if title is not None]
+
+    def add_worksheet(self, title, rows=1, cols=1):
+        # 구글 시트처럼 같은 이름이 이미 있으면 실패 (동시에 만드는 경우)
+        self.owner._charge(0)
+        if title in self.owner.sheets: raise ValueError(f'A sheet with the name "{title}" already exists.')
+        self.owner.sheets[title] = None
+        return FakeWorksheet(self.owner, title)
+
+
+class FakeClient:
+    def __init__(self, owner):
+        self.owner = owner
+
+    def _select_worksheet(self, spreadsheet=None, worksheet=None, folder_id=None):
+        self.owner._charge(0)
+        return FakeWorksheet(self.owner, worksheet)
+
+
+class FakeGSheetsConnection:
+    # sheets: 워크시트 이름 -> 프레임 (None 키는 기본 워크시트, df는 그 별칭)
+    def __init__(self, df=None, latency=0.05, bandwidth=2_000_000, sheets=None):
+        self.sheets = {None: df, **(sheets or {})}
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.client = FakeClient(self)
+        self.calls = 0
+        self.bytes_sent = 0
+
+    @property
+    def df(self):
+        return self.sheets[None]
+
+    @df.setter
+    def df(self, value):
+        self.sheets[None] = value
+
+    def _charge(self, nbytes):
+        self.calls += 1
+        self.bytes_sent += nbytes
+        time.sleep(self.latency + (nbytes / self.bandwidth if self.bandwidth else 0))
+
+    def read(self, spreadsheet=None, worksheet=None, ttl=None, **kwargs):
+        df = self.sheets.get(worksheet)
+        if df is None: return pd.DataFrame()
+        self.calls += 1
+        # bandwidth=None이면 전송 시간 없이 지연만 (큰 시트에서 to_csv 비용을 재지 않으려는 경우)
+        time.sleep(self.latency + (len(df.to_csv(index=False)) / self.bandwidth if self.bandwidth else 0))
+        return df.copy()
+
+    def update(self, spreadsheet=None, worksheet=None, data=None, **kwargs):
+        self._charge(len(data.to_csv(index=False)))
+        self.sheets[worksheet] = data.reset_index(drop=True).copy()
+        return self.sheets[worksheet]
+
+
+class StubGSheetsConnection(BaseConnection):
+    # 앱 스크립트(bird_quiz.py)를 그대로 돌릴 때 GSheetsConnection 자리에 끼우는 가짜 연결.
+    # st.connection("gsheets", type=...)이 만들고, spreadsheet / latency / bandwidth(0이면 전송 시간 없음)는
+    # [connections.gsheets] secrets 또는 STUB_CONFIG에서 (AppTest의 secrets는 연결 쪽에 전달되지 않음).
+    # 시작 시트 내용은 STUB_SHEETS[spreadsheet]에서 (프로세스마다 하나의 메모리 시트)
+    def _connect(self, **kwargs):
+        cfg = {**STUB_CONFIG, **self._secrets.to_dict(), **kwargs}
+        bandwidth = float(cfg.get("bandwidth", 0)) or None
+        return FakeGSheetsConnection(STUB_SHEETS.get(cfg.get("spreadsheet")), latency=float(cfg.get("latency", 0.05)), bandwidth=bandwidth)
+
+    @property
+    def client(self):
+        return self._instance.client
+
+    def read(self, *args, **kwargs):
+        return self._instance.read(*args, **kwargs)
+
+    def update(self, *args, **kwargs):
+        return self._instance.update(*args, **kwargs)
+
+
+STUB_CONFIG = {}
+STUB_SHEETS = {}
@@ -0,0 +1,142 @@
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+
+from PIL import Image
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# --- [동시 세션 부하 하네스] ---
+# 실제 앱(bird_quiz.py)을 Streamlit 앱 테스트 API(AppTest)로 N개 세션 동시에 돌려서
+# rerun 지연 p50/p99, 초당 rerun 수, 세션 수별 최대 RSS를 잽니다.
+#  - 구글 시트: benchmarks/fake_gsheets.StubGSheetsConnection (요청당 지연 --sheet-latency, 시작 기록 --history행)
+#  - Gemini: 앱의 [ai] backend = "stub" (판별당 지연 --ai-latency)
+# 세션 하나가 하는 일: 첫 화면 -> 새 이름으로 --adds번 등록 -> 도감에서 종 상세 열기 --opens번
+#                       -> 탐조 지도 탭 열기 + 장소 검색 -> 사진 --photos장 일괄 AI 분석 + 등록
+# AppTest는 프로세스마다 런타임을 하나만 둘 수 있어서 세션 하나 = 프로세스 하나입니다.
+# 서버 한 대(파이썬 프로세스 하나 = GIL 하나)에 가깝게 재려면 --cpus 1로 모든 세션을 CPU 하나에 묶습니다.
+# (도감 페이지 이동은 브라우저 안에서 처리되어 rerun이 없으므로 "상세 열기"로 대신합니다.)
+# 실행: python benchmarks/load_harness.py [--sessions 1,2,4,8] [--json out.json]
+
+PLACE_QUERY = "주남"
+MAP_TAB = "🗺️ 탐조 지도"
+
+
+def make_photos(folder, count):
+    # 일괄 분석용 작은 JPEG (내용이 달라야 판별 결과 캐시에 걸리지 않음)
+    for i in range(count):
+        Image.new("RGB", (64, 48), ((i * 37) % 256, (i * 91) % 256, (i * 53) % 256)).save(os.path.join(folder, f"IMG_{i:04d}.jpg"))
+
+
+def session(index, args, photo_dir, start_at):
+    import streamlit_gsheets
+    from streamlit.testing.v1 import AppTest
+    import catalog
+    import fake_gsheets
+    from check_progress import RARE_BIRDS
+    from synthetic import sighting_log
+
+    os.chdir(ROOT)
+    if args["cpus"]: os.sched_setaffinity(0, set(range(args["cpus"])))
+    # 앱이 import하는 GSheetsConnection을 가짜 연결로 바꿔 끼움 (앱 코드는 그대로)
+    streamlit_gsheets.GSheetsConnection = fake_gsheets.StubGSheetsConnection
+    sheet = f"stub-{index}"
+    fake_gsheets.STUB_CONFIG.update(spreadsheet=sheet, latency=args["sheet_latency"])
+    fake_gsheets.STUB_SHEETS[sheet] = sighting_log(args["history"], RARE_BIRDS, seed=index) if args["history"] else None
+    bird_map = catalog.load_bird_map()[0]
+    names = list(bird_map)[index * args["adds"]:(index + 1) * args["adds"]]
+
+    at = AppTest.from_file(os.path.join(ROOT, "bird_quiz.py"), default_timeout=300)
+    at.secrets["GOOGLE_API_KEY"] = "stub"
+    at.secrets["connections"] = {"gsheets": {"spreadsheet": sheet}}
+    at.secrets["ai"] = {"backend": "stub", "stub_latency": args["ai_latency"], "max_workers": 4, "requests_per_second": 100,
+                        "cache_path": os.path.join(photo_dir, f"ai-{index}.sqlite"), "bulk_photo_root": photo_dir}
+
+    reruns = []
+    def step(action, fn):
+        t0 = time.perf_counter()
+        fn()
+        reruns.append((action, (time.perf_counter() - t0) * 1000, bool(at.exception)))
+
+    while time.time() < start_at: time.sleep(0.01)   # 모든 세션이 같이 출발
+    began = time.perf_counter()
+    step("first_run", at.run)
+    for name in names: step("add_bird", lambda: at.text_input(key="input_bird").set_value(name).run())
+    for bird_id in list(bird_map.values())[:args["opens"]]:
+        at.session_state["selected_bird_id"] = bird_id
+        step("open_detail", at.run)
+    # AppTest는 탭 선택 상태를 다음 실행에 보내지 않아서(브라우저는 보냄) 지도 단계마다 지정
+    at.session_state["main_tab"] = MAP_TAB
+    step("map_open", at.run)
+    at.session_state["main_tab"] = MAP_TAB
+    step("map_search", lambda: at.text_input(key="place_q_tab4").set_value(PLACE_QUERY).run())
+    step("ai_mode", lambda: at.radio[0].set_value("📦 일괄 가져오기").run())
+    step("ai_path", lambda: at.text_input(key="bulk_dir").input(".").run())
+    step("ai_analyze", lambda: at.button(key="bulk_start").click().run())
+    if at.session_state["bulk_rows"]: step("ai_commit", lambda: at.button(key="bulk_commit").click().run())
+    elapsed = time.perf_counter() - began
+    return {"reruns": reruns, "elapsed": elapsed, "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+
+
+def run(sessions, args, photo_dir):
+    start_at = time.time() + 3 + sessions * 0.5   # 프로세스 시작/import 시간은 재지 않음
+    with multiprocessing.get_context("spawn").Pool(sessions) as pool:
+        results = pool.starmap(session, [(i, args, photo_dir, start_at) for i in range(sessions)])
+    latencies = [ms for r in results for _, ms, _ in r["reruns"]]
+    by_action = {}
+    for r in results:
+        for action, ms, _ in r["reruns"]: by_action.setdefault(action, []).append(ms)
+    ordered = sorted(latencies)
+    wall = max(r["elapsed"] for r in results)
+    return {
+        "sessions": sessions, "reruns": len(latencies),
+        "errors": sum(1 for r in results for _, _, err in r["reruns"] if err),
+        "p50_ms": round(statistics.median(latencies), 1),
+        "p99_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))], 1),
+        "reruns_per_sec": round(len(latencies) / wall, 2),
+        "peak_rss_mb": round(max(r["rss_mb"] for r in results), 1),
+        "total_rss_mb": round(sum(r["rss_mb"] for r in results), 1),
+        "actions": {a: round(statistics.median(v), 1) for a, v in by_action.items()},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sessions", default="1,2,4,8")
+    parser.add_argument("--adds", type=int, default=5)
+    parser.add_argument("--opens", type=int, default=3)
+    parser.add_argument("--photos", type=int, default=4)
+    parser.add_argument("--history", type=int, default=1000, help="세션마다 시트에 미리 들어 있는 기록 수")
+    parser.add_argument("--sheet-latency", type=float, default=0.05)
+    parser.add_argument("--ai-latency", type=float, default=0.3)
+    parser.add_argument("--cpus", type=int, default=1, help="세션 프로세스를 묶을 CPU 수 (0이면 묶지 않음)")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    args = parser.parse_args()
+    cfg = {"adds": args.adds, "opens": args.opens, "history": args.history, "sheet_latency": args.sheet_latency,
+           "ai_latency": args.ai_latency, "cpus": min(args.cpus, os.cpu_count() or 1)}
+
+    results = []
+    with tempfile.TemporaryDirectory() as photo_dir:
+        make_photos(photo_dir, args.photos)
+        print(f"{'세션':>4} | {'rerun':>5} | {'p50 ms':>8} | {'p99 ms':>8} | {'rerun/s':>7} | {'RSS/세션 MB':>11} | 오류")
+        for n in [int(s) for s in args.sessions.split(",") if s]:
+            r = run(n, cfg, photo_dir)
+            results.append(r)
+            print(f"{n:>4} | {r['reruns']:>5} | {r['p50_ms']:>8.1f} | {r['p99_ms']:>8.1f} | {r['reruns_per_sec']:>7.2f} | {r['peak_rss_mb']:>11.1f} | {r['errors']}", flush=True)
+            print("       " + " · ".join(f"{a} {ms:.0f}ms" for a, ms in r["actions"].items()), flush=True)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"config": cfg, "results": results}, f, ensure_ascii=False, indent=1)
+        print(f"결과 저장: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import catalog
+import map_render
+import sighting_map
+import tracing
+from check_progress import RARE_BIRDS, legacy_calculate_achievements, legacy_calculate_xp_and_level
+from fake_gsheets import FakeGSheetsConnection
+from identify import StubClient, identify_many
+from progress import ProgressEngine
+from sighting_frame import SightingSchema
+from storage import GSheetsStore
+from synthetic import load_catalog, sighting_log
+
+# --- [핫 패스 벤치마크 모음] ---
+# 합성 기록(100 ~ 100만 행)으로 rerun마다 도는 함수들을 함수 단위로 재고, 결과를 JSON으로 남겨 비교합니다.
+# 구글 시트는 benchmarks/fake_gsheets.py, Gemini는 identify.StubClient로 대신하므로 네트워크/키가 필요 없습니다.
+# 실행: python benchmarks/suite.py [--sizes 100,1000,10000,100000] [--full] [--json out.json] [--compare base.json]
+#  --full: 100만 행 추가 / --compare: 이전 JSON과 case·행 수별 median 비교 (느려진 항목 표시)
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000]
+FULL_SIZE = 1_000_000
+REGRESSION = 1.10   # --compare에서 이 배율보다 느려지면 표시
+NOISE_MS = 0.05     # 단, 차이가 이보다 작으면(마이크로초 단위 함수) 잡음으로 보고 표시하지 않음
+SPANS = 10_000      # tracing_span_*: 구간 수
+
+
+def timed(fn, repeat):
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - t0) * 1000)
+    return runs
+
+
+def spans(tracer):
+    # 계측을 끈 상태(설치 안 함) / 켠 상태로 rerun 하나 안에서 구간 SPANS개
+    previous = tracing.active()
+    tracing.install(tracer)
+    try:
+        tracing.begin("bench")
+        for i in range(SPANS):
+            with tracing.span("bench", rows=i): pass
+        tracing.end()
+    finally:
+        tracing.install(previous)
+
+
+def family_emoji(family_map):
+    return lambda name: "🦆" if "오리" in family_map.get(name, "") else "🐦"
+
+
+def cases(raw, bird_map, family_map, family_groups, family_totals):
+    # (이름, 함수) — 각 함수는 같은 입력으로 여러 번 불려도 결과가 같아야 함
+    schema = SightingSchema(bird_map, family_map, RARE_BIRDS)
+    store = GSheetsStore(FakeGSheetsConnection(raw, latency=0, bandwidth=None), "bench")
+    df = schema.normalize(raw)
+    engine = ProgressEngine(family_map, RARE_BIRDS)
+    engine.rebuild(df["bird_name"], version=1)
+    achievements = engine.achievements()
+    payload, center = sighting_map.marker_payload(sighting_map.located(df), family_emoji(family_map))
+    legacy_df = raw.copy()
+    return [
+        ("get_data", lambda: schema.normalize(store.read())),
+        ("achievements_rebuild", lambda: ProgressEngine(family_map, RARE_BIRDS).rebuild(df["bird_name"], version=1)),
+        ("achievements", engine.achievements),
+        ("xp_and_level", lambda: engine.xp_and_level(achievements)),
+        ("legacy_calculate_achievements", lambda: legacy_calculate_achievements(legacy_df.copy())),
+        ("legacy_calculate_xp_and_level", lambda: legacy_calculate_xp_and_level(legacy_df, achievements)),
+        ("family_summary", lambda: engine.family_summary(family_groups, family_totals)),
+        ("map_payload", lambda: sighting_map.marker_payload(sighting_map.located(df), family_emoji(family_map))),
+        ("map_render", lambda: map_render.build_map(payload, center).get_root().render()),
+    ]
+
+
+def run(sizes, repeat, legacy_max):
+    os.chdir(ROOT)
+    results = []
+
+    def record(case, rows, runs):
+        results.append({"case": case, "rows": rows, "repeat": len(runs),
+                        "min_ms": round(min(runs), 4), "median_ms": round(statistics.median(runs), 4)})
+        print(f"{case:32s} {rows:>9,} | min {min(runs):10.3f} ms | median {statistics.median(runs):10.3f} ms", flush=True)
+
+    record("load_bird_map", 0, timed(catalog.load_bird_map, repeat))
+    bird_map, family_map, _, family_totals, family_groups, _ = catalog.load_bird_map()
+    jobs = [(f"IMG_{i:04d}.jpg", None, None) for i in range(20)]
+    record("identify_many_stub", len(jobs), timed(lambda: list(identify_many(StubClient(latency=0), jobs, max_workers=4, per_second=1000)), repeat))
+
+    record("tracing_span_off", SPANS, timed(lambda: spans(None), repeat))
+    record("tracing_span_on", SPANS, timed(lambda: spans(tracing.Tracer()), repeat))
+
+    catalog_data = load_catalog()
+    for n in sizes:
+        t0 = time.perf_counter()
+        raw = sighting_log(n, RARE_BIRDS, seed=n, catalog_data=catalog_data)
+        print(f"-- {n:,}행 생성 {time.perf_counter() - t0:.1f}s", flush=True)
+        for name, fn in cases(raw, bird_map, family_map, family_groups, family_totals):
+            if name.startswith("legacy_") and n > legacy_max: continue
+            record(name, n, timed(fn, repeat if n < FULL_SIZE else max(1, repeat // 2)))
+    return results
+
+
+def meta():
+    try: commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError: commit = None
+    return {"time": datetime.now().isoformat(timespec="seconds"), "commit": commit, "python": platform.python_version(),
+            "pandas": pd.__version__, "machine": platform.machine(), "cpus": os.cpu_count()}
+
+
+def compare(results, base_path):
+    with open(base_path, encoding="utf-8") as f:
+        base = {(r["case"], r["rows"]): r for r in json.load(f)["results"]}
+    print(f"\n비교 기준: {base_path}")
+    for r in results:
+        old = base.get((r["case"], r["rows"]))
+        if not old or not old["median_ms"]: continue
+        ratio = r["median_ms"] / old["median_ms"]
+        mark = "  ⚠️ 느려짐" if ratio > REGRESSION and r["median_ms"] - old["median_ms"] > NOISE_MS else ""
+        print(f"{r['case']:32s} {r['rows']:>9,} | {old['median_ms']:10.3f} -> {r['median_ms']:10.3f} ms (x{ratio:.2f}){mark}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)))
+    parser.add_argument("--full", action="store_true", help="100만 행까지")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--legacy-max", type=int, default=100_000, help="기존 구현은 이 행 수까지만")
+    parser.add_argument("--json", help="결과를 저장할 JSON 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    if args.full and FULL_SIZE not in sizes: sizes.append(FULL_SIZE)
+    results = run(sizes, args.repeat, args.legacy_max)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta(), "results": results}, f, ensure_ascii=False, indent=1)
+        print(f"\n결과 저장: {args.json}")
+    if args.compare: compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
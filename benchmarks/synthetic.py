@@ -0,0 +1,88 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+import catalog
+import gazetteer
+from storage import DATE_FORMAT, SIGHTING_COLUMNS
+
+# --- [합성 탐조 기록 생성기] ---
+# 실제 data.csv 카탈로그의 종으로 시트에서 읽은 것과 같은 모양(object 컬럼)의 기록을 만듭니다.
+#  - 희귀종(RARE_BIRDS) 비율, 목록에 없는 옛 이름, 같은 행을 그대로 다시 넣은 중복 행
+#  - 좌표: 일부는 places.csv 탐조지 주변(정규분포)에 몰리고 나머지는 한반도 범위에 고르게, 일부는 위치 없음
+# 100행 ~ 100만 행을 numpy로 한 번에 만듭니다 (행 단위 파이썬 반복 없음).
+
+KOREA_LAT = (33.1, 38.6)
+KOREA_LON = (125.0, 130.9)
+SPOT_SIGMA_DEG = 0.03
+DATE_RANGE = ("2020-01-01", "2025-12-31")
+SEXES = np.array(["미구분", "수컷", "암컷"], dtype=object)
+UNKNOWN_NAMES = np.array(["모르는새", "옛이름새"], dtype=object)
+
+
+def load_catalog():
+    # (BIRD_MAP, FAMILY_MAP, 탐조지 목록) — 저장소 루트 기준 경로로 읽음
+    cwd = os.getcwd()
+    os.chdir(ROOT)
+    try:
+        bird_map, family_map = catalog.load_bird_map()[:2]
+        spots = [p for p in gazetteer.load_places() if p["kind"] == "탐조지"]
+    finally:
+        os.chdir(cwd)
+    return bird_map, family_map, spots
+
+
+def sighting_log(n, rare_birds, seed=0, rare_share=0.15, unknown_share=0.01, dup_share=0.05,
+                 located_share=0.8, spot_share=0.6, catalog_data=None):
+    bird_map, _, spots = catalog_data or load_catalog()
+    rng = np.random.default_rng(seed)
+    names = np.array(list(bird_map), dtype=object)
+    rare = np.array([r for r in rare_birds if r in bird_map], dtype=object)
+
+    # 종: 흔한 종일수록 자주 (Zipf 비슷하게) + 희귀종/모르는 이름을 일정 비율로
+    weights = 1.0 / np.arange(1, len(names) + 1)
+    picked = names[rng.permutation(len(names))][rng.choice(len(names), n, p=weights / weights.sum())]
+    roll = rng.random(n)
+    if len(rare): picked = np.where(roll < rare_share, rare[rng.integers(0, len(rare), n)], picked)
+    picked = np.where((roll >= rare_share) & (roll < rare_share + unknown_share), UNKNOWN_NAMES[rng.integers(0, len(UNKNOWN_NAMES), n)], picked)
+
+    # 좌표: 탐조지 주변 / 고르게 / 없음
+    lat = rng.uniform(*KOREA_LAT, n)
+    lon = rng.uniform(*KOREA_LON, n)
+    if spots:
+        at_spot = rng.random(n) < spot_share
+        which = rng.integers(0, len(spots), n)
+        spot_lat = np.array([p["lat"] for p in spots])[which] + rng.normal(0, SPOT_SIGMA_DEG, n)
+        spot_lon = np.array([p["lon"] for p in spots])[which] + rng.normal(0, SPOT_SIGMA_DEG, n)
+        lat = np.where(at_spot, spot_lat, lat)
+        lon = np.where(at_spot, spot_lon, lon)
+        labels = np.array([f"{p['name']} ({p['region']})" for p in spots], dtype=object)
+        location = np.where(at_spot, labels[which], None)
+    else:
+        location = np.full(n, None, dtype=object)
+    missing = rng.random(n) >= located_share
+    lat = np.where(missing, None, np.round(lat, 6).astype(object))
+    lon = np.where(missing, None, np.round(lon, 6).astype(object))
+    location = np.where(missing, None, location)
+
+    start, end = (pd.Timestamp(d).value // 60_000_000_000 for d in DATE_RANGE)
+    minutes = rng.integers(start, end, n)
+    dates = pd.to_datetime(minutes, unit="m").strftime(DATE_FORMAT).to_numpy(dtype=object)
+
+    df = pd.DataFrame({
+        "No": [bird_map.get(x) for x in picked], "bird_name": picked,
+        "sex": SEXES[rng.integers(0, len(SEXES), n)], "date": dates,
+        "lat": lat, "lon": lon, "location": location,
+    }, columns=SIGHTING_COLUMNS).astype(object)
+
+    # 중복 행: 앞에서 고른 행을 그대로 복사해 넣음 (시트에 같은 기록이 두 번 들어간 경우)
+    dups = int(n * dup_share)
+    if dups and n > 1:
+        src = rng.integers(0, n, dups)
+        dst = rng.choice(n, dups, replace=False)
+        df.iloc[dst] = df.iloc[src].to_numpy()
+    return df
@@ -1,15 +1,23 @@
 import streamlit as st
 import pandas as pd
-from streamlit_gsheets import GSheetsConnection
-import google.generativeai as genai
-from PIL import Image, ExifTags
+from PIL import Image
 from datetime import datetime
+import logging
 import os
-import time
-import folium
-from streamlit_folium import st_folium
-# ⭐️ LocateControl 추가됨
-from folium.plugins import MarkerCluster, Geocoder, LocateControl
+import catalog
+import collection_grid
+import gazetteer
+import notices
+import sighting_map
+import tracing
+from geo_index import SpatialIndex
+import sprites
+from progress import ProgressEngine
+from imaging import as_blob, get_gps_from_image, prepare_image
+from identify import ERROR_RESULT, GeminiClient, ResultCache, StubClient, content_key, identify_many, identify_one, parse_answer
+from bulk_import import count_photos, resolve_folder, scan
+from sighting_frame import SightingSchema
+from storage import GSheetsStore, SQLiteStore, SightingsCache, migrate_from_sheet, user_key, DATE_FORMAT, make_row
 
 # --- [1. 기본 설정] ---
 st.set_page_config(page_title="탐조 도감", layout="wide", page_icon="📚")
@@ -66,6 +74,13 @@ div.stButton > button[kind="primary"] { background: linear-gradient(45deg, #64B5
     color: #555 !important;
 }
 
+/* 사이드바 과별 현황 (details 한 덩어리) */
+.family-panel details { background-color: white; border-radius: 8px; border: 1px solid #e0e0e0; box-shadow: 0 1px 2px rgba(0,0,0,0.05); margin-bottom: 8px; padding: 6px 12px; }
+.family-panel summary { font-weight: 600; color: #333; cursor: pointer; }
+.family-panel .family-label { font-weight: 700; font-size: 0.9rem; color: #333; margin: 8px 0 2px 0; }
+.family-panel .family-names { font-size: 0.85rem; color: #808495; margin: 0; }
+.family-panel .family-done { background-color: #e8f5e9; color: #1b5e20; border-radius: 6px; padding: 6px 10px; margin: 8px 0 4px 0; font-size: 0.9rem; }
+
 /* 레벨업 바 스타일 */
 .level-container {
     background-color: white;
@@ -82,12 +97,52 @@ div.stButton > button[kind="primary"] { background: linear-gradient(45deg, #64B5
 """, unsafe_allow_html=True)
 
 try:
-    SHEET_URL = st.secrets["connections"]["gsheets"]["spreadsheet"]
+    # ⭐️ 저장소 선택: [storage] backend = "gsheets"(기본) 또는 "sqlite"
+    STORAGE_SETTINGS = st.secrets.get("storage", {})
+    STORAGE_BACKEND = STORAGE_SETTINGS.get("backend", "gsheets")
+    SHEET_URL = st.secrets.get("connections", {}).get("gsheets", {}).get("spreadsheet")
+    if STORAGE_BACKEND == "gsheets" and not SHEET_URL: raise KeyError("spreadsheet")
     API_KEY = st.secrets["GOOGLE_API_KEY"]
 except:
     st.error("🚨 Secrets 설정이 필요합니다.")
     st.stop()
 
+# 시트를 다시 읽기 전까지 캐시를 신뢰하는 최대 시간(초). 다른 기기에서 추가한 기록은 이 시간 안에 반영됩니다.
+CACHE_STALENESS_SEC = float(st.secrets.get("cache_staleness_sec", 300))
+# AI 판별 설정: [ai] backend("gemini"/"stub"), max_workers, requests_per_second, retries, cache_path, cache_max_mb
+AI_SETTINGS = st.secrets.get("ai", {})
+# 일괄 가져오기에서 서버 폴더를 읽을 수 있는 루트 (비워 두면 zip 업로드만)
+BULK_PHOTO_ROOT = AI_SETTINGS.get("bulk_photo_root")
+# 근처 기록 질의 기본 반경(km)
+NEARBY_KM = int(st.secrets.get("nearby_km", 5))
+# ⭐️ 사용자별 기록: [storage] per_user = true면 로그인한 계정마다 워크시트(시트) / user_id 파티션(sqlite)을 따로 씀
+PER_USER = bool(STORAGE_SETTINGS.get("per_user", False))
+# 사용자별 캐시(기록/업적 엔진/공간 인덱스)를 프로세스에 들고 있을 최대 사용자 수, 순위표를 다시 읽는 간격(초)
+MAX_CACHED_USERS = int(STORAGE_SETTINGS.get("max_cached_users", 64))
+# 사용자 구분을 켜기 전에 쌓인 기록의 주인 계정(이메일). 비워 두면 그 기록은 아무 사용자에게도 보이지 않음
+LEGACY_OWNER = STORAGE_SETTINGS.get("legacy_owner")
+LEADERBOARD_TTL_SEC = float(STORAGE_SETTINGS.get("leaderboard_ttl_sec", 60))
+# 기록 버전으로 구분하는 캐시(지도 마커, 과별 현황)의 항목 수 — 사용자별로 버전이 다르므로 사용자 수만큼
+VERSION_CACHE_ENTRIES = max(4, MAX_CACHED_USERS) if PER_USER else 4
+# rerun 구간 계측: [tracing] enabled, log_path(회전 로그), prom_path(Prometheus 텍스트), slow_ms, max_mb, backups
+TRACING_SETTINGS = st.secrets.get("tracing", {})
+
+# ⭐️ 계측기는 프로세스에 하나 (꺼져 있으면 설치하지 않아 구간 측정이 빈 호출이 됨)
+@st.cache_resource
+def get_tracer():
+    if not TRACING_SETTINGS.get("enabled"): return None
+    return tracing.Tracer(
+        log_path=TRACING_SETTINGS.get("log_path", os.path.join(".cache", "trace.log")),
+        prom_path=TRACING_SETTINGS.get("prom_path"),
+        slow_ms=float(TRACING_SETTINGS.get("slow_ms", tracing.SLOW_MS)),
+        max_bytes=int(float(TRACING_SETTINGS.get("max_mb", 5)) * 1_000_000),
+        backups=int(TRACING_SETTINGS.get("backups", 3)),
+        prom_interval=float(TRACING_SETTINGS.get("prom_interval_sec", tracing.PROM_INTERVAL_SEC)),
+    )
+
+tracing.install(get_tracer())
+tracing.begin("app")
+
 # --- [2. 데이터 및 설정] ---
 ACHIEVEMENT_INFO = {
     "🐣 탐조 입문": {"tier": "rare", "desc": "첫 번째 새를 기록했습니다! 위대한 여정의 시작입니다.", "rank": 1},
@@ -136,155 +191,212 @@ RARE_BIRDS = {
 RARE_LABEL = { "class1": "👑 멸종위기 1급", "class2": "⭐ 멸종위기 2급", "natural": "🌿 천연기념물" }
 
 # --- [3. 로직 함수] ---
+# ⭐️ data.csv 대신 미리 구워둔 카탈로그(assets/catalog.pkl)를 읽음 (빌드: python catalog.py)
 @st.cache_data
 def load_bird_map():
-    file_path = "data.csv"
-    if not os.path.exists(file_path): return {}, {}, 0, {}, {}, {}
-    encodings = ['utf-8-sig', 'cp949', 'euc-kr']
-    for enc in encodings:
-        try:
-            df = pd.read_csv(file_path, skiprows=2, header=None, encoding=enc)
-            if df.shape[1] < 15: continue
-            
-            # ⭐️ 0번 컬럼(No), 4번(국명), 14번(과) 추출
-            bird_data = df.iloc[:, [0, 4, 14]].copy()
-            bird_data.columns = ['id', 'name', 'family']
-            bird_data = bird_data.dropna()
-            
-            # ID를 정수형으로 변환
-            bird_data['id'] = pd.to_numeric(bird_data['id'], errors='coerce')
-            bird_data = bird_data.dropna(subset=['id'])
-            bird_data['id'] = bird_data['id'].astype(int)
-            
-            bird_data['name'] = bird_data['name'].astype(str).str.strip()
-            bird_data['family'] = bird_data['family'].astype(str).str.strip()
-            filter_keywords = ['대표국명', '국명', 'Name', 'Family', '과']
-            bird_data = bird_data[~bird_data['family'].isin(filter_keywords)]
-            
-            # 번호 -> 이름 매핑 (그리드뷰 표시용)
-            id_to_name = dict(zip(bird_data['id'], bird_data['name']))
-            
-            # 이름 -> 번호 매핑
-            name_to_no = dict(zip(bird_data['name'], bird_data['id']))
-            name_to_family = dict(zip(bird_data['name'], bird_data['family']))
-            
-            total_species_count = len(id_to_name)
-            
-            family_groups = {}
-            for index, row in bird_data.iterrows():
-                fam = row['family']
-                nm = row['name']
-                if fam not in family_groups: family_groups[fam] = []
-                family_groups[fam].append(nm)
-            family_total_counts = bird_data['family'].value_counts().to_dict()
-            return name_to_no, name_to_family, total_species_count, family_total_counts, family_groups, id_to_name
-        except Exception as e: continue
-    return {}, {}, 0, {}, {}, {}
+    return catalog.load_bird_map()
+
+@st.cache_data
+def load_species_info():
+    cat = catalog.load_catalog()
+    return catalog.species_info(cat) if cat else {}
 
 BIRD_MAP, FAMILY_MAP, TOTAL_SPECIES_COUNT, FAMILY_TOTAL_COUNTS, FAMILY_GROUPS, ID_TO_NAME = load_bird_map()
-conn = st.connection("gsheets", type=GSheetsConnection)
+SPECIES_INFO = load_species_info()
 
-def get_gps_from_image(image):
-    try:
-        exif_data = image._getexif()
-        if not exif_data: return None, None
-        
-        gps_info = {}
-        for tag, value in exif_data.items():
-            decoded = ExifTags.TAGS.get(tag, tag)
-            if decoded == "GPSInfo":
-                gps_info = value
-                break
-        
-        if not gps_info: return None, None
+# ⭐️ 도감 스프라이트 아틀라스 인덱스 (빌드: python sprites.py)
+@st.cache_data
+def load_sprite_atlas():
+    return sprites.load_atlas_index()
+
+SPRITE_ATLAS = load_sprite_atlas()
+
+# ⭐️ 오프라인 지명 사전 (장소 검색 + 좌표 -> 지명)
+@st.cache_resource
+def load_gazetteer():
+    return gazetteer.load_gazetteer()
+
+GAZETTEER = load_gazetteer()
+
+# ⭐️ streamlit_gsheets는 구글 시트 저장소를 열 때만 import (sqlite 저장소는 불러오지 않음)
+@st.cache_resource
+def open_store():
+    if STORAGE_BACKEND == "sqlite":
+        base_store = SQLiteStore(STORAGE_SETTINGS.get("sqlite_path", "sightings.db"), pool_size=int(STORAGE_SETTINGS.get("pool_size", 4)))
+        # 기존 구글 시트 기록을 처음 한 번만 옮겨옵니다 (실패하면 다음 서버 시작 때 다시 시도)
+        if SHEET_URL and STORAGE_SETTINGS.get("migrate_from_sheet", True):
+            try:
+                from streamlit_gsheets import GSheetsConnection
+                migrate_from_sheet(GSheetsStore(st.connection("gsheets", type=GSheetsConnection), SHEET_URL), base_store)
+            except Exception: logging.getLogger("bird_app.storage").exception("구글 시트 기록 옮기기 실패 (다음 서버 시작 때 다시 시도)")
+    else:
+        from streamlit_gsheets import GSheetsConnection
+        base_store = GSheetsStore(st.connection("gsheets", type=GSheetsConnection), SHEET_URL)
+    # ⭐️ 사용자 구분을 켜기 전 기록(옮겨온 시트 기록 포함)은 legacy_owner 계정의 도감으로
+    if PER_USER and LEGACY_OWNER: base_store.claim_legacy(LEGACY_OWNER)
+    return base_store
+
+def current_user():
+    # 사용자 구분을 켠 경우 로그인한 계정(st.user, [auth] 설정)으로. 로그인 전이면 로그인 버튼만 보여주고 멈춤
+    if not PER_USER: return None
+    user = st.user.get("email")
+    if user: return user
+    st.info("🔑 로그인하면 나만의 도감을 쓸 수 있습니다.")
+    st.button("로그인", on_click=st.login, type="primary")
+    st.stop()
 
-        def convert_to_degrees(value):
-            d, m, s = value
-            return d + (m / 60.0) + (s / 3600.0)
+# ⭐️ 사용자별 저장소는 같은 연결(시트 연결 하나 / SQLite 연결 풀)을 나눠 쓰는 파티션 핸들
+@st.cache_resource(max_entries=MAX_CACHED_USERS)
+def open_user_store(user):
+    return open_store().for_user(user)
 
-        lat = convert_to_degrees(gps_info[2])
-        lon = convert_to_degrees(gps_info[4])
-        
-        if gps_info[1] == 'S': lat = -lat
-        if gps_info[3] == 'W': lon = -lon
-        
-        return lat, lon
-    except:
-        return None, None
+USER = current_user()
+store = open_user_store(USER)
+
+# ⭐️ 기록은 불러올 때 한 번만 타입을 맞춤 (종 범주 + 과/희귀도 코드, float32 좌표, datetime)
+@st.cache_resource
+def get_sighting_schema():
+    return SightingSchema(BIRD_MAP, FAMILY_MAP, RARE_BIRDS)
+
+SCHEMA = get_sighting_schema()
+
+def _load_sightings(user):
+    raw = open_user_store(user).read()
+    with tracing.span("normalize", rows=0 if raw is None else len(raw)):
+        return SCHEMA.normalize(raw)
+
+# ⭐️ 프로세스 전체에서 공유하는 기록 캐시 (데이터가 바뀌지 않은 rerun은 네트워크를 타지 않음) — 사용자마다 하나
+@st.cache_resource(max_entries=MAX_CACHED_USERS)
+def get_sightings_cache(user):
+    return SightingsCache(lambda: _load_sightings(user), max_staleness=CACHE_STALENESS_SEC)
+
+# ⭐️ 업적/경험치 카운터도 프로세스 전체에서 공유하고, 추가/삭제 때 증분으로만 갱신
+@st.cache_resource(max_entries=MAX_CACHED_USERS)
+def get_progress_engine(user):
+    return ProgressEngine(FAMILY_MAP, RARE_BIRDS)
+
+# ⭐️ 위치 기록 공간 인덱스 (근처 기록 질의용) — 업적 엔진과 같은 방식으로 증분 갱신
+@st.cache_resource(max_entries=MAX_CACHED_USERS)
+def get_spatial_index(user):
+    return SpatialIndex()
 
 def get_data():
-    try:
-        df = conn.read(spreadsheet=SHEET_URL, ttl=0)
-        expected_cols = ['No', 'bird_name', 'sex', 'date', 'lat', 'lon', 'location']
-        if df.empty: return pd.DataFrame(columns=expected_cols)
-        
-        for col in expected_cols:
-            if col not in df.columns:
-                df[col] = None
-                
-        if 'sex' not in df.columns: df['sex'] = '미구분'
-        if BIRD_MAP and 'bird_name' in df.columns:
-            df['real_no'] = df['bird_name'].apply(lambda x: BIRD_MAP.get(str(x).strip(), 9999))
-            df = df.sort_values(by='real_no', ascending=True)
-        return df
-    except: return pd.DataFrame(columns=['No', 'bird_name', 'sex', 'date', 'lat', 'lon', 'location'])
+    try: return get_sightings_cache(USER).get()
+    except: return SCHEMA.normalize(None)
+
+def get_progress(df):
+    engine = get_progress_engine(USER)
+    engine.sync(df, df.attrs.get('data_version'))
+    return engine
+
+# ⭐️ 지도 마커 데이터는 기록 버전마다 한 번만 직렬화 (_df는 해시하지 않고 버전으로만 구분)
+@st.cache_data(max_entries=VERSION_CACHE_ENTRIES)
+def get_map_payload(data_version, _df):
+    map_df = sighting_map.located(_df)
+    if map_df.empty: return None, sighting_map.DEFAULT_CENTER, 0
+    with tracing.span("map.payload", rows=len(map_df)):
+        payload, center = sighting_map.marker_payload(map_df, get_family_emoji)
+    return payload, center, len(map_df)
+
+def get_nearby_index(df):
+    index = get_spatial_index(USER)
+    index.sync(df, df.attrs.get('data_version'))
+    return index
+
+# ⭐️ 과별 수집 현황: 과 60여 개의 expander 대신 HTML 한 덩어리를 기록 버전마다 한 번만 만듦
+# (수집 목록은 업적 엔진의 과별 국명 집합에서, 미획득은 과 소속 순서대로 집합 조회로)
+@st.cache_data(max_entries=VERSION_CACHE_ENTRIES)
+def family_panel_html(data_version, _progress):
+    parts = ['<div class="family-panel">']
+    for family, count, total, collected_list, missing_list in _progress.family_summary(FAMILY_GROUPS, FAMILY_TOTAL_COUNTS):
+        body = []
+        if collected_list: body.append(f'<p class="family-label">✅ 획득 ({len(collected_list)})</p><p class="family-names">{", ".join(collected_list)}</p>')
+        if missing_list: body.append(f'<p class="family-label">🔒 미획득 ({len(missing_list)})</p><p class="family-names">{", ".join(missing_list)}</p>')
+        elif total > 0: body.append('<p class="family-done">🎉 모든 종 수집 완료!</p>')
+        parts.append(f'<details><summary>{family} ({count}/{total})</summary>{"".join(body)}</details>')
+    parts.append('</div>')
+    return "".join(parts)
+
+# ⭐️ 사이드바 과별 현황은 따로 도는 fragment — 위젯이 없어 자체 rerun이 없고, 내용은 기록이 바뀔 때만 다시 만듦
+@st.fragment
+@tracing.traced("fragment:family_panel")
+def family_panel(data_version, progress):
+    st.header("📊 과별 수집 현황")
+    if FAMILY_TOTAL_COUNTS: st.markdown(family_panel_html(data_version, progress), unsafe_allow_html=True)
+
+def _record_added(rows):
+    before, after = get_sightings_cache(USER).extend(rows, SCHEMA.extend)
+    get_progress_engine(USER).add([r['bird_name'] for r in rows], before, after)
+    get_spatial_index(USER).add(rows, before, after)
 
 def save_data(bird_name, sex, current_df, lat=None, lon=None, location=None):
     bird_name = bird_name.strip()
     if bird_name not in BIRD_MAP: return f"⚠️ '{bird_name}'은(는) 목록에 없습니다."
-    if not current_df.empty and bird_name in current_df['bird_name'].values: return "이미 등록된 새입니다."
+    if store.has_bird(bird_name, current_df): return "이미 등록된 새입니다."
     try:
-        now = datetime.now().strftime("%Y-%m-%d %H:%M")
-        real_no = BIRD_MAP.get(bird_name)
-        new_row = pd.DataFrame({
-            'No': [real_no], 'bird_name': [bird_name], 'sex': [sex], 'date': [now],
-            'lat': [lat], 'lon': [lon], 'location': [location]
-        })
-        updated_df = pd.concat([current_df, new_row], ignore_index=True)
-        conn.update(spreadsheet=SHEET_URL, data=updated_df)
+        now = datetime.now().strftime(DATE_FORMAT)
+        # ⭐️ 전체 시트 재업로드 대신 새 행만 추가
+        row = make_row(BIRD_MAP.get(bird_name), bird_name, sex, now, lat, lon, location or GAZETTEER.reverse(lat, lon))
+        store.append(row)
+        _record_added([row])
         return True
     except Exception as e: return str(e)
 
+def save_many(entries, current_df):
+    # 여러 장의 사진을 한 번의 요청으로 등록 (entries: bird_name, sex, lat, lon, date 딕셔너리 목록)
+    now = datetime.now().strftime(DATE_FORMAT)
+    seen = set()
+    rows, skipped = [], []
+    for e in entries:
+        name = e['bird_name'].strip()
+        if name not in BIRD_MAP or name in seen or store.has_bird(name, current_df):
+            skipped.append(name)
+            continue
+        seen.add(name)
+        rows.append(make_row(BIRD_MAP[name], name, e.get('sex', '미구분'), e.get('date') or now, e.get('lat'), e.get('lon'), e.get('location') or GAZETTEER.reverse(e.get('lat'), e.get('lon'))))
+    try:
+        store.append_many(rows)
+        if rows: _record_added(rows)
+        return [r['bird_name'] for r in rows], skipped
+    except Exception as e: return str(e), skipped
+
+def place_search(key):
+    # 지명 사전 접두어 검색 -> 고른 장소(dict) 또는 None
+    query = st.text_input("🔎 장소 검색", key=f"place_q_{key}", placeholder="예: 주남저수지, 순천, 강릉시")
+    if not query: return None
+    matches = GAZETTEER.search(query, limit=8)
+    if not matches:
+        st.caption("일치하는 장소가 없습니다.")
+        return None
+    pick = st.selectbox("검색 결과", range(len(matches)), format_func=lambda i: GAZETTEER.label(matches[i]), key=f"place_pick_{key}")
+    return matches[pick]
+
+# ⭐️ folium / streamlit_folium은 import가 무거워서 지도를 실제로 그릴 때 처음 불러옴 (콜드 스타트 단축)
+def build_map(*args, **kwargs):
+    import map_render
+    return map_render.build_map(*args, **kwargs)
+
+def show_map(m, **kwargs):
+    from streamlit_folium import st_folium
+    return st_folium(m, **kwargs)
+
+def place_map(place, auto_locate=False):
+    # 고른 장소가 있으면 그곳을 가운데에 핀으로
+    if place is None: return build_map(zoom_start=7, auto_locate=auto_locate)
+    import map_render
+    m = build_map(center=[place['lat'], place['lon']], zoom_start=12, auto_locate=auto_locate)
+    return map_render.add_pin(m, place['lat'], place['lon'], GAZETTEER.label(place))
+
 def delete_birds(bird_names_to_delete, current_df):
     try:
-        df = current_df[~current_df['bird_name'].isin(bird_names_to_delete)]
-        conn.update(spreadsheet=SHEET_URL, data=df)
+        # 시트 저장소는 화면용 프레임 대신 원본을 다시 읽어서 지움
+        store.delete_names(bird_names_to_delete)
+        before, after = get_sightings_cache(USER).drop_names(bird_names_to_delete)
+        get_progress_engine(USER).remove(bird_names_to_delete, before, after)
+        get_spatial_index(USER).remove(bird_names_to_delete, before, after)
         return True
     except Exception as e: return str(e)
 
-def calculate_achievements(df):
-    achievements = []
-    count = len(df)
-    
-    if count >= 1: achievements.append("🐣 탐조 입문")
-    if count >= 10: achievements.append("🌱 새싹 탐조가")
-    if count >= 50: achievements.append("🥉 아마추어 탐조가")
-    if count >= 150: achievements.append("🥈 베테랑 탐조가")
-    if count >= 300: achievements.append("🥇 마스터 탐조가")
-    if count >= 500: achievements.append("💎 전설의 탐조가")
-    
-    if not df.empty and FAMILY_MAP:
-        df['family'] = df['bird_name'].map(FAMILY_MAP)
-        fam_counts = df['family'].value_counts()
-        
-        if df['family'].nunique() >= 20: achievements.append("🌈 다채로운 시선")
-        if fam_counts.get('오리과', 0) >= 15: achievements.append("🦆 호수의 지배자")
-        if fam_counts.get('수리과', 0) + fam_counts.get('매과', 0) >= 10: achievements.append("🦅 하늘의 제왕")
-        if fam_counts.get('백로과', 0) >= 5: achievements.append("🦢 우아한 백로")
-        if fam_counts.get('딱다구리과', 0) >= 3: achievements.append("🌲 숲속의 드러머")
-        if fam_counts.get('올빼미과', 0) >= 3: achievements.append("🦉 밤의 추적자")
-        if fam_counts.get('까마귀과', 0) >= 3: achievements.append("🧠 똑똑한 새")
-        if fam_counts.get('박새과', 0) >= 3: achievements.append("👔 넥타이 신사")
-        if fam_counts.get('도요과', 0) >= 15: achievements.append("🏖️ 갯벌의 나그네")
-    
-    rare_count = 0
-    for name in df['bird_name']:
-        if name in RARE_BIRDS: rare_count += 1
-    if rare_count >= 3: achievements.append("🍀 럭키 탐조가")
-    if rare_count >= 10: achievements.append("🛡️ 자연의 수호자")
-    
-    return achievements
-
 def get_family_emoji(bird_name):
     if bird_name not in FAMILY_MAP: return "🐦"
     family = FAMILY_MAP[bird_name]
@@ -298,38 +410,51 @@ def get_family_emoji(bird_name):
     if "도요" in family or "물떼새" in family: return "🏖️"
     return "🐦"
 
-def calculate_xp_and_level(df, achievements):
-    total_xp = 0
-    if not df.empty:
-        for name in df['bird_name']:
-            if name in RARE_BIRDS:
-                rarity = RARE_BIRDS[name]
-                if rarity == "class1": total_xp += 50
-                else: total_xp += 30 
-            else:
-                total_xp += 10
-    total_xp += len(achievements) * 50
-    level = (total_xp // 100) + 1
-    current_xp_in_level = total_xp % 100
-    next_level_xp = 100
-    return level, current_xp_in_level, next_level_xp, total_xp
+def species_caption(bird_id, bird_name):
+    # 과 + 목/학명 + 국가생물종지식정보 링크
+    family = FAMILY_MAP.get(bird_name, '미상')
+    info = SPECIES_INFO.get(bird_id)
+    if not info: return family
+    caption = f"{info.get('order_ko') or ''} › {family} · *{info.get('sci_name') or ''}*"
+    if info.get('url'): caption += f" · [국가생물종 정보]({info['url']})"
+    return caption
+
+# ⭐️ 설정이 끝난 모델 클라이언트를 프로세스 전체에서 공유 (매 호출마다 configure 하지 않음)
+@st.cache_resource
+def get_ai_client():
+    if AI_SETTINGS.get("backend") == "stub": return StubClient(latency=float(AI_SETTINGS.get("stub_latency", 0)))
+    return GeminiClient(API_KEY)
+
+# ⭐️ 같은 서버의 모든 세션이 공유하는 판별 결과 캐시 (사진 내용 + 의견 기준)
+@st.cache_resource
+def get_result_cache():
+    return ResultCache(AI_SETTINGS.get("cache_path", os.path.join(".cache", "ai_results.sqlite")),
+                       max_bytes=int(float(AI_SETTINGS.get("cache_max_mb", 20)) * 1_000_000))
 
 def analyze_bird_image(image, user_doubt=None):
-    try:
-        genai.configure(api_key=API_KEY)
-        model = genai.GenerativeModel('gemini-2.5-flash') 
-        system_instruction = "당신은 조류 전문가입니다. 사진을 분석하여 '종명 | 판단근거' 형식으로 답하세요. 구체적인 종을 모르면 '새 아님'이라고 하세요."
-        prompt = f"{system_instruction}"
-        if user_doubt: prompt += f"\n사용자 반론: '{user_doubt}'. 재분석하세요."
-        response = model.generate_content([prompt, image])
-        return response.text.strip()
-    except: return "Error | 분석 오류"
+    with tracing.span("ai.identify"):
+        try: return identify_one(get_ai_client(), image, user_doubt, retries=int(AI_SETTINGS.get("retries", 3)))
+        except: return "Error | 분석 오류"
+
+def analyze_bird_images(jobs):
+    # jobs: (key, image, user_doubt) 목록. 동시에 보내고 끝나는 순서대로 (key, 결과)를 돌려줌
+    # (구간은 호출하는 쪽에서 결과를 다 받을 때까지로 잼: ai.identify_many)
+    return identify_many(
+        get_ai_client(), jobs,
+        max_workers=int(AI_SETTINGS.get("max_workers", 4)),
+        per_second=float(AI_SETTINGS.get("requests_per_second", 2)),
+        retries=int(AI_SETTINGS.get("retries", 3)),
+    )
 
 # --- [4. 메인 화면] ---
 st.title("📚 탐조 도감")
 
-df = get_data()
-current_achievements = calculate_achievements(df)
+with tracing.span("get_data") as s:
+    df = get_data()
+    s.tag(rows=len(df), version=df.attrs.get('data_version'))
+with tracing.span("achievements", rows=len(df)):
+    progress = get_progress(df)
+    current_achievements = progress.achievements()
 
 if 'my_achievements' not in st.session_state:
     st.session_state['my_achievements'] = current_achievements
@@ -337,10 +462,47 @@ if 'my_achievements' not in st.session_state:
 newly_earned = list(set(current_achievements) - set(st.session_state['my_achievements']))
 st.session_state['my_achievements'] = current_achievements
 
-level, curr_xp, req_xp, total_xp = calculate_xp_and_level(df, current_achievements)
+# ⭐️ 등록 결과/새 업적은 큐에 쌓았다가 토스트로 (sleep 없이 바로 다음 화면으로)
+for b in newly_earned: notices.push('achievement', f"🏆 **업적 달성!** [{b}]")
+notices.flush()
+
+level, curr_xp, req_xp, total_xp = progress.xp_and_level(current_achievements)
+
+# ⭐️ 순위표용 요약은 내 기록이 바뀌었을 때만 한 줄 갱신 (다른 사용자 기록은 읽지 않음)
+@st.cache_resource
+def get_rollup_marks():
+    return {}
+
+def publish_rollup():
+    marks = get_rollup_marks()
+    if marks.get(USER) == progress.version: return
+    row = {
+        # ⭐️ 이름이 없는 계정은 순위표에 이메일 대신 해시 앞부분만 보임
+        'user_id': user_key(USER), 'name': st.user.get("name") or f"탐조가 #{user_key(USER)[-6:]}",
+        'species': len(progress.names), 'records': progress.total, 'rare': progress.rare_total,
+        'achievements': len(current_achievements), 'level': level, 'xp': total_xp,
+        'updated': datetime.now().strftime(DATE_FORMAT),
+    }
+    try:
+        open_store().put_rollup(row)
+        marks[USER] = progress.version
+        load_leaderboard.clear()
+    except Exception:
+        # 순위표 갱신은 화면에 영향이 없으므로 기록만 남기고 다음 rerun에 다시 시도
+        logging.getLogger("bird_app.storage").exception("순위표 요약 저장 실패 (%s)", user_key(USER))
+
+@st.cache_data(ttl=LEADERBOARD_TTL_SEC, show_spinner=False)
+def load_leaderboard():
+    return open_store().rollups()
+
+if PER_USER:
+    with tracing.span("rollup"): publish_rollup()
 
 # 사이드바
-with st.sidebar:
+with st.sidebar, tracing.span("sidebar"):
+    if PER_USER:
+        st.caption(f"👤 {st.user.get('name') or USER}")
+        st.button("로그아웃", on_click=st.logout, key="logout")
     st.markdown(f"""
     <div class="level-container">
         <p class="level-text">Lv. {level}</p>
@@ -381,43 +543,10 @@ with st.sidebar:
     
     st.divider()
     
-    st.header("📊 과별 수집 현황")
-    if FAMILY_TOTAL_COUNTS:
-        my_family_counts = {}
-        my_collected_birds = {} 
-        
-        if not df.empty and FAMILY_MAP:
-            df['family'] = df['bird_name'].map(FAMILY_MAP)
-            my_family_counts = df['family'].value_counts().to_dict()
-            for idx, row in df.iterrows():
-                f = row['family']
-                n = row['bird_name']
-                if f not in my_collected_birds: my_collected_birds[f] = []
-                my_collected_birds[f].append(n)
-
-        sorted_families = sorted(FAMILY_TOTAL_COUNTS.keys())
-        
-        for family in sorted_families:
-            total = FAMILY_TOTAL_COUNTS[family]
-            count = my_family_counts.get(family, 0)
-            
-            with st.expander(f"{family} ({count}/{total})"):
-                collected_list = my_collected_birds.get(family, [])
-                if collected_list:
-                    st.markdown(f"**✅ 획득 ({len(collected_list)})**")
-                    st.caption(", ".join(collected_list))
-                
-                all_birds_in_family = FAMILY_GROUPS.get(family, [])
-                missing_list = [b for b in all_birds_in_family if b not in collected_list]
-                
-                if missing_list:
-                    st.markdown(f"**🔒 미획득 ({len(missing_list)})**")
-                    st.caption(", ".join(missing_list))
-                elif total > 0:
-                    st.success("🎉 모든 종 수집 완료!")
+    family_panel(df.attrs.get('data_version'), progress)
 
 # 메인 요약
-total_collected = len(df)
+total_collected = store.count(df)
 total_species = TOTAL_SPECIES_COUNT if TOTAL_SPECIES_COUNT > 0 else 1
 progress_percent = min((total_collected / total_species) * 100, 100)
 
@@ -433,107 +562,116 @@ st.markdown(f"""
 """, unsafe_allow_html=True)
 
 # 탭 메뉴
-tab1, tab2, tab3, tab4 = st.tabs(["✍️ 종 추가", "📜 나의 도감", "🏆 업적 도감", "🗺️ 탐조 지도"])
+# ⭐️ 선택된 탭을 서버가 알도록 (탐조 지도는 열었을 때만 folium을 불러와 그림)
+tab1, tab2, tab3, tab4 = st.tabs(["✍️ 종 추가", "📜 나의 도감", "🏆 업적 도감", "🗺️ 탐조 지도"], key="main_tab", on_change="rerun")
 
 # --- [Tab 1] 종 추가 (⭐️ LocateControl 적용) ---
-with tab1:
+with tab1, tracing.span("tab.add"):
     st.subheader("✍️ 새로운 새 기록하기")
-    input_method = st.radio("입력 방식 선택", ["📝 직접 이름 입력", "📸 AI 사진 분석"], horizontal=True)
+    input_method = st.radio("입력 방식 선택", ["📝 직접 이름 입력", "📸 AI 사진 분석", "📦 일괄 가져오기"], horizontal=True)
     
     if input_method == "📝 직접 이름 입력":
         sex_selection = st.radio("성별", ["미구분", "수컷", "암컷"], horizontal=True, key="manual_sex")
         
-        with st.expander("📍 위치 정보 추가 (선택)"):
-            st.caption("돋보기 버튼으로 장소를 검색하거나 지도를 클릭하세요.")
-            
-            m = folium.Map(location=[36.5, 127.5], zoom_start=7)
-            # ⭐️ 기능 추가: 내 위치 + 검색기
-            LocateControl(auto_start=False).add_to(m) # 수동 모드에서는 자동이동 끔 (선택권)
-            Geocoder(add_marker=False).add_to(m) 
-            
-            output = st_folium(m, width=700, height=300)
-            
-            lat, lon = None, None
-            if output['last_clicked']:
-                lat = output['last_clicked']['lat']
-                lon = output['last_clicked']['lng']
-                st.success(f"위치 선택됨: {lat:.4f}, {lon:.4f}")
+        # ⭐️ 위치 지도는 펼쳤을 때만 그림 (접혀 있으면 folium을 불러오지 않음)
+        # 고른 위치는 manual_pick에 남겨 두므로 지도를 접은 뒤에 이름을 입력해도 그 위치로 등록
+        if 'manual_pick' not in st.session_state: st.session_state.manual_pick = None
+        with st.expander("📍 위치 정보 추가 (선택)", key="manual_location", on_change="rerun") as location_box:
+            if location_box.open:
+                lat, lon = None, None
+                st.caption("장소를 검색하거나 지도를 클릭하세요. (검색은 내장 지명 사전으로 오프라인에서도 동작)")
+
+                # ⭐️ 내 위치(수동 모드에서는 자동이동 끔) + 오프라인 장소 검색
+                place = place_search("manual")
+                output = show_map(place_map(place), width=700, height=300)
+
+                if output['last_clicked']:
+                    lat = output['last_clicked']['lat']
+                    lon = output['last_clicked']['lng']
+                elif place:
+                    lat, lon = place['lat'], place['lon']
+                st.session_state.manual_pick = (lat, lon) if lat is not None else None
+                if lat is not None:
+                    st.success(f"위치 선택됨: {lat:.4f}, {lon:.4f} · {GAZETTEER.reverse(lat, lon) or '지명 없음'}")
+        if st.session_state.manual_pick and not location_box.open:
+            st.caption(f"📍 선택한 위치로 등록: {st.session_state.manual_pick[0]:.4f}, {st.session_state.manual_pick[1]:.4f}")
 
         def add_manual():
             name = st.session_state.input_bird.strip()
             sex = st.session_state.manual_sex 
             st.session_state.input_bird = ""
+            lat, lon = st.session_state.get('manual_pick') or (None, None)
             
             if name:
                 res = save_data(name, sex, df, lat=lat, lon=lon)
                 if res is True: 
                     msg = f"{name}({sex}) 등록 완료!"
                     if name in RARE_BIRDS: msg += f" ({RARE_LABEL.get(RARE_BIRDS[name])} 발견!)"
-                    st.session_state.add_message = ('success', msg)
+                    notices.push('success', msg)
                 else: 
-                    st.session_state.add_message = ('error', res)
+                    notices.push('error', res)
             
         st.text_input("새 이름을 입력하세요", key="input_bird", on_change=add_manual, placeholder="예: 참새")
         
-        if 'add_message' in st.session_state and st.session_state.add_message:
-            msg_type, msg_text = st.session_state.add_message
-            placeholder = st.empty()
-            
-            if msg_type == 'success':
-                placeholder.success(msg_text, icon="✅")
-                badge_placeholder = st.empty()
-                if newly_earned:
-                    for b in newly_earned:
-                        badge_placeholder.info(f"🏆 **업적 달성!** [{b}]", icon="🎉")
-                time.sleep(3)
-                placeholder.empty()
-                badge_placeholder.empty()
-                st.session_state.add_message = None
-            else:
-                placeholder.error(msg_text, icon="🚫")
-                time.sleep(3)
-                placeholder.empty()
-                st.session_state.add_message = None
-        
-    else: # AI 분석
+    elif input_method == "📸 AI 사진 분석":
         uploaded_files = st.file_uploader("새 사진 업로드", type=["jpg", "png", "jpeg"], accept_multiple_files=True)
         if 'ai_results' not in st.session_state: st.session_state.ai_results = {}
+        if 'prepared_photos' not in st.session_state or not uploaded_files: st.session_state.prepared_photos = {}
+
+        def get_prepared_photo(photo_key, file):
+            # ⭐️ 회전 보정 + 축소 + 재인코딩은 사진당 한 번만 하고, 재분석 때도 그대로 재사용
+            if photo_key not in st.session_state.prepared_photos:
+                st.session_state.prepared_photos[photo_key] = prepare_image(file.getvalue())
+            return st.session_state.prepared_photos[photo_key]
         
         if uploaded_files:
+            pending_entries = []
+            # ⭐️ 파일 이름 대신 사진 내용(해시)으로 구분. 같은 사진을 여러 번 올려도 한 장으로 취급
+            photos = {}
             for file in uploaded_files:
-                if file.name not in st.session_state.ai_results:
-                    with st.spinner(f"🔍 {file.name} 분석 중..."):
-                        img_obj = Image.open(file)
-                        analysis_result = analyze_bird_image(img_obj)
-                        gps_lat, gps_lon = get_gps_from_image(img_obj)
-                        
-                        st.session_state.ai_results[file.name] = {
-                            "text": analysis_result,
-                            "lat": gps_lat,
-                            "lon": gps_lon
-                        }
-                
-                result_data = st.session_state.ai_results[file.name]
+                photos.setdefault(content_key(file.getvalue()), file)
+            # 업로드 목록에서 빠진 사진의 전처리 결과는 버림 (사진당 수백 KB라 세션에 계속 쌓이지 않도록)
+            st.session_state.prepared_photos = {k: v for k, v in st.session_state.prepared_photos.items() if k in photos}
+            result_cache = get_result_cache()
+
+            # ⭐️ 아직 분석하지 않은 사진은 디스크 캐시부터 확인하고, 없는 것만 한꺼번에 동시 분석
+            new_keys = [k for k in photos if st.session_state.ai_results.get(k, {}).get("text") is None]
+            if new_keys:
+                jobs = []
+                for key in new_keys:
+                    # 깨지거나 잘린 사진은 그 사진만 분석 오류로 (페이지 전체가 멈추지 않도록)
+                    try:
+                        img_obj = Image.open(photos[key])
+                        gps_lat, gps_lon = get_gps_from_image(img_obj)  # 전처리하면 EXIF가 사라지므로 먼저 읽음
+                        cached = result_cache.get(key)
+                        if cached is None: jobs.append((key, as_blob(get_prepared_photo(key, photos[key])), None))
+                    except Exception:
+                        st.session_state.ai_results[key] = {"text": ERROR_RESULT, "lat": None, "lon": None}
+                        continue
+                    st.session_state.ai_results[key] = {"text": cached, "lat": gps_lat, "lon": gps_lon}
+                if jobs:
+                    progress_bar = st.progress(0.0, text=f"🔍 사진 {len(jobs)}장 분석 중...")
+                    with tracing.span("ai.identify_many", photos=len(jobs)):
+                        for done, (key, analysis_result) in enumerate(analyze_bird_images(jobs), start=1):
+                            st.session_state.ai_results[key]["text"] = analysis_result
+                            result_cache.put(key, analysis_result)
+                            progress_bar.progress(done / len(jobs), text=f"🔍 {photos[key].name} 분석 완료 ({done}/{len(jobs)})")
+                    progress_bar.empty()
+
+            for photo_key, file in photos.items():
+                fid = photo_key[:16]
+                result_data = st.session_state.ai_results[photo_key]
                 raw = result_data["text"]
                 gps_lat = result_data["lat"]
                 gps_lon = result_data["lon"]
 
-                if "|" in raw:
-                    parts = raw.split("|", 1)
-                    bird_name = parts[0].strip()
-                    reason = parts[1].strip()
-                else:
-                    bird_name = raw.strip()
-                    reason = "상세 이유를 가져오지 못했습니다."
-                
-                invalid_keywords = ["새이름", "종명", "이름", "새 이름", "모름", "알수없음"]
-                if bird_name in invalid_keywords: bird_name = "판독 불가"
-                is_valid_bird = True
-                if bird_name in ["새 아님", "Error", "판독 불가"] or "오류" in bird_name: is_valid_bird = False
+                bird_name, reason, is_valid_bird = parse_answer(raw)
 
                 with st.container(border=True):
                     c1, c2 = st.columns([1, 1.5])
-                    with c1: st.image(file, use_container_width=True)
+                    with c1:
+                        try: st.image(file, use_container_width=True)
+                        except Exception: st.caption("🖼️ 사진을 열 수 없습니다.")
                     with c2:
                         if is_valid_bird:
                             display_name = bird_name
@@ -552,25 +690,26 @@ with tab1:
                             else:
                                 st.warning("📍 위치 정보가 없습니다. 아래 지도에서 검색하거나 클릭하세요.")
                                 
-                                m_pick = folium.Map(location=[36.5, 127.5], zoom_start=7)
-                                # ⭐️ AI 분석 모드 지도에도 기능 추가
-                                LocateControl(auto_start=False).add_to(m_pick)
-                                Geocoder(add_marker=False).add_to(m_pick)
-                                
-                                picked_loc = st_folium(m_pick, width='100%', height=200, key=f"map_{file.name}")
+                                # ⭐️ AI 분석 모드 지도에도 내 위치 + 오프라인 장소 검색
+                                pick_place = place_search(fid)
+                                picked_loc = show_map(place_map(pick_place), width='100%', height=200, key=f"map_{fid}")
                                 if picked_loc['last_clicked']:
                                     final_lat = picked_loc['last_clicked']['lat']
                                     final_lon = picked_loc['last_clicked']['lng']
-                                    st.info(f"선택된 위치: {final_lat:.4f}, {final_lon:.4f}")
+                                elif pick_place:
+                                    final_lat, final_lon = pick_place['lat'], pick_place['lon']
+                                if final_lat is not None:
+                                    st.info(f"선택된 위치: {final_lat:.4f}, {final_lon:.4f} · {GAZETTEER.reverse(final_lat, final_lon) or '지명 없음'}")
 
                             col_sex, col_btn = st.columns([1, 1])
                             with col_sex:
-                                ai_sex = st.radio("성별", ["미구분", "수컷", "암컷"], horizontal=True, key=f"sex_{file.name}", label_visibility="collapsed")
+                                ai_sex = st.radio("성별", ["미구분", "수컷", "암컷"], horizontal=True, key=f"sex_{fid}", label_visibility="collapsed")
+                            pending_entries.append({"bird_name": bird_name, "sex": ai_sex, "lat": final_lat, "lon": final_lon})
                             with col_btn:
-                                if st.button(f"도감에 등록하기", key=f"reg_{file.name}", type="primary", use_container_width=True):
+                                if st.button(f"도감에 등록하기", key=f"reg_{fid}", type="primary", use_container_width=True):
                                     res = save_data(bird_name, ai_sex, df, lat=final_lat, lon=final_lon)
                                     if res is True: 
-                                        st.session_state.add_message = ('success', f"✅ {bird_name}({ai_sex}) 등록 성공!")
+                                        notices.push('success', f"✅ {bird_name}({ai_sex}) 등록 성공!")
                                         st.rerun()
                                     else: st.error(res)
                         else:
@@ -578,148 +717,163 @@ with tab1:
                             st.write(reason)
                         st.divider()
                         c_ask1, c_ask2 = st.columns([0.7, 0.3])
-                        user_opinion = c_ask1.text_input("의견", key=f"doubt_{file.name}", placeholder="예: 말똥가리 아냐?", label_visibility="collapsed")
-                        if c_ask2.button("재분석", key=f"ask_{file.name}", use_container_width=True):
+                        user_opinion = c_ask1.text_input("의견", key=f"doubt_{fid}", placeholder="예: 말똥가리 아냐?", label_visibility="collapsed")
+                        if c_ask2.button("재분석", key=f"ask_{fid}", use_container_width=True):
                             if user_opinion:
                                 with st.spinner("재분석 중..."):
-                                    img_obj = Image.open(file)
-                                    old_lat = st.session_state.ai_results[file.name]["lat"]
-                                    old_lon = st.session_state.ai_results[file.name]["lon"]
-                                    new_result = analyze_bird_image(img_obj, user_opinion)
-                                    st.session_state.ai_results[file.name] = {
-                                        "text": new_result,
-                                        "lat": old_lat,
-                                        "lon": old_lon
-                                    }
+                                    doubt_key = content_key(file.getvalue(), user_opinion)
+                                    new_result = result_cache.get(doubt_key)
+                                    if new_result is None:
+                                        try: new_result = analyze_bird_image(as_blob(get_prepared_photo(photo_key, file)), user_opinion)
+                                        except Exception: new_result = ERROR_RESULT
+                                        result_cache.put(doubt_key, new_result)
+                                    st.session_state.ai_results[photo_key]["text"] = new_result
                                     st.rerun()
+
+            # ⭐️ 여러 장 한 번에 등록 (시트에 한 번만 추가 요청)
+            if len(pending_entries) > 1:
+                if st.button(f"📥 분석된 새 {len(pending_entries)}종 모두 등록", key="reg_all", type="primary", use_container_width=True):
+                    added, skipped = save_many(pending_entries, df)
+                    if isinstance(added, str): st.error(added)
+                    else:
+                        msg = f"✅ {len(added)}종 등록 성공!"
+                        if skipped: msg += f" (건너뜀: {', '.join(skipped)})"
+                        notices.push('success', msg)
+                        st.rerun()
         
-        if 'add_message' in st.session_state and st.session_state.add_message:
-            msg_type, msg_text = st.session_state.add_message
-            placeholder = st.empty()
-            if msg_type == 'success':
-                placeholder.success(msg_text, icon="✅")
-                badge_placeholder = st.empty()
-                if newly_earned:
-                    for b in newly_earned:
-                        badge_placeholder.info(f"🏆 **업적 달성!** [{b}]", icon="🎉")
-                time.sleep(3)
-                placeholder.empty()
-                badge_placeholder.empty()
-                st.session_state.add_message = None
+    else: # 일괄 가져오기
+        # ⭐️ 서버 폴더는 [ai] bulk_photo_root로 관리자가 정한 폴더 아래만 (방문자가 임의 경로를 읽지 못하도록)
+        st.caption("탐조 한 번에 찍은 사진을 zip으로 묶어 올리세요. 사진은 한 장씩 읽어서 분석합니다.")
+        bulk_zip = st.file_uploader("사진 zip 파일", type=["zip"], key="bulk_zip")
+        bulk_dir = st.text_input("또는 사진 폴더 (공유 사진 폴더 기준 경로)", key="bulk_dir", placeholder="예: 2024-05-01") if BULK_PHOTO_ROOT else ""
+
+        if st.button("🔍 일괄 분석 시작", key="bulk_start", use_container_width=True):
+            source = bulk_zip if bulk_zip is not None else (resolve_folder(BULK_PHOTO_ROOT, bulk_dir.strip()) if bulk_dir.strip() else None)
+            if not source:
+                st.error("zip 파일을 올리거나 공유 사진 폴더 안의 폴더를 입력하세요." if BULK_PHOTO_ROOT else "zip 파일을 올리세요.")
             else:
-                placeholder.error(msg_text, icon="🚫")
-                time.sleep(3)
-                placeholder.empty()
-                st.session_state.add_message = None
+                total_photos = max(1, count_photos(source))
+                bar = st.progress(0.0, text=f"📦 사진 {total_photos}장 분석 중...")
+                done = []
+                def on_progress(row):
+                    done.append(row)
+                    bar.progress(min(len(done) / total_photos, 1.0), text=f"🔍 {row['file']} ({len(done)}/{total_photos})")
+                with tracing.span("ai.bulk_scan", photos=total_photos):
+                    st.session_state.bulk_rows = scan(
+                        source, get_ai_client(), get_result_cache(),
+                        max_workers=int(AI_SETTINGS.get("max_workers", 4)),
+                        per_second=float(AI_SETTINGS.get("requests_per_second", 2)),
+                        on_progress=on_progress,
+                    )
+                bar.empty()
+
+        bulk_rows = st.session_state.get("bulk_rows")
+        if bulk_rows:
+            # ⭐️ 한 장의 검토 표에서 확인/수정 후 한 번에 저장
+            review_df = pd.DataFrame([{
+                "등록": r["valid"] and r["bird_name"] in BIRD_MAP,
+                "파일": r["file"], "종명": r["bird_name"], "성별": "미구분",
+                "촬영 시각": r["date"], "위도": r["lat"], "경도": r["lon"], "판단 근거": r["reason"],
+            } for r in bulk_rows])
+            edited = st.data_editor(
+                review_df, key="bulk_review", hide_index=True, use_container_width=True,
+                disabled=["파일", "판단 근거"],
+                column_config={"성별": st.column_config.SelectboxColumn(options=["미구분", "수컷", "암컷"])},
+            )
+            accepted = edited[edited["등록"]]
+            st.caption(f"사진 {len(edited)}장 중 {len(accepted)}장 선택됨 (이미 등록된 종과 같은 종 중복은 자동으로 건너뜁니다)")
+            if st.button(f"📥 선택한 {len(accepted)}건 한 번에 등록", key="bulk_commit", type="primary", use_container_width=True, disabled=accepted.empty):
+                accepted = accepted.astype(object).where(accepted.notna(), None)
+                entries = [{
+                    "bird_name": str(r["종명"]), "sex": r["성별"], "date": r["촬영 시각"],
+                    "lat": r["위도"], "lon": r["경도"],
+                } for r in accepted.to_dict('records')]
+                added, skipped = save_many(entries, df)
+                if isinstance(added, str): st.error(added)
+                else:
+                    msg = f"✅ {len(added)}종 일괄 등록 성공!"
+                    if skipped: msg += f" (건너뜀 {len(skipped)}건)"
+                    notices.push('success', msg)
+                    st.session_state.bulk_rows = None
+                    st.rerun()
 
 # --- [Tab 2] 나의 도감 (그리드 뷰) ---
-with tab2:
+# ⭐️ 도감 탭만 다시 실행되는 프래그먼트: "자세히 보기"/"닫기"를 눌러도 앱 전체가 다시 돌지 않음
+@st.fragment
+@tracing.traced("fragment:collection")
+def collection_tab(df):
     st.subheader("📜 탐조 도감 (전체 목록)")
 
     # 1. 데이터 준비
-    max_bird_id = max(ID_TO_NAME.keys()) if ID_TO_NAME else 602
-    my_collected_birds = set(df['bird_name'].tolist()) if not df.empty else set()
+    my_collected_birds = set(df['bird_name'].dropna().unique())
 
-    # 2. 선택된 새 상세 정보 뷰 (화면 상단 고정)
+    # 2. 선택된 새 상세 정보 뷰 (화면 상단 고정) — 자리를 먼저 잡아 두고 그리드에서 고른 종을 같은 실행에서 바로 채움
     if 'selected_bird_id' not in st.session_state:
         st.session_state['selected_bird_id'] = None
+    detail_box = st.container()
+
+    # 3. 그리드 (⭐️ 전체 종 목록을 컴포넌트 하나로. 페이지 이동은 브라우저 안에서만)
+    payload = collection_grid.grid_payload(ID_TO_NAME, my_collected_birds, get_family_emoji, SPRITE_ATLAS)
+    picked = collection_grid.bird_grid(payload)
+    if picked: st.session_state['selected_bird_id'] = int(picked)
 
     selected_id = st.session_state['selected_bird_id']
     if selected_id and selected_id in ID_TO_NAME:
         selected_name = ID_TO_NAME[selected_id]
         is_caught = selected_name in my_collected_birds
         
-        with st.container(border=True):
-            det_c1, det_c2 = st.columns([1, 3])
-            with det_c1:
-                if is_caught:
-                    st.markdown(f"<div style='text-align:center; font-size:5rem;'>{get_family_emoji(selected_name)}</div>", unsafe_allow_html=True)
-                else:
-                    st.markdown("<div style='text-align:center; font-size:5rem; color:#ccc;'>❓</div>", unsafe_allow_html=True)
+        with detail_box:
+            with st.container(border=True):
+                det_c1, det_c2 = st.columns([1, 3])
+                with det_c1:
+                    sprite = sprites.sprite_html(SPRITE_ATLAS, selected_id, 140, locked=not is_caught)
+                    if sprite:
+                        st.markdown(sprite, unsafe_allow_html=True)
+                    elif is_caught:
+                        st.markdown(f"<div style='text-align:center; font-size:5rem;'>{get_family_emoji(selected_name)}</div>", unsafe_allow_html=True)
+                    else:
+                        st.markdown("<div style='text-align:center; font-size:5rem; color:#ccc;'>❓</div>", unsafe_allow_html=True)
             
-            with det_c2:
-                # ⭐️ 멸종위기종/천연기념물 태그 HTML 생성
-                rarity_badge = ""
-                if selected_name in RARE_BIRDS:
-                    r_code = RARE_BIRDS[selected_name]
-                    r_label = RARE_LABEL.get(r_code, "")
-                    r_class = f"tag-{r_code}" # CSS 클래스
-                    rarity_badge = f"<span class='rare-tag {r_class}'>{r_label}</span>"
-
-                if is_caught:
-                    my_records = df[df['bird_name'] == selected_name]
-                    first_record = my_records.iloc[0]
+                with det_c2:
+                    # ⭐️ 멸종위기종/천연기념물 태그 HTML 생성
+                    rarity_badge = ""
+                    if selected_name in RARE_BIRDS:
+                        r_code = RARE_BIRDS[selected_name]
+                        r_label = RARE_LABEL.get(r_code, "")
+                        r_class = f"tag-{r_code}" # CSS 클래스
+                        rarity_badge = f"<span class='rare-tag {r_class}'>{r_label}</span>"
+
+                    if is_caught:
+                        my_records = SCHEMA.normalize(store.records_for(selected_name, df))
+                        first_record = my_records.iloc[0]
                     
-                    st.markdown(f"### No.{selected_id} {selected_name} {rarity_badge}", unsafe_allow_html=True)
-                    family = FAMILY_MAP.get(selected_name, '미상')
-                    st.caption(f"{family}")
+                        st.markdown(f"### No.{selected_id} {selected_name} {rarity_badge}", unsafe_allow_html=True)
+                        st.caption(species_caption(selected_id, selected_name))
                     
-                    st.success(f"✅ **발견!** 총 {len(my_records)}회 기록됨")
-                    st.write(f"**최초 발견일:** {first_record['date']}")
-                    if pd.notnull(first_record.get('lat')):
-                        st.write(f"**최초 위치:** ({first_record['lat']:.4f}, {first_record['lon']:.4f})")
-                else:
-                    st.markdown(f"### No.{selected_id} {selected_name} {rarity_badge}", unsafe_allow_html=True)
-                    family = FAMILY_MAP.get(selected_name, '미상')
-                    st.caption(f"{family}")
-                    st.warning("🔒 아직 이 새를 만나지 못했습니다. (미발견)")
+                        st.success(f"✅ **발견!** 총 {len(my_records)}회 기록됨")
+                        st.write(f"**최초 발견일:** {first_record['date'].strftime(DATE_FORMAT) if pd.notnull(first_record['date']) else '-'}")
+                        if pd.notnull(first_record.get('lat')):
+                            place_name = first_record.get('location') if pd.notnull(first_record.get('location')) else GAZETTEER.reverse(first_record['lat'], first_record['lon'])
+                            st.write(f"**최초 위치:** {place_name or ''} ({first_record['lat']:.4f}, {first_record['lon']:.4f})")
+                            # ⭐️ 최초 위치 근처에서 함께 본 새 (공간 인덱스)
+                            neighbours = get_nearby_index(df).species_near(float(first_record['lat']), float(first_record['lon']), NEARBY_KM, top=5, exclude={selected_name})
+                            if neighbours:
+                                st.write(f"**{NEARBY_KM}km 안에서 함께 본 새:** " + ", ".join(f"{name}({count})" for name, count, _ in neighbours))
+                    else:
+                        st.markdown(f"### No.{selected_id} {selected_name} {rarity_badge}", unsafe_allow_html=True)
+                        st.caption(species_caption(selected_id, selected_name))
+                        st.warning("🔒 아직 이 새를 만나지 못했습니다. (미발견)")
             
-            if st.button("닫기 ✖️", key="close_detail"):
-                st.session_state['selected_bird_id'] = None
-                st.rerun()
-        st.divider()
+                if st.button("닫기 ✖️", key="close_detail"):
+                    st.session_state['selected_bird_id'] = None
+                    st.rerun(scope="fragment")
+            st.divider()
 
-    # 3. 페이지네이션 설정
-    items_per_page = 20 # 가로 5칸 x 세로 4칸
-    total_pages = max(1, (max_bird_id - 1) // items_per_page + 1)
-    
-    col_p1, col_p2, col_p3 = st.columns([1, 2, 1])
-    with col_p2:
-        page = st.number_input("페이지 이동", min_value=1, max_value=total_pages, step=1, label_visibility="collapsed")
-    
-    start_idx = (page - 1) * items_per_page + 1
-    end_idx = min(start_idx + items_per_page, max_bird_id + 1)
-
-    # 4. 그리드 뷰 렌더링 (가로 5열)
-    num_columns = 5
-    grid_cols = st.columns(num_columns)
-
-    valid_ids_on_page = [i for i in range(start_idx, end_idx) if i in ID_TO_NAME]
-    
-    for i, current_id in enumerate(valid_ids_on_page):
-        bird_name = ID_TO_NAME[current_id]
-        is_caught = bird_name in my_collected_birds
-        
-        col_idx = i % num_columns
-        
-        with grid_cols[col_idx]:
-            with st.container(border=True):
-                if is_caught:
-                    icon = get_family_emoji(bird_name)
-                    color = "#1b5e20"
-                    bg_color = "#e8f5e9"
-                else:
-                    icon = "❓"
-                    color = "#999999"
-                    bg_color = "#f5f5f5"
-                
-                st.markdown(f"""
-                <div style='text-align:center; padding:10px; background-color:{bg_color}; border-radius:10px;'>
-                    <span style='font-size:2rem;'>{icon}</span><br>
-                    <span style='font-size:0.8rem; color:#666;'>No.{current_id}</span><br>
-                    <strong style='color:{color}; font-size:1rem;'>{bird_name if is_caught else '???'}</strong>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                # ⭐️ 버튼 클릭 시 상태만 업데이트 (자동 스크롤 제거)
-                if st.button("자세히 보기", key=f"btn_{current_id}", use_container_width=True):
-                    st.session_state['selected_bird_id'] = current_id
-                    st.rerun()
-
-    st.caption(f"총 {max_bird_id}종 중 {start_idx} ~ {end_idx-1}번 표시")
+with tab2, tracing.span("tab.collection"):
+    collection_tab(df)
 
 # --- [Tab 3] 업적 도감 ---
-with tab3:
+with tab3, tracing.span("tab.achievements"):
     st.subheader("🏆 업적 도감")
     st.caption("탐조 활동을 통해 얻을 수 있는 모든 업적과 조건입니다.")
     sorted_badges = sorted(ACHIEVEMENT_INFO.keys(), key=lambda x: ACHIEVEMENT_INFO[x]['rank'])
@@ -762,51 +916,57 @@ with tab3:
         </div>
         """, unsafe_allow_html=True)
 
+    # ⭐️ 탐조가 순위: 사용자별 요약 한 줄씩만 읽음 (전체 기록을 훑지 않음)
+    if PER_USER:
+        st.divider()
+        st.subheader("🏅 탐조가 순위")
+        try: board = load_leaderboard()
+        except Exception: board = None
+        if board is None or board.empty: st.caption("아직 순위표가 비어 있습니다.")
+        else:
+            board = board.assign(**{c: pd.to_numeric(board[c], errors='coerce').fillna(0).astype(int) for c in ('species', 'records', 'level', 'xp')})
+            board = board.sort_values(['species', 'xp'], ascending=False).head(10)
+            me = user_key(USER)
+            st.dataframe(pd.DataFrame({
+                '순위': range(1, len(board) + 1),
+                '탐조가': [f"{n} (나)" if u == me else n for u, n in zip(board['user_id'], board['name'])],
+                '종': board['species'], '기록': board['records'], 'Lv.': board['level'],
+            }), hide_index=True, use_container_width=True)
+
 # --- [Tab 4] 🗺️ 탐조 지도 ---
-with tab4:
+with tab4, tracing.span("tab.map"):
     st.subheader("🗺️ 나만의 탐조 지도")
     
-    if not df.empty and 'lat' in df.columns and 'lon' in df.columns:
-        map_df = df.dropna(subset=['lat', 'lon'])
+    if not tab4.open:
+        st.caption("탭을 열면 지도를 불러옵니다.")
+    elif not df.empty and 'lat' in df.columns and 'lon' in df.columns:
+        payload, center, located_count = get_map_payload(df.attrs.get('data_version'), df)
         
-        if not map_df.empty:
-            center_lat = map_df['lat'].mean()
-            center_lon = map_df['lon'].mean()
-            m = folium.Map(location=[center_lat, center_lon], zoom_start=7)
-            
-            # ⭐️ 기능 추가: 내 위치 자동이동(True) + 검색기
-            LocateControl(auto_start=True).add_to(m)
-            Geocoder(add_marker=False).add_to(m)
-
-            marker_cluster = MarkerCluster().add_to(m)
-            
-            for idx, row in map_df.iterrows():
-                bird = row['bird_name']
-                date = row['date']
-                family_icon = get_family_emoji(bird)
-                
-                popup_html = f"""
-                <div style="width:150px; text-align:center;">
-                    <div style="font-size:20px;">{family_icon}</div>
-                    <b>{bird}</b><br>
-                    <span style="font-size:12px; color:#555;">{date}</span>
-                </div>
-                """
-                
-                folium.Marker(
-                    location=[row['lat'], row['lon']],
-                    popup=folium.Popup(popup_html, max_width=200),
-                    tooltip=bird
-                ).add_to(marker_cluster)
+        if located_count:
+            # ⭐️ 마커는 버전별로 캐시된 JSON 배열 하나로 브라우저에서 클러스터링 (행마다 Marker/Popup 생성 X)
+            map_place = place_search("tab4")
+            with tracing.span("map.render", rows=located_count):
+                m = build_map(payload, [map_place['lat'], map_place['lon']] if map_place else center, zoom_start=12 if map_place else 7)
+                map_state = show_map(m, width='100%', height=500, returned_objects=["last_clicked"], key="sighting_map")
+            st.info(f"총 {located_count}개의 위치 기록이 지도에 표시되었습니다.")
             
-            st_folium(m, width='100%', height=500)
-            st.info(f"총 {len(map_df)}개의 위치 기록이 지도에 표시되었습니다.")
+            # ⭐️ 지도를 클릭하면 그 근처에서 본 새를 기록 수 순으로
+            clicked = (map_state or {}).get("last_clicked")
+            if clicked:
+                radius = st.slider("검색 반경 (km)", 1, 50, NEARBY_KM, key="nearby_radius")
+                nearby = get_nearby_index(df).species_near(clicked['lat'], clicked['lng'], radius)
+                st.markdown(f"#### 📍 ({clicked['lat']:.4f}, {clicked['lng']:.4f}) 주변 {radius}km")
+                if nearby:
+                    st.dataframe(pd.DataFrame(nearby, columns=["새 이름", "기록 수", "가장 가까운 거리(km)"]).round({"가장 가까운 거리(km)": 2}), hide_index=True, use_container_width=True)
+                else:
+                    st.caption("이 근처에는 아직 기록이 없습니다.")
             
         else:
             st.warning("📍 위치 정보가 포함된 기록이 없습니다. 사진을 등록할 때 위치를 추가해보세요!")
-            m_default = folium.Map(location=[36.5, 127.5], zoom_start=6)
             # 데이터 없어도 내 위치 기능은 활성화
-            LocateControl(auto_start=True).add_to(m_default)
-            st_folium(m_default, width='100%', height=400)
+            m_default = build_map(zoom_start=6)
+            show_map(m_default, width='100%', height=400, returned_objects=[])
     else:
         st.info("아직 데이터가 없습니다.")
+
+tracing.end()
@@ -0,0 +1,107 @@
+import io
+import os
+import zipfile
+from PIL import Image
+
+from identify import content_key, identify_many, parse_answer
+from imaging import as_blob, get_capture_time, get_gps_from_image, prepare_image
+
+# --- [탐조 사진 일괄 가져오기] ---
+# zip 파일이나 폴더 안의 사진 수백 장을 한 장씩 읽어서(원본을 모두 메모리에 올리지 않음)
+# EXIF 위치/촬영 시각을 뽑고, 전처리한 사진을 batch_size장씩 묶어 동시 판별합니다.
+# 결과는 검토 표에 쓸 행(dict) 목록으로 돌려주고, 저장은 호출하는 쪽에서 한 번에 합니다.
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+def _is_photo(name):
+    base = os.path.basename(name)
+    return name.lower().endswith(IMAGE_EXTENSIONS) and not base.startswith(".") and "__MACOSX" not in name
+
+
+def resolve_folder(root, relative):
+    # 설정된 사진 루트 아래의 폴더만 허용 (.. / 절대 경로 / 심볼릭 링크로 밖을 가리키면 None)
+    root = os.path.realpath(root)
+    path = os.path.realpath(os.path.join(root, relative))
+    if os.path.commonpath([root, path]) != root or not os.path.isdir(path): return None
+    return path
+
+
+def _inside(path, root):
+    return os.path.commonpath([os.path.realpath(root), os.path.realpath(path)]) == os.path.realpath(root)
+
+
+def iter_photos(source):
+    # source: 폴더 경로, zip 파일 경로, 또는 zip 파일 객체 -> (이름, 바이트)를 한 장씩
+    # 폴더 안의 링크가 폴더 밖 파일을 가리키면 건너뜀
+    if isinstance(source, (str, os.PathLike)) and os.path.isdir(source):
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if not _is_photo(name) or not _inside(os.path.join(root, name), source): continue
+                with open(os.path.join(root, name), "rb") as f:
+                    yield os.path.relpath(os.path.join(root, name), source), f.read()
+        return
+    with zipfile.ZipFile(source) as zf:
+        for info in zf.infolist():
+            if info.is_dir() or not _is_photo(info.filename): continue
+            with zf.open(info) as f:
+                yield info.filename, f.read()
+
+
+def count_photos(source):
+    if isinstance(source, (str, os.PathLike)) and os.path.isdir(source):
+        return sum(1 for root, _, files in os.walk(source) for name in files
+                   if _is_photo(name) and _inside(os.path.join(root, name), source))
+    with zipfile.ZipFile(source) as zf:
+        count = sum(1 for info in zf.infolist() if not info.is_dir() and _is_photo(info.filename))
+    if hasattr(source, "seek"): source.seek(0)
+    return count
+
+
+def _read_photo(name, data):
+    # 원본은 여기서만 열고 닫음. 이후에는 ~수백 KB짜리 전처리 결과만 들고 다님
+    with Image.open(io.BytesIO(data)) as img:
+        lat, lon = get_gps_from_image(img)
+        taken = get_capture_time(img)
+    return {"file": name, "key": content_key(data), "lat": lat, "lon": lon, "date": taken}
+
+
+def scan(source, client, cache=None, batch_size=8, max_workers=4, per_second=2.0, on_progress=None):
+    rows, batch = [], []
+
+    def flush():
+        jobs = [(i, as_blob(blob), None) for i, blob in batch]
+        for i, text in identify_many(client, jobs, max_workers=max_workers, per_second=per_second):
+            if cache is not None: cache.put(rows[i]["key"], text)
+            _fill(rows[i], text)
+            if on_progress: on_progress(rows[i])
+        batch.clear()
+
+    for name, data in iter_photos(source):
+        try:
+            row = _read_photo(name, data)
+            cached = cache.get(row["key"]) if cache is not None else None
+            # 잘린 JPEG 같은 사진은 헤더는 열려도 전처리(전체 디코딩)에서야 실패하므로 같은 try 안에서
+            prepared = prepare_image(data) if cached is None else None
+        except Exception:
+            row = {"file": name, "key": None, "lat": None, "lon": None, "date": None}
+            _fill(row, "판독 불가 | 사진을 열 수 없습니다.")
+            rows.append(row)
+            if on_progress: on_progress(row)
+            continue
+        finally:
+            del data
+        rows.append(row)
+        if cached is not None:
+            _fill(row, cached)
+            if on_progress: on_progress(row)
+        else:
+            batch.append((len(rows) - 1, prepared))
+        if len(batch) >= batch_size: flush()
+    if batch: flush()
+    return rows
+
+
+def _fill(row, text):
+    bird_name, reason, is_valid = parse_answer(text)
+    row.update({"bird_name": bird_name, "reason": reason, "valid": is_valid})
@@ -0,0 +1,154 @@
+import hashlib
+import os
+import pickle
+import pandas as pd
+
+# --- [종 목록(도감) 카탈로그] ---
+# data.csv(국가생물종목록)를 한 번 파싱해서 pickle 파일로 미리 구워둡니다.
+# 앱은 이 파일을 바로 읽고, data.csv가 바뀌어 파일이 낡았을 때만 CSV를 다시 파싱합니다.
+# 빌드: python catalog.py
+
+CSV_FILE = "data.csv"
+ARTIFACT_FILE = os.path.join("assets", "catalog.pkl")
+FORMAT_VERSION = 1
+
+# data.csv 컬럼 위치 -> 카탈로그 필드 이름
+TAXONOMY_COLUMNS = {
+    3: 'sci_name', 7: 'phylum', 8: 'phylum_ko', 9: 'class', 10: 'class_ko',
+    11: 'order', 12: 'order_ko', 13: 'family_sci', 15: 'genus', 16: 'genus_ko',
+    19: 'species', 20: 'species_ko', 22: 'url',
+}
+EMPTY_MAPS = ({}, {}, 0, {}, {}, {})
+
+
+def _fingerprint(csv_path):
+    st_ = os.stat(csv_path)
+    with open(csv_path, 'rb') as f:
+        digest = hashlib.sha1(f.read()).hexdigest()
+    return {'size': st_.st_size, 'mtime_ns': st_.st_mtime_ns, 'sha1': digest}
+
+
+def parse_csv(csv_path=CSV_FILE):
+    encodings = ['utf-8-sig', 'cp949', 'euc-kr']
+    for enc in encodings:
+        try:
+            df = pd.read_csv(csv_path, skiprows=2, header=None, encoding=enc, dtype=str)
+            if df.shape[1] < 15: continue
+
+            # ⭐️ 0번 컬럼(No), 4번(국명), 14번(과) + 분류 체계/URL
+            bird_data = df.iloc[:, [0, 4, 14]].copy()
+            bird_data.columns = ['id', 'name', 'family']
+            for col, field in TAXONOMY_COLUMNS.items():
+                if col < df.shape[1]: bird_data[field] = df.iloc[:, col]
+            bird_data = bird_data.dropna(subset=['id', 'name', 'family'])
+
+            bird_data['id'] = pd.to_numeric(bird_data['id'], errors='coerce')
+            bird_data = bird_data.dropna(subset=['id'])
+            bird_data['id'] = bird_data['id'].astype(int)
+
+            bird_data['name'] = bird_data['name'].astype(str).str.strip()
+            bird_data['family'] = bird_data['family'].astype(str).str.strip()
+            filter_keywords = ['대표국명', '국명', 'Name', 'Family', '과']
+            bird_data = bird_data[~bird_data['family'].isin(filter_keywords)]
+            return bird_data
+        except Exception: continue
+    return None
+
+
+def build_catalog(csv_path=CSV_FILE):
+    bird_data = parse_csv(csv_path)
+    if bird_data is None: return None
+
+    ids = bird_data['id'].tolist()
+    names = bird_data['name'].tolist()
+    families = bird_data['family'].tolist()
+
+    family_groups = {}
+    for fam, nm in zip(families, names):
+        family_groups.setdefault(fam, []).append(nm)
+
+    # 분류 체계는 필드별 리스트(ids와 같은 순서)로 저장. 반복되는 문자열(목/과 이름 등)은
+    # 같은 객체로 합쳐서 pickle이 한 번만 기록하도록 합니다.
+    pool = {}
+    taxonomy = {}
+    for field in TAXONOMY_COLUMNS.values():
+        if field not in bird_data.columns: continue
+        values = [v.strip() if isinstance(v, str) else None for v in bird_data[field].tolist()]
+        taxonomy[field] = [pool.setdefault(v, v) if v is not None else None for v in values]
+
+    id_to_name = dict(zip(ids, names))
+    return {
+        'format': FORMAT_VERSION,
+        'source': _fingerprint(csv_path),
+        'name_to_no': dict(zip(names, ids)),
+        'name_to_family': dict(zip(names, families)),
+        'total_species_count': len(id_to_name),
+        'family_total_counts': bird_data['family'].value_counts().to_dict(),
+        'family_groups': family_groups,
+        'id_to_name': id_to_name,
+        'ids': ids,
+        'families': families,
+        'taxonomy': taxonomy,
+    }
+
+
+def write_artifact(catalog, artifact_path=ARTIFACT_FILE):
+    os.makedirs(os.path.dirname(artifact_path) or ".", exist_ok=True)
+    tmp = artifact_path + ".tmp"
+    with open(tmp, 'wb') as f:
+        pickle.dump(catalog, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, artifact_path)
+
+
+def _is_fresh(catalog, csv_path):
+    if not isinstance(catalog, dict) or catalog.get('format') != FORMAT_VERSION: return False
+    src = catalog.get('source', {})
+    st_ = os.stat(csv_path)
+    if src.get('size') != st_.st_size: return False
+    if src.get('mtime_ns') == st_.st_mtime_ns: return True
+    # git checkout 등으로 수정 시각만 바뀐 경우는 내용 해시로 다시 확인
+    return src.get('sha1') == _fingerprint(csv_path)['sha1']
+
+
+def load_catalog(csv_path=CSV_FILE, artifact_path=ARTIFACT_FILE):
+    if not os.path.exists(csv_path): return None
+    if os.path.exists(artifact_path):
+        try:
+            with open(artifact_path, 'rb') as f:
+                catalog = pickle.load(f)
+            if _is_fresh(catalog, csv_path): return catalog
+        except Exception:
+            pass
+    # 파일이 없거나 낡았으면 CSV로 되돌아가고, 가능하면 다시 구워둡니다
+    catalog = build_catalog(csv_path)
+    if catalog is not None:
+        try: write_artifact(catalog, artifact_path)
+        except OSError: pass
+    return catalog
+
+
+def species_info(catalog):
+    # 종 번호 -> {이름, 과, 학명, 목, ..., url}
+    fields = catalog['taxonomy']
+    info = {}
+    for i, (sid, fam) in enumerate(zip(catalog['ids'], catalog['families'])):
+        rec = {'id': sid, 'name': catalog['id_to_name'][sid], 'family': fam}
+        for field, values in fields.items(): rec[field] = values[i]
+        info[sid] = rec
+    return info
+
+
+def load_bird_map(csv_path=CSV_FILE, artifact_path=ARTIFACT_FILE):
+    catalog = load_catalog(csv_path, artifact_path)
+    if catalog is None: return EMPTY_MAPS
+    return (catalog['name_to_no'], catalog['name_to_family'], catalog['total_species_count'],
+            catalog['family_total_counts'], catalog['family_groups'], catalog['id_to_name'])
+
+
+if __name__ == "__main__":
+    catalog = build_catalog()
+    if catalog is None:
+        print(f"🚨 {CSV_FILE}을(를) 읽지 못했습니다.")
+    else:
+        write_artifact(catalog)
+        print(f"✅ {catalog['total_species_count']}종 카탈로그를 {ARTIFACT_FILE}에 저장했습니다. ({os.path.getsize(ARTIFACT_FILE):,} bytes)")
@@ -0,0 +1,119 @@
+import streamlit as st
+
+import sprites
+
+# --- [도감 그리드 컴포넌트] ---
+# 한 페이지에 컨테이너/마크다운/버튼 60개를 만드는 대신, 전체 종 목록을 데이터 한 번으로 넘기고
+# 브라우저에서 카드/페이지 이동을 그립니다. 페이지 이동은 rerun 없이 브라우저 안에서 끝나고,
+# "자세히 보기"를 눌렀을 때만 고른 종 번호(selected)를 돌려받습니다.
+
+PAGE_SIZE = 20   # 가로 5칸 x 세로 4칸
+COLUMNS = 5
+ICON_BOX = 64
+
+GRID_CSS = """
+.bird-grid { display: grid; gap: 12px; }
+.bird-card { border: 1px solid rgba(49, 51, 63, 0.2); border-radius: 10px; padding: 8px; display: flex; flex-direction: column; gap: 8px; }
+.bird-face { text-align: center; padding: 10px; border-radius: 10px; }
+.bird-face.caught { background-color: #e8f5e9; }
+.bird-face.locked { background-color: #f5f5f5; }
+.bird-icon { margin: 0 auto; display: flex; align-items: center; justify-content: center; font-size: 2rem; }
+.bird-sprite { background-repeat: no-repeat; image-rendering: pixelated; }
+.bird-no { font-size: 0.8rem; color: #666; }
+.bird-name { font-size: 1rem; font-weight: 700; }
+.bird-face.caught .bird-name { color: #1b5e20; }
+.bird-face.locked .bird-name { color: #999999; }
+.bird-card button, .bird-pager button {
+    width: 100%; padding: 6px 10px; border-radius: 8px; cursor: pointer; font: inherit;
+    border: 1px solid rgba(49, 51, 63, 0.2); background: var(--st-background-color, #fff); color: inherit;
+}
+.bird-card button:hover, .bird-pager button:hover { border-color: #ff4b4b; color: #ff4b4b; }
+.bird-pager { display: grid; grid-template-columns: 1fr 2fr 1fr; gap: 12px; align-items: center; margin-bottom: 12px; }
+.bird-pager select { width: 100%; padding: 6px; border-radius: 8px; font: inherit; }
+.bird-caption { font-size: 0.85rem; color: #888; margin-top: 12px; }
+"""
+
+GRID_JS = """
+const pages = {};
+
+const esc = (s) => String(s).replace(/[&<>"']/g, (c) => ({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}[c]));
+
+export default function(component) {
+    const { data, parentElement, setTriggerValue, key } = component;
+    if (!data) return;
+    const { birds, max_id, page_size, columns, box, atlas } = data;
+    const byId = new Map(birds.map((b) => [b[0], b]));
+    const totalPages = Math.max(1, Math.floor((max_id - 1) / page_size) + 1);
+
+    let root = parentElement.querySelector(".bird-root");
+    if (!root) {
+        root = document.createElement("div");
+        root.className = "bird-root";
+        parentElement.appendChild(root);
+    }
+
+    const icon = (bird) => {
+        const [id, name, emoji, rect] = bird;
+        if (rect && atlas) {
+            const [x, y, w, h] = rect;
+            const scale = Math.min(box / w, box / h);
+            const url = name === null ? atlas.locked_url : atlas.url;
+            return `<div class="bird-icon" style="width:${box}px; height:${box}px;"><div class="bird-sprite" style="width:${(w * scale).toFixed(1)}px; height:${(h * scale).toFixed(1)}px; `
+                + `background-image:url(${url}); background-position:-${(x * scale).toFixed(1)}px -${(y * scale).toFixed(1)}px; `
+                + `background-size:${(atlas.size[0] * scale).toFixed(1)}px ${(atlas.size[1] * scale).toFixed(1)}px;"></div></div>`;
+        }
+        return `<div class="bird-icon">${name === null ? "❓" : emoji}</div>`;
+    };
+
+    const draw = (page) => {
+        page = Math.min(Math.max(1, page), totalPages);
+        pages[key] = page;
+        const start = (page - 1) * page_size + 1;
+        const end = Math.min(start + page_size, max_id + 1);
+        const cards = [];
+        for (let id = start; id < end; id++) {
+            const bird = byId.get(id);
+            if (!bird) continue;
+            const caught = bird[1] !== null;
+            cards.push(`<div class="bird-card"><div class="bird-face ${caught ? "caught" : "locked"}">${icon(bird)}`
+                + `<span class="bird-no">No.${id}</span><br><span class="bird-name">${caught ? esc(bird[1]) : "???"}</span></div>`
+                + `<button data-id="${id}">자세히 보기</button></div>`);
+        }
+        const options = Array.from({ length: totalPages }, (_, i) => `<option value="${i + 1}"${i + 1 === page ? " selected" : ""}>${i + 1} / ${totalPages}</option>`);
+        root.innerHTML = `<div class="bird-pager"><button data-step="-1">◀ 이전</button><select>${options.join("")}</select><button data-step="1">다음 ▶</button></div>`
+            + `<div class="bird-grid" style="grid-template-columns: repeat(${columns}, minmax(0, 1fr));">${cards.join("")}</div>`
+            + `<div class="bird-caption">총 ${max_id}종 중 ${start} ~ ${end - 1}번 표시</div>`;
+    };
+
+    root.onclick = (e) => {
+        const button = e.target.closest("button");
+        if (!button) return;
+        if (button.dataset.step) draw((pages[key] || 1) + Number(button.dataset.step));
+        else if (button.dataset.id) setTriggerValue("selected", Number(button.dataset.id));
+    };
+    root.onchange = (e) => {
+        if (e.target.tagName === "SELECT") draw(Number(e.target.value));
+    };
+    draw(pages[key] || 1);
+}
+"""
+
+_grid = st.components.v2.component("bird_grid", css=GRID_CSS, js=GRID_JS)
+
+
+def grid_payload(id_to_name, collected, icon_for, atlas=None):
+    # 미발견 종은 이름을 보내지 않음: [[번호, 국명 또는 None, 아이콘, 스프라이트 위치 또는 None], ...]
+    rects = atlas["sprites"] if atlas else {}
+    birds = [[bid, name if name in collected else None, icon_for(name) if name in collected else None, rects.get(bid)]
+             for bid, name in sorted(id_to_name.items())]
+    payload = {"birds": birds, "max_id": max(id_to_name) if id_to_name else 0,
+               "page_size": PAGE_SIZE, "columns": COLUMNS, "box": ICON_BOX, "atlas": None}
+    if atlas:
+        payload["atlas"] = {"url": sprites.atlas_url(atlas), "locked_url": sprites.atlas_url(atlas, locked=True), "size": atlas["size"]}
+    return payload
+
+
+def bird_grid(payload, key="bird_grid"):
+    # 이번 실행에서 "자세히 보기"를 누른 종 번호 (없으면 None)
+    result = _grid(data=payload, key=key, on_selected_change=lambda: None)
+    return result.selected
@@ -0,0 +1,115 @@
+import bisect
+import csv
+import math
+import os
+import numpy as np
+
+from geo_index import haversine_km, KM_PER_DEG_LAT
+
+# --- [오프라인 지명 사전] ---
+# assets/places.csv(시도 / 시군구 / 탐조지, 대표 좌표)를 읽어서
+#  - 정방향 검색: 정규화한 이름을 정렬해 둔 접두어 인덱스 (bisect)
+#  - 역지오코딩: 종류별 격자 칸에 좌표를 나눠 두고, 가까운 칸부터 넓혀 가며 최근접 지점 탐색
+# 외부 지오코딩 서비스 없이 장소 검색과 기록의 location 채우기를 합니다.
+# places.csv는 각 지역의 대표 좌표(청사/중심부)만 담으므로 경계 근처에서는 이웃 시군구가 나올 수 있습니다.
+
+PLACES_FILE = os.path.join("assets", "places.csv")
+GRID_DEG = 0.25
+SPOT_KM = 5.0        # 탐조지는 이 반경 안일 때만 이름으로 씀
+ADMIN_KM = 40.0      # 이보다 멀면(바다 한가운데 등) 시군구 이름을 붙이지 않음
+KIND_ORDER = {"탐조지": 0, "시군구": 1, "시도": 2}
+SUFFIXES = ("특별자치시", "특별자치도", "특별시", "광역시", "시", "군", "구", "도")
+
+
+def normalize(text):
+    return "".join(str(text).split()).lower()
+
+
+def _short(name):
+    # "창원시" -> "창원", "전북특별자치도" -> "전북" (접미어를 뗀 별칭도 접두어 검색에 걸리도록)
+    for suffix in SUFFIXES:
+        if name.endswith(suffix) and len(name) > len(suffix) + 1: return name[:-len(suffix)]
+    return None
+
+
+def load_places(path=PLACES_FILE):
+    with open(path, encoding="utf-8", newline="") as f:
+        return [{"name": r["name"], "region": r["region"], "kind": r["kind"], "lat": float(r["lat"]), "lon": float(r["lon"])}
+                for r in csv.DictReader(f)]
+
+
+class Gazetteer:
+    def __init__(self, places):
+        self.places = places
+        self.lat = np.array([p["lat"] for p in places])
+        self.lon = np.array([p["lon"] for p in places])
+
+        # 접두어 인덱스: (정규화 키, 장소 번호) 정렬 목록. 이름, 접미어 뗀 이름, "지역 + 이름"을 모두 키로
+        keys = set()
+        for i, p in enumerate(places):
+            for key in (p["name"], _short(p["name"]), f"{p['region']}{p['name']}"):
+                if key: keys.add((normalize(key), i))
+        self._keys = sorted(keys)
+        self._key_strs = [k for k, _ in self._keys]
+
+        # 최근접 탐색용 격자: 종류별 {(위도 칸, 경도 칸): [장소 번호]}
+        self._grids = {}
+        for i, p in enumerate(places):
+            cell = (math.floor(p["lat"] / GRID_DEG), math.floor(p["lon"] / GRID_DEG))
+            self._grids.setdefault(p["kind"], {}).setdefault(cell, []).append(i)
+
+    def __len__(self):
+        return len(self.places)
+
+    def label(self, place):
+        if place["kind"] == "탐조지": return f"{place['name']} ({place['region']})"
+        return f"{place['region']} {place['name']}".strip()
+
+    def search(self, query, limit=10):
+        # 접두어가 일치하는 장소: 이름이 정확히 같은 것 -> 탐조지 -> 시군구 -> 시도 순
+        q = normalize(query)
+        if not q: return []
+        hits = {}
+        pos = bisect.bisect_left(self._key_strs, q)
+        while pos < len(self._keys) and self._key_strs[pos].startswith(q):
+            key, i = self._keys[pos]
+            hits[i] = min(hits.get(i, 1), 0 if key == q else 1)
+            pos += 1
+        ranked = sorted(hits, key=lambda i: (hits[i], KIND_ORDER.get(self.places[i]["kind"], 9), len(self.places[i]["name"]), i))
+        return [self.places[i] for i in ranked[:limit]]
+
+    def nearest(self, lat, lon, kind="시군구", max_km=ADMIN_KM):
+        # (장소, 거리 km) 또는 (None, None). 가운데 칸부터 고리 모양으로 넓혀 가며,
+        # 남은 고리가 지금까지 찾은 최단 거리보다 멀어지면 멈춤
+        grid = self._grids.get(kind)
+        if not grid: return None, None
+        ci, cj = math.floor(lat / GRID_DEG), math.floor(lon / GRID_DEG)
+        cell_km = GRID_DEG * KM_PER_DEG_LAT * max(math.cos(math.radians(abs(lat) + GRID_DEG)), 0.01)
+        max_ring = int(max_km / cell_km) + 1
+        best, best_km = None, math.inf
+        for ring in range(max_ring + 1):
+            if (ring - 1) * cell_km > min(best_km, max_km): break
+            idx = [i for di in range(-ring, ring + 1) for dj in range(-ring, ring + 1)
+                   if max(abs(di), abs(dj)) == ring for i in grid.get((ci + di, cj + dj), ())]
+            if not idx: continue
+            dist = haversine_km(lat, lon, self.lat[idx], self.lon[idx])
+            k = int(np.argmin(dist))
+            if dist[k] < best_km: best, best_km = idx[k], float(dist[k])
+        if best is None or best_km > max_km: return None, None
+        return self.places[best], best_km
+
+    def reverse(self, lat, lon):
+        # 좌표 -> 기록용 지명. 근처 탐조지가 있으면 "주남저수지 (경상남도 창원시)", 없으면 "경상남도 창원시"
+        if lat is None or lon is None: return None
+        try: lat, lon = float(lat), float(lon)
+        except (TypeError, ValueError): return None
+        if math.isnan(lat) or math.isnan(lon): return None
+        spot, _ = self.nearest(lat, lon, "탐조지", SPOT_KM)
+        if spot: return self.label(spot)
+        admin, _ = self.nearest(lat, lon, "시군구", ADMIN_KM)
+        return self.label(admin) if admin else None
+
+
+def load_gazetteer(path=PLACES_FILE):
+    try: return Gazetteer(load_places(path))
+    except (OSError, ValueError, KeyError): return Gazetteer([])
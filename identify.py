@@ -0,0 +1,211 @@
+import hashlib
+import os
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import tracing
+
+# --- [AI 새 판별] ---
+# 설정이 끝난 모델 클라이언트 하나를 공유하고, 여러 장의 사진을 동시에(최대 max_workers개) 보냅니다.
+# 초당 요청 수 제한과 지수 백오프 재시도를 거치며, 결과는 끝나는 순서대로 돌려줍니다.
+# google.generativeai는 import만 1초 가까이 걸려서 GeminiClient를 처음 만들 때 불러옵니다 (stub/캐시 적중은 불러오지 않음).
+
+MODEL_NAME = 'gemini-2.5-flash'
+SYSTEM_INSTRUCTION = "당신은 조류 전문가입니다. 사진을 분석하여 '종명 | 판단근거' 형식으로 답하세요. 구체적인 종을 모르면 '새 아님'이라고 하세요."
+ERROR_RESULT = "Error | 분석 오류"
+
+
+def content_key(data, user_doubt=None):
+    # 사진 바이트 + 사용자 의견 + 모델/프롬프트로 만든 키. 파일 이름이 같아도 내용이 다르면 다른 키
+    h = hashlib.sha256()
+    h.update(f"{MODEL_NAME}\0{SYSTEM_INSTRUCTION}\0{user_doubt or ''}\0".encode())
+    h.update(data)
+    return h.hexdigest()
+
+
+def build_prompt(user_doubt=None):
+    prompt = f"{SYSTEM_INSTRUCTION}"
+    if user_doubt: prompt += f"\n사용자 반론: '{user_doubt}'. 재분석하세요."
+    return prompt
+
+
+def parse_answer(raw):
+    # '종명 | 판단근거' 응답 -> (종명, 판단근거, 새로 인정되는지)
+    if "|" in raw:
+        parts = raw.split("|", 1)
+        bird_name = parts[0].strip()
+        reason = parts[1].strip()
+    else:
+        bird_name = raw.strip()
+        reason = "상세 이유를 가져오지 못했습니다."
+
+    invalid_keywords = ["새이름", "종명", "이름", "새 이름", "모름", "알수없음"]
+    if bird_name in invalid_keywords: bird_name = "판독 불가"
+    is_valid_bird = True
+    if bird_name in ["새 아님", "Error", "판독 불가"] or "오류" in bird_name: is_valid_bird = False
+    return bird_name, reason, is_valid_bird
+
+
+class GeminiClient:
+    def __init__(self, api_key, model_name=MODEL_NAME):
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+
+    def identify(self, image, user_doubt=None):
+        with tracing.span("gemini.generate", doubt=bool(user_doubt)):
+            response = self.model.generate_content([build_prompt(user_doubt), image])
+        return response.text.strip()
+
+
+class StubClient:
+    # 네트워크 없이 테스트/부하 측정용으로 쓰는 가짜 모델
+    def __init__(self, answers=("참새 | 갈색 머리와 검은 뺨 무늬",), latency=0.0, fail_rate=0.0, seed=None):
+        self.answers = list(answers)
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.calls = 0
+        self._rnd = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def identify(self, image, user_doubt=None):
+        with self._lock:
+            self.calls += 1
+            answer = self.answers[(self.calls - 1) % len(self.answers)]
+            fail = self._rnd.random() < self.fail_rate
+        if self.latency: time.sleep(self.latency)
+        if fail: raise RuntimeError("stub failure")
+        return answer
+
+
+class RateLimiter:
+    # 요청 사이 최소 간격을 지키는 간단한 제한기 (여러 스레드가 공유)
+    def __init__(self, per_second):
+        self.interval = 1.0 / per_second if per_second else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval: return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now: time.sleep(slot - now)
+
+
+def identify_one(client, image, user_doubt=None, retries=3, backoff=1.0, limiter=None):
+    for attempt in range(retries + 1):
+        if limiter: limiter.wait()
+        try:
+            return client.identify(image, user_doubt)
+        except Exception:
+            if attempt == retries: break
+            time.sleep(backoff * (2 ** attempt) * (0.5 + random.random() / 2))
+    return ERROR_RESULT
+
+
+def identify_many(client, jobs, max_workers=4, per_second=2.0, retries=3, backoff=1.0):
+    # jobs: (key, image, user_doubt) 목록 -> 끝나는 순서대로 (key, 결과 텍스트)를 내보냄
+    jobs = list(jobs)
+    if not jobs: return
+    limiter = RateLimiter(per_second)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs)))) as pool:
+        futures = {pool.submit(identify_one, client, image, doubt, retries, backoff, limiter): key
+                   for key, image, doubt in jobs}
+        for fut in as_completed(futures):
+            yield futures[fut], fut.result()
+
+
+# --- [판별 결과 디스크 캐시] ---
+# content_key로 찾는 SQLite 캐시. 같은 서버의 모든 세션/프로세스가 공유하고,
+# 전체 크기가 max_bytes를 넘으면 가장 오래 안 쓴 결과부터 지웁니다(LRU).
+
+
+class ResultCache:
+    # 조회(get)는 읽기만 합니다. hit/miss 수와 최근 사용 시각은 메모리에 모았다가
+    # put / stats 때나 flush_every건·flush_sec초마다 한 트랜잭션으로 씀 (프로세스가 죽으면 그만큼의 통계/LRU 순서만 빠짐)
+    # 전체 크기는 stats 테이블의 'bytes' 값을 추가/삭제 때마다 고쳐서 들고 있음 (매번 SUM(size)를 다시 세지 않음)
+    def __init__(self, path, max_bytes=20_000_000, flush_every=64, flush_sec=30.0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.flush_every = flush_every
+        self.flush_sec = flush_sec
+        self.hits = 0
+        self.misses = 0
+        self._pending = {'hits': 0, 'misses': 0}
+        self._touched = {}
+        self._flushed_at = time.monotonic()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY, text TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL
+                )""")
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_results_last_used ON results(last_used)")
+            self._db.execute("CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            # 크기 합계가 없던 예전 캐시 파일은 한 번만 세어 둠
+            self._db.execute("INSERT OR IGNORE INTO stats (name, value) SELECT 'bytes', COALESCE(SUM(size), 0) FROM results")
+
+    def _add(self, name, delta):
+        self._db.execute("INSERT INTO stats (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = value + ?",
+                         (name, delta, delta))
+
+    def _flush(self):
+        # 호출하는 쪽에서 self._lock + 트랜잭션을 잡은 상태
+        for name, n in self._pending.items():
+            if n: self._add(name, n)
+        if self._touched:
+            self._db.executemany("UPDATE results SET last_used = ? WHERE key = ?", [(t, k) for k, t in self._touched.items()])
+        self._pending = {'hits': 0, 'misses': 0}
+        self._touched = {}
+        self._flushed_at = time.monotonic()
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute("SELECT text FROM results WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                self._pending['misses'] += 1
+            else:
+                self.hits += 1
+                self._pending['hits'] += 1
+                self._touched[key] = time.time()
+            if len(self._touched) >= self.flush_every or time.monotonic() - self._flushed_at >= self.flush_sec:
+                with self._db: self._flush()
+            return None if row is None else row[0]
+
+    def put(self, key, text):
+        if not text or text == ERROR_RESULT: return  # 실패한 결과는 저장하지 않음
+        size = len(key) + len(text.encode())
+        with self._lock, self._db:
+            self._flush()
+            old = self._db.execute("SELECT size FROM results WHERE key = ?", (key,)).fetchone()
+            self._db.execute("INSERT OR REPLACE INTO results (key, text, size, last_used) VALUES (?, ?, ?, ?)",
+                             (key, text, size, time.time()))
+            self._add('bytes', size - (old[0] if old else 0))
+            total = self._db.execute("SELECT value FROM stats WHERE name = 'bytes'").fetchone()[0]
+            if total > self.max_bytes: self._evict(total)
+
+    def _evict(self, total):
+        freed = 0
+        for key, size in self._db.execute("SELECT key, size FROM results ORDER BY last_used").fetchall():
+            if total - freed <= self.max_bytes: break
+            self._db.execute("DELETE FROM results WHERE key = ?", (key,))
+            freed += size
+        self._add('bytes', -freed)
+
+    def stats(self):
+        # 이 프로세스의 hit/miss와, 캐시 파일을 공유하는 모든 프로세스의 누적값
+        with self._lock:
+            with self._db: self._flush()
+            shared = dict(self._db.execute("SELECT name, value FROM stats").fetchall())
+            entries = self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+        return {'hits': self.hits, 'misses': self.misses, 'total_hits': shared.get('hits', 0),
+                'total_misses': shared.get('misses', 0), 'entries': entries, 'bytes': shared.get('bytes', 0)}
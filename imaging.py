@@ -0,0 +1,82 @@
+import io
+from datetime import datetime
+from PIL import Image, ImageOps, ExifTags
+
+# --- [AI 분석 전 사진 전처리] ---
+# 카메라 원본(10~25MB)을 그대로 올리지 않고, EXIF 회전을 적용한 뒤
+# 긴 변 max_side 이하로 줄이고 target_bytes 안에 들어오도록 JPEG으로 다시 인코딩합니다.
+# 새 종 판별에 필요한 크롭 여유를 위해 긴 변은 min_side 밑으로는 줄이지 않습니다.
+
+MAX_SIDE = 1600
+MIN_SIDE = 768
+TARGET_BYTES = 800_000
+QUALITIES = (88, 80, 72, 64)
+
+
+def _encode(img, quality):
+    buf = io.BytesIO()
+    img.save(buf, format="JPEG", quality=quality, optimize=True)
+    return buf.getvalue()
+
+
+def prepare_image(data, max_side=MAX_SIDE, target_bytes=TARGET_BYTES, min_side=MIN_SIDE):
+    with Image.open(io.BytesIO(data)) as src:
+        src.draft("RGB", (max_side, max_side))  # JPEG은 디코딩 단계에서 미리 축소
+        img = ImageOps.exif_transpose(src).convert("RGB")
+    img.thumbnail((max_side, max_side), Image.LANCZOS)
+
+    while True:
+        for quality in QUALITIES:
+            out = _encode(img, quality)
+            if len(out) <= target_bytes: return out
+        side = max(img.size)
+        if side <= min_side: return out
+        scale = max(min_side, int(side * 0.8)) / side
+        img = img.resize((max(1, int(img.width * scale)), max(1, int(img.height * scale))), Image.LANCZOS)
+
+
+def as_blob(jpeg_bytes):
+    # generate_content에 바로 넘길 수 있는 형태 (SDK가 다시 인코딩하지 않음)
+    return {"mime_type": "image/jpeg", "data": jpeg_bytes}
+
+
+# --- [EXIF 위치/촬영 시각] ---
+
+def get_gps_from_image(image):
+    try:
+        exif_data = image._getexif()
+        if not exif_data: return None, None
+        
+        gps_info = {}
+        for tag, value in exif_data.items():
+            decoded = ExifTags.TAGS.get(tag, tag)
+            if decoded == "GPSInfo":
+                gps_info = value
+                break
+        
+        if not gps_info: return None, None
+
+        def convert_to_degrees(value):
+            d, m, s = value
+            return d + (m / 60.0) + (s / 3600.0)
+
+        lat = convert_to_degrees(gps_info[2])
+        lon = convert_to_degrees(gps_info[4])
+        
+        if gps_info[1] == 'S': lat = -lat
+        if gps_info[3] == 'W': lon = -lon
+        
+        return lat, lon
+    except:
+        return None, None
+
+
+def get_capture_time(image):
+    # EXIF 촬영 시각(DateTimeOriginal, 없으면 DateTime)을 기록 형식("%Y-%m-%d %H:%M")으로
+    try:
+        exif = image.getexif()
+        raw = exif.get_ifd(ExifTags.IFD.Exif).get(36867) or exif.get(306)
+        if not raw: return None
+        return datetime.strptime(str(raw).strip()[:19], "%Y:%m:%d %H:%M:%S").strftime("%Y-%m-%d %H:%M")
+    except Exception:
+        return None
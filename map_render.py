@@ -0,0 +1,85 @@
+import folium
+from folium.plugins import FastMarkerCluster, LocateControl
+from branca.element import Element
+from folium.template import Template
+
+from sighting_map import DEFAULT_CENTER
+
+# --- [탐조 지도 그리기] ---
+# sighting_map.marker_payload로 만든 JSON 배열을 folium 지도에 그대로 넣습니다 (마커/클러스터는 브라우저에서).
+# folium과 플러그인은 import 비용이 커서, 앱은 지도를 실제로 그리는 코드에서만 이 모듈을 불러옵니다.
+
+# 팝업 HTML은 마커를 눌렀을 때만 만듦 (10만 개를 미리 만들지 않음)
+MARKER_CALLBACK = """function(row) {
+    var esc = function(s) {
+        return String(s).replace(/[&<>"']/g, function(c) {
+            return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}[c];
+        });
+    };
+    var marker = L.marker(new L.LatLng(row[0], row[1]));
+    marker.bindTooltip(esc(row[2]));
+    marker.bindPopup(function() {
+        return "<div style='width:150px; text-align:center;'>"
+            + "<div style='font-size:20px;'>" + row[4] + "</div>"
+            + "<b>" + esc(row[2]) + "</b><br>"
+            + "<span style='font-size:12px; color:#555;'>" + esc(row[3]) + "</span></div>";
+    });
+    return marker;
+}"""
+
+
+class _RawScript(Element):
+    # Element는 넘겨받은 문자열을 Jinja 템플릿으로 컴파일하므로, 수 MB짜리 배열은 render에서 문자열 그대로 돌려줌
+    def __init__(self, text):
+        super().__init__()
+        self.text = text
+
+    def render(self, **kwargs):
+        return self.text
+
+
+class PayloadMarkerCluster(FastMarkerCluster):
+    # FastMarkerCluster와 같지만 data를 매번 tojson 하지 않고 미리 직렬화한 문자열을 그대로 넣음
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function(){
+                {{ this.callback }}
+
+                var data = {{ this.payload }};
+                var cluster = L.markerClusterGroup({{ this.options|tojavascript }});
+                var markers = new Array(data.length);
+                for (var i = 0; i < data.length; i++) markers[i] = callback(data[i]);
+                cluster.addLayers(markers);
+
+                cluster.addTo({{ this._parent.get_name() }});
+                return cluster;
+            })();
+        {% endmacro %}"""
+    )
+
+    def __init__(self, payload, callback=MARKER_CALLBACK, **kwargs):
+        super().__init__([], callback=callback, chunked_loading=True, **kwargs)
+        self.payload = payload
+
+    def render(self, **kwargs):
+        # 부모 render는 스크립트를 Element(문자열)로 다시 컴파일하므로 빈 배열로 등록하고,
+        # 같은 이름으로 배열을 넣은 스크립트를 바꿔 끼움 (add_child는 같은 이름이면 자리를 유지한 채 교체)
+        # streamlit_folium은 render 없이 템플릿의 script 매크로를 바로 부르므로 그쪽은 this.payload 그대로
+        payload, self.payload = self.payload, "[]"
+        try: super().render(**kwargs)
+        finally: self.payload = payload
+        self.get_root().script.add_child(_RawScript(self._template.module.script(self, kwargs)), name=self.get_name())
+
+
+def build_map(payload=None, center=DEFAULT_CENTER, zoom_start=7, auto_locate=True):
+    m = folium.Map(location=center, zoom_start=zoom_start)
+    # ⭐️ 내 위치 (장소 검색은 외부 지오코더 대신 gazetteer로 앱에서)
+    LocateControl(auto_start=auto_locate).add_to(m)
+    if payload is not None: PayloadMarkerCluster(payload).add_to(m)
+    return m
+
+
+def add_pin(m, lat, lon, tooltip=None):
+    folium.Marker([lat, lon], tooltip=tooltip).add_to(m)
+    return m
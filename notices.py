@@ -0,0 +1,29 @@
+import streamlit as st
+
+# --- [알림 큐] ---
+# 등록 성공/실패, 새 업적 같은 알림을 세션 상태에 쌓아 두었다가, 다음 실행에서 st.toast로 한 번에 띄웁니다.
+# 토스트는 브라우저에서 스스로 사라지므로 스크립트가 time.sleep으로 서버 스레드를 붙잡지 않습니다.
+
+QUEUE_KEY = "notices"
+ICONS = {"success": "✅", "error": "🚫", "achievement": "🎉"}
+DURATIONS = {"success": "short", "error": "long", "achievement": "long"}
+
+
+def push(kind, text, state=None):
+    state = st.session_state if state is None else state
+    state.setdefault(QUEUE_KEY, []).append((kind, text))
+
+
+def pending(state=None):
+    state = st.session_state if state is None else state
+    return list(state.get(QUEUE_KEY) or [])
+
+
+def flush(state=None):
+    # 쌓인 알림을 모두 토스트로 보내고 큐를 비움
+    state = st.session_state if state is None else state
+    queue = state.get(QUEUE_KEY)
+    if not queue: return 0
+    state[QUEUE_KEY] = []
+    for kind, text in queue: st.toast(text, icon=ICONS.get(kind), duration=DURATIONS.get(kind, "short"))
+    return len(queue)
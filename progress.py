@@ -0,0 +1,128 @@
+import threading
+from collections import Counter
+
+# --- [업적/경험치 엔진] ---
+# 전체 기록을 매번 다시 세지 않고, 추가/삭제될 때마다 카운터(총 수, 과별, 희귀도별, XP)만 갱신합니다.
+# 모든 업적은 이 카운터를 보고 판정하는 규칙입니다.
+
+# (업적 이름, 판정 함수) — 기존 calculate_achievements와 같은 순서
+ACHIEVEMENT_RULES = [
+    ("🐣 탐조 입문", lambda p: p.total >= 1),
+    ("🌱 새싹 탐조가", lambda p: p.total >= 10),
+    ("🥉 아마추어 탐조가", lambda p: p.total >= 50),
+    ("🥈 베테랑 탐조가", lambda p: p.total >= 150),
+    ("🥇 마스터 탐조가", lambda p: p.total >= 300),
+    ("💎 전설의 탐조가", lambda p: p.total >= 500),
+
+    ("🌈 다채로운 시선", lambda p: len(p.family) >= 20),
+    ("🦆 호수의 지배자", lambda p: p.family['오리과'] >= 15),
+    ("🦅 하늘의 제왕", lambda p: p.family['수리과'] + p.family['매과'] >= 10),
+    ("🦢 우아한 백로", lambda p: p.family['백로과'] >= 5),
+    ("🌲 숲속의 드러머", lambda p: p.family['딱다구리과'] >= 3),
+    ("🦉 밤의 추적자", lambda p: p.family['올빼미과'] >= 3),
+    ("🧠 똑똑한 새", lambda p: p.family['까마귀과'] >= 3),
+    ("👔 넥타이 신사", lambda p: p.family['박새과'] >= 3),
+    ("🏖️ 갯벌의 나그네", lambda p: p.family['도요과'] >= 15),
+
+    ("🍀 럭키 탐조가", lambda p: p.rare_total >= 3),
+    ("🛡️ 자연의 수호자", lambda p: p.rare_total >= 10),
+]
+
+XP_CLASS1 = 50
+XP_RARE = 30
+XP_COMMON = 10
+XP_PER_ACHIEVEMENT = 50
+XP_PER_LEVEL = 100
+
+
+class ProgressEngine:
+    def __init__(self, family_map, rare_birds):
+        self.family_map = family_map
+        self.rare_birds = rare_birds
+        self.version = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.total = 0
+        self.names = Counter()
+        self.family = Counter()
+        self.family_names = {}   # 과 -> 수집한 국명 집합 (사이드바 과별 현황용)
+        self.rarity = Counter()
+        self.bird_xp = 0
+
+    @property
+    def rare_total(self):
+        return sum(self.rarity.values())
+
+    def _bump(self, name, sign):
+        self.total += sign
+        self.names[name] += sign
+        if self.names[name] <= 0: del self.names[name]
+        fam = self.family_map.get(name)
+        if fam is not None:
+            self.family[fam] += sign
+            if self.family[fam] <= 0: del self.family[fam]
+            if name in self.names: self.family_names.setdefault(fam, set()).add(name)
+            elif fam in self.family_names:
+                self.family_names[fam].discard(name)
+                if not self.family_names[fam]: del self.family_names[fam]
+        rarity = self.rare_birds.get(name)
+        if rarity is None:
+            self.bird_xp += sign * XP_COMMON
+        else:
+            self.rarity[rarity] += sign
+            if self.rarity[rarity] <= 0: del self.rarity[rarity]
+            self.bird_xp += sign * (XP_CLASS1 if rarity == "class1" else XP_RARE)
+
+    def rebuild(self, names, version=None):
+        # 국명별로 먼저 센 뒤 종마다 한 번씩만 반영 (_bump의 sign은 증감량)
+        with self._lock:
+            self._reset()
+            for name, n in Counter(names).items(): self._bump(name, n)
+            self.version = version
+
+    def sync(self, df, version):
+        # 데이터 버전이 바뀐 경우(다른 기기에서 추가 등)에만 전체를 다시 셉니다
+        if self.version != version:
+            self.rebuild(df['bird_name'] if not df.empty else [], version)
+
+    def _in_step(self, from_version):
+        # 엔진이 from_version 상태가 아니면 중간 변경을 놓친 것이므로 다음 sync 때 다시 셉니다
+        if from_version is not None and self.version != from_version:
+            self.version = None
+            return False
+        return True
+
+    def add(self, names, from_version=None, to_version=None):
+        with self._lock:
+            if not self._in_step(from_version): return
+            for name in names: self._bump(name, 1)
+            self.version = to_version
+
+    def remove(self, names, from_version=None, to_version=None):
+        # 국명 단위 삭제: 해당 이름의 기록 전부를 뺍니다
+        with self._lock:
+            if not self._in_step(from_version): return
+            for name in set(names):
+                for _ in range(self.names.get(name, 0)): self._bump(name, -1)
+            self.version = to_version
+
+    def achievements(self):
+        return [name for name, rule in ACHIEVEMENT_RULES if rule(self)]
+
+    def xp_and_level(self, achievements=None):
+        if achievements is None: achievements = self.achievements()
+        total_xp = self.bird_xp + len(achievements) * XP_PER_ACHIEVEMENT
+        level = (total_xp // XP_PER_LEVEL) + 1
+        return level, total_xp % XP_PER_LEVEL, XP_PER_LEVEL, total_xp
+
+    def family_summary(self, family_groups, family_totals):
+        # 과별 현황: [(과, 기록 수, 전체 종 수, 획득 목록, 미획득 목록)] — 과 이름 순, 목록은 도감 순서
+        out = []
+        for family in sorted(family_totals):
+            collected = self.family_names.get(family, set())
+            members = family_groups.get(family, [])
+            out.append((family, self.family.get(family, 0), family_totals[family],
+                        [b for b in members if b in collected], [b for b in members if b not in collected]))
+        return out
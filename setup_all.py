@@ -1,72 +1,143 @@
+import argparse
+import io
+import json
 import os
 import time
-import requests
-import pandas as pd
-import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from PIL import Image
-from rembg import remove  # ⭐️ 배경 제거 마법
+
+import catalog
+import sprites
+from wiki_fetch import Fetcher
 
 CSV_FILE = "data.csv"
 OUTPUT_FOLDER = "assets/sprites"
+CHECKPOINT_FILE = os.path.join(".cache", "sprites_progress.json")
 
-def process_bird(bird_id, bird_name):
-    # 1. 위키백과에서 사진 찾기
-    url = "https://ko.wikipedia.org/w/api.php"
-    headers = {"User-Agent": "BirdApp/2.0"}
-    params = {"action": "query", "format": "json", "prop": "pageimages", "titles": bird_name, "pithumbsize": 1000}
+# ⭐️ 워커 프로세스마다 배경 제거 모델 세션을 한 번만 만들어 재사용
+_SESSION = None
+_FORMAT = "png"
 
-    try:
-        res = requests.get(url, params=params, headers=headers, timeout=5).json()
-        pages = res.get("query", {}).get("pages", {})
-        img_url = next((info["thumbnail"]["source"] for pid, info in pages.items() if "thumbnail" in info), None)
 
-        if not img_url: return False
+def _init_worker(fmt="png"):
+    global _SESSION, _FORMAT
+    from rembg import new_session
+    _SESSION = new_session()
+    _FORMAT = fmt
+
 
-        # 2. 임시 다운로드
-        temp_img = f"temp_{bird_id}.jpg"
-        req = urllib.request.Request(img_url, headers=headers)
-        with urllib.request.urlopen(req) as r, open(temp_img, 'wb') as f:
-            f.write(r.read())
+def process_bird(bird_id, bird_name, input_data):
+    from rembg import remove  # ⭐️ 배경 제거 마법
 
+    # 1~2. 위키백과 사진 찾기/다운로드는 메인 프로세스의 wiki_fetch가 맡고, 여기서는 바이트만 받음
+    try:
         # 3. ⭐️ 배경 제거 AI 적용
-        with open(temp_img, 'rb') as i:
-            input_data = i.read()
-            output_data = remove(input_data) # 배경이 날아가고 새만 남음!
+        output_data = remove(input_data, session=_SESSION) # 배경이 날아가고 새만 남음!
 
-        import io
         img = Image.open(io.BytesIO(output_data)).convert("RGBA")
 
         # 4. ⭐️ 크기 축소 & 색감 단순화 (16색 레트로 감성)
         w, h = img.size
         target = 48
         small_w, small_h = target, int(target * (h / w))
-        
+
         # 작게 줄이기
         pixel_img = img.resize((small_w, small_h), Image.NEAREST)
-        
-        # 색을 16개로 제한하여 고전 게임 느낌 내기
-        pixel_img = pixel_img.quantize(colors=16, method=2)
-        pixel_img = pixel_img.convert("RGBA") # 투명도 유지
 
-        # 5. 보기 좋게 4배 확대 후 저장
-        final_img = pixel_img.resize((small_w * 4, small_h * 4), Image.NEAREST)
-        final_img.save(os.path.join(OUTPUT_FOLDER, f"{bird_id}.png"), "PNG")
+        # 5. 색을 16개로 제한한 팔레트 이미지를 원래 크기 그대로 저장 (확대는 화면에서)
+        sprites.save_sprite(sprites.to_palette(pixel_img, colors=16), OUTPUT_FOLDER, bird_id, _FORMAT)
 
-        os.remove(temp_img)
         print(f"✨ [고품질] No.{bird_id} {bird_name} 레트로 도트 생성!")
-        return True
+        return bird_id, "ok"
+
+    except Exception: return bird_id, "error"
+
+
+def load_checkpoint():
+    try:
+        with open(CHECKPOINT_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"done": [], "no_image": []}
+
+
+def save_checkpoint(state):
+    os.makedirs(os.path.dirname(CHECKPOINT_FILE), exist_ok=True)
+    tmp = CHECKPOINT_FILE + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, CHECKPOINT_FILE)
 
-    except Exception: return False
 
 def main():
+    parser = argparse.ArgumentParser(description="위키백과 사진으로 도감 도트 스프라이트를 만듭니다.")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) - 1))
+    parser.add_argument("--downloads", type=int, default=8, help="동시 다운로드 수")
+    parser.add_argument("--retry-missing", action="store_true", help="위키백과 사진이 없던 종도 다시 시도")
+    parser.add_argument("--offline", action="store_true", help="네트워크 없이 .cache/http에 저장된 응답만 사용")
+    parser.add_argument("--format", choices=["png", "webp"], default="png", help="스프라이트 저장 형식 (팔레트 PNG 또는 무손실 WebP)")
+    parser.add_argument("--global-palette", type=int, default=0, metavar="N", help="끝나고 전 종을 공용 N색 팔레트 하나로 다시 저장")
+    args = parser.parse_args()
+
     if not os.path.exists(OUTPUT_FOLDER): os.makedirs(OUTPUT_FOLDER)
-    df = pd.read_csv(CSV_FILE, skiprows=2, header=None, encoding='cp949')
-    print("🚀 [배경투명+16색] 고품질 도트 재생성을 시작합니다...")
-    success = 0
-    for _, row in df.iloc[:, [0, 4]].dropna().iterrows():
-        if process_bird(int(row[0]), str(row[4]).strip()): success += 1
-        time.sleep(0.1)
-    print(f"🎉 완벽합니다! 총 {success}개의 고품질 도트 이미지가 완성되었습니다.")
+    id_to_name = catalog.load_bird_map(CSV_FILE)[5]
+
+    # ⭐️ 이미 스프라이트가 있거나(이어하기) 사진이 없다고 확인된 종은 건너뜀
+    state = load_checkpoint()
+    if args.retry_missing: state["no_image"] = []
+    done_ids, no_image = set(state.get("done", [])), set(state.get("no_image", []))
+    todo = [(bid, name) for bid, name in sorted(id_to_name.items())
+            if bid not in no_image and not sprites.sprite_path(OUTPUT_FOLDER, bid)]
+    skipped = len(id_to_name) - len(todo)
+
+    print(f"🚀 [배경투명+16색] 고품질 도트 생성을 시작합니다... (대상 {len(todo)}종, 건너뜀 {skipped}종, 워커 {args.workers}개)")
+    counts = {"ok": 0, "no_image": 0, "error": 0}
+    bytes_before = sprites.sprite_bytes(OUTPUT_FOLDER)
+    start = time.perf_counter()
+
+    def record(bird_id, status):
+        counts[status] += 1
+        if status == "error": return  # 오류는 다음 실행 때 다시 시도
+        (done_ids if status == "ok" else no_image).add(bird_id)
+        state["done"], state["no_image"] = sorted(done_ids), sorted(no_image)
+        save_checkpoint(state)
+
+    # ⭐️ 문서 이미지 조회는 50종씩 묶어서, 다운로드는 연결 풀을 공유하는 스레드로, 배경 제거는 프로세스 풀로
+    fetcher = Fetcher(offline=args.offline)
+    image_urls = fetcher.lookup_images(name for _, name in todo)
+
+    def download(bid, name):
+        return bid, name, fetcher.get(image_urls[name])
+
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker, initargs=(args.format,)) as pool, \
+            ThreadPoolExecutor(max_workers=args.downloads) as io_pool:
+        downloads = []
+        for bid, name in todo:
+            if image_urls.get(name): downloads.append(io_pool.submit(download, bid, name))
+            else: record(bid, "no_image")
+        sprite_futures = []
+        for fut in as_completed(downloads):
+            try: bid, name, data = fut.result()
+            except Exception:
+                counts["error"] += 1
+                continue
+            sprite_futures.append(pool.submit(process_bird, bid, name, data))
+        for fut in as_completed(sprite_futures):
+            record(*fut.result())
+
+    # ⭐️ 예전 4배 RGBA 스프라이트 정리 + (선택) 공용 팔레트로 한 번에 다시 양자화
+    sprites.compact_sprites(OUTPUT_FOLDER, fmt=args.format, global_colors=args.global_palette)
+    # ⭐️ 도감 화면이 쓰는 아틀라스(static/)도 새 스프라이트로 다시 묶음
+    atlas = sprites.build_atlas(OUTPUT_FOLDER)
+
+    elapsed = time.perf_counter() - start
+    done = sum(counts.values())
+    rate = done / elapsed if elapsed > 0 else 0.0
+    print(f"🎉 완벽합니다! 총 {counts['ok']}개의 고품질 도트 이미지가 완성되었습니다.")
+    print(f"📊 {done}종 처리 / {elapsed:.1f}초 ({rate:.2f}종/초) · 성공 {counts['ok']} · 사진 없음 {counts['no_image']} · 오류 {counts['error']} · 건너뜀 {skipped}")
+    print(f"💾 스프라이트 용량: {bytes_before:,} → {sprites.sprite_bytes(OUTPUT_FOLDER):,} bytes")
+    if atlas: print(f"🗺️ 아틀라스: {len(atlas['sprites'])}종 → {sprites.STATIC_DIR}/{sprites.ATLAS_FILE} (v={atlas['version']})")
+    print(f"🌐 HTTP: 새로 받음 {fetcher.stats['network']} · 변경 없음(304) {fetcher.stats['revalidated']} · 캐시 재생 {fetcher.stats['replayed']}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+
+from storage import DATE_FORMAT, SIGHTING_COLUMNS, empty_frame
+
+# --- [정규화된 탐조 기록 프레임] ---
+# 저장소에서 읽은 기록(시트에서 오면 전부 문자열/object)을 불러올 때 한 번만 타입을 맞춥니다.
+#  - bird_name: 도감 종 목록(종 번호 순)과 같은 범주를 쓰는 categorical. 목록에 없는 옛 이름은 범주 뒤에 덧붙임
+#  - real_no: 종 번호(int16, 목록에 없으면 9999) / family, rarity: 종 범주 코드에서 바로 뽑은 categorical
+#  - lat, lon: float32 / date: datetime64 / sex, location: categorical
+# 이후 단계(지도, 공간 인덱스, 업적, 도감)는 다시 파싱하거나 FAMILY_MAP으로 다시 매핑하지 않습니다.
+
+UNKNOWN_NO = 9999
+SEXES = ["미구분", "수컷", "암컷"]
+RARITIES = ["class1", "class2", "natural"]
+
+
+def _categorical(values, categories=()):
+    # 정해 둔 범주 + 처음 보는 값은 뒤에 덧붙인 범주 (정해 둔 범주의 코드는 항상 같음).
+    # 행마다 다루지 않고 서로 다른 값만 한 번씩 공백을 정리해서 범주 위치를 찾음
+    if isinstance(values.dtype, pd.CategoricalDtype): values = values.astype(object)
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Index([str(u).strip() for u in uniques], dtype=object)
+    cats = pd.Index(list(categories), dtype=object)
+    cats = cats.append(pd.Index(sorted(set(uniques) - set(cats)), dtype=object))
+    pos = np.append(cats.get_indexer(uniques), -1)   # 마지막 칸: 빈 값(코드 -1)은 그대로 -1
+    return pd.Categorical.from_codes(pos[codes], categories=cats)
+
+
+class SightingSchema:
+    def __init__(self, bird_map, family_map, rare_birds):
+        names = sorted(bird_map, key=bird_map.get)
+        self.names = pd.Index(names)
+        self.families = pd.CategoricalDtype(sorted(set(family_map.values())))
+        self.rarities = pd.CategoricalDtype(RARITIES)
+        # 종 범주 코드 -> 종 번호 / 과 코드 / 희귀도 코드 (마지막 칸은 목록에 없는 이름용: 코드 -1로 조회)
+        family_code = {f: i for i, f in enumerate(self.families.categories)}
+        self._no = np.array([bird_map[n] for n in names] + [UNKNOWN_NO], dtype=np.int16)
+        self._family = np.array([family_code.get(family_map.get(n), -1) for n in names] + [-1], dtype=np.int16)
+        self._rarity = np.array([RARITIES.index(rare_birds[n]) if rare_birds.get(n) in RARITIES else -1 for n in names] + [-1], dtype=np.int8)
+
+    def _dates(self, series):
+        if pd.api.types.is_datetime64_any_dtype(series): return series
+        dates = pd.to_datetime(series, format=DATE_FORMAT, errors="coerce")
+        odd = dates.isna() & series.notna()
+        if odd.any(): dates[odd] = pd.to_datetime(series[odd].astype(str), format="mixed", errors="coerce")
+        return dates
+
+    def _coords(self, series):
+        if series.dtype == np.float32: return series
+        return pd.to_numeric(series, errors="coerce").astype(np.float32)
+
+    def normalize(self, df):
+        if df is None or df.empty: df = empty_frame()
+        for col in SIGHTING_COLUMNS:
+            if col not in df.columns: df = df.assign(**{col: None})
+        names = df["bird_name"]
+        if not (isinstance(names.dtype, pd.CategoricalDtype) and names.cat.categories[:len(self.names)].equals(self.names)):
+            names = pd.Series(_categorical(names, self.names), index=df.index)
+        codes = names.cat.codes.to_numpy()
+        codes = np.where(codes < len(self.names), codes, -1)
+        sex, location = df["sex"], df["location"]
+        if not isinstance(sex.dtype, pd.CategoricalDtype): sex = pd.Series(_categorical(sex.fillna(SEXES[0]), SEXES), index=df.index)
+        if not isinstance(location.dtype, pd.CategoricalDtype): location = pd.Series(_categorical(location), index=df.index)
+        out = df.assign(
+            No=pd.to_numeric(df["No"], errors="coerce").round().astype("Int32"),
+            bird_name=names, sex=sex, date=self._dates(df["date"]),
+            lat=self._coords(df["lat"]), lon=self._coords(df["lon"]), location=location,
+            real_no=self._no[codes],
+            family=pd.Categorical.from_codes(self._family[codes], dtype=self.families),
+            rarity=pd.Categorical.from_codes(self._rarity[codes], dtype=self.rarities),
+        )
+        return out.sort_values("real_no", kind="stable")
+
+    def extend(self, df, rows):
+        # 이미 정규화된 프레임 + 새 행: 새 행만 정규화하고, 범주형 컬럼은 범주를 합쳐 categorical로 이어 붙임
+        new = self.normalize(pd.DataFrame(rows))
+        if df is None or df.empty: return new
+        df = df.copy(deep=False)
+        for col in df.columns:
+            if col in new.columns and isinstance(df[col].dtype, pd.CategoricalDtype) and df[col].dtype != new[col].dtype:
+                cats = df[col].cat.categories
+                cats = cats.append(new[col].cat.categories.difference(cats, sort=False))
+                df[col] = df[col].cat.set_categories(cats)
+                new[col] = new[col].cat.set_categories(cats)
+        return pd.concat([df, new], ignore_index=True).sort_values("real_no", kind="stable")
@@ -0,0 +1,42 @@
+import json
+import numpy as np
+import pandas as pd
+
+# --- [탐조 지도] ---
+# 기록마다 folium.Marker + Popup 객체를 만들지 않고, 위치가 있는 기록 전체를
+# [lat, lon, 이름, 날짜, 아이콘] 배열 하나(JSON)로 직렬화해서 브라우저에서 마커/클러스터를 만듭니다.
+# 직렬화 결과(marker_payload)는 데이터 버전이 같으면 그대로 재사용할 수 있도록 문자열로 돌려줍니다.
+# 이 모듈은 folium 없이 데이터만 다루고, 지도 객체(folium)는 map_render.py에서 만듭니다 (지도를 그릴 때만 import).
+
+DEFAULT_CENTER = [36.5, 127.5]
+
+
+def located(df):
+    # 위치가 있는 기록만 (정규화 전 프레임은 문자열일 수 있어 숫자로 변환)
+    if df.empty or 'lat' not in df.columns or 'lon' not in df.columns: return df.iloc[0:0]
+    lat, lon = df['lat'], df['lon']
+    if not (pd.api.types.is_float_dtype(lat) and pd.api.types.is_float_dtype(lon)):
+        lat = pd.to_numeric(lat, errors='coerce')
+        lon = pd.to_numeric(lon, errors='coerce')
+    mask = lat.notna() & lon.notna()
+    return df.loc[mask].assign(lat=lat[mask], lon=lon[mask])
+
+
+def _date_text(dates):
+    # datetime 컬럼 -> DATE_FORMAT("%Y-%m-%d %H:%M") 문자열 목록. dt.strftime은 행마다 포맷해서 느리므로
+    # 분 단위로 자른 뒤 numpy ISO 문자열("YYYY-MM-DDTHH:MM")에서 T만 바꿈
+    if not pd.api.types.is_datetime64_any_dtype(dates): return dates.astype(object).fillna('').astype(str).tolist()
+    text = np.char.replace(np.datetime_as_string(dates.to_numpy().astype("datetime64[m]")), "T", " ")
+    text[dates.isna().to_numpy()] = ""
+    return text.tolist()
+
+
+def marker_payload(map_df, icon_for):
+    # (JSON 배열 문자열, 지도 중심) — 행 단위 반복 없이 열 단위로 만듦
+    names = map_df['bird_name'].astype(str)
+    icons = names.map({name: icon_for(name) for name in names.unique()})
+    dates = _date_text(map_df['date'])
+    rows = zip(map_df['lat'].astype(float).round(6).tolist(), map_df['lon'].astype(float).round(6).tolist(), names.tolist(), dates, icons.tolist())
+    payload = json.dumps(list(rows), ensure_ascii=False, separators=(",", ":")).replace("</", "<\\/")
+    center = [float(map_df['lat'].mean()), float(map_df['lon'].mean())] if len(map_df) else DEFAULT_CENTER
+    return payload, center
@@ -0,0 +1,230 @@
+import argparse
+import hashlib
+import json
+import os
+import numpy as np
+from PIL import Image
+
+# --- [도감 스프라이트 아틀라스] ---
+# assets/sprites/{id}.png 를 이미지 한 장(아틀라스)으로 합치고, 종 번호별 위치를 JSON 인덱스로 저장합니다.
+# 그리드는 각 칸을 CSS background-position으로 그리므로, 한 페이지 전체가 (브라우저 캐시된) 요청 한 번으로 끝납니다.
+# 미발견 종은 같은 배치의 회색 실루엣 아틀라스를 씁니다.
+# 스프라이트는 원래 해상도(가로 48px)의 팔레트(P 모드+투명) PNG 또는 무손실 WebP로 저장하고,
+# 확대는 화면에서(image-rendering:pixelated) 합니다.
+# 빌드: python sprites.py [--format webp] [--global-palette 16]
+#       (static/ 폴더는 Streamlit 정적 파일 서빙으로 app/static/... 에 노출)
+
+SPRITE_DIR = os.path.join("assets", "sprites")
+STATIC_DIR = "static"
+ATLAS_FILE = "sprite_atlas.png"
+LOCKED_ATLAS_FILE = "sprite_atlas_locked.png"
+INDEX_FILE = "sprite_atlas.json"
+STATIC_URL = "app/static"
+MAX_WIDTH = 1024
+PADDING = 2
+SILHOUETTE_RGB = (158, 158, 158)
+SPRITE_EXTENSIONS = (".png", ".webp")
+SPRITE_COLORS = 16
+LEGACY_SCALE = 4  # 예전 파이프라인은 4배 확대한 RGBA PNG를 저장했음
+ALPHA_CUTOFF = 128
+
+
+def _sprite_files(sprite_dir):
+    # {id: 파일 경로}. 같은 종이 두 형식으로 있으면 나중에 저장된 쪽
+    files = {}
+    for name in os.listdir(sprite_dir):
+        stem, ext = os.path.splitext(name)
+        if ext.lower() not in SPRITE_EXTENSIONS or not stem.isdigit(): continue
+        path = os.path.join(sprite_dir, name)
+        if int(stem) in files and os.path.getmtime(files[int(stem)]) >= os.path.getmtime(path): continue
+        files[int(stem)] = path
+    return files
+
+
+def sprite_path(sprite_dir, bird_id):
+    for ext in SPRITE_EXTENSIONS:
+        path = os.path.join(sprite_dir, f"{bird_id}{ext}")
+        if os.path.exists(path): return path
+    return None
+
+
+def _load_sprites(sprite_dir):
+    sprites = []
+    for bid, path in sorted(_sprite_files(sprite_dir).items()):
+        with Image.open(path) as img:
+            sprites.append((bid, native(img.convert("RGBA"))))
+    return sprites
+
+
+# --- [팔레트 스프라이트] ---
+
+def native(img, scale=LEGACY_SCALE):
+    # NEAREST로 scale배 확대된 이미지면 원래 크기로 되돌림 (예전 4배 PNG 변환용)
+    w, h = img.size
+    if w % scale or h % scale: return img
+    a = np.asarray(img)
+    blocks = a.reshape(h // scale, scale, w // scale, scale, -1)
+    if not (blocks == blocks[:, :1, :, :1]).all(): return img
+    return Image.fromarray(np.ascontiguousarray(blocks[:, 0, :, 0]), img.mode)
+
+
+def _opaque_pixels(images):
+    arrays = [np.asarray(img.convert("RGBA")).reshape(-1, 4) for img in images]
+    pixels = np.concatenate(arrays) if arrays else np.zeros((0, 4), np.uint8)
+    pixels = pixels[pixels[:, 3] >= ALPHA_CUTOFF, :3]
+    return pixels if len(pixels) else np.zeros((1, 3), np.uint8)
+
+
+def make_palette(images, colors=SPRITE_COLORS):
+    # 여러 스프라이트의 불투명 픽셀을 한 줄로 이어 붙여 한 번에 양자화 -> 공용 팔레트 이미지
+    strip = Image.fromarray(np.ascontiguousarray(_opaque_pixels(images)[None]), "RGB")
+    return strip.quantize(colors=colors, method=Image.Quantize.MEDIANCUT)
+
+
+def _index(rgba):
+    # 색 수가 255 이하인 RGBA -> 0번이 투명인 P 이미지 (넘치면 None)
+    a = np.asarray(rgba)
+    opaque = a[..., 3] >= ALPHA_CUTOFF
+    colors, inverse = np.unique(a[..., :3][opaque], axis=0, return_inverse=True)
+    if len(colors) > 255: return None
+    idx = np.zeros(a.shape[:2], np.uint8)
+    idx[opaque] = inverse.ravel() + 1
+    out = Image.fromarray(idx, "P")
+    out.putpalette([0, 0, 0] + colors.astype(np.uint8).ravel().tolist())
+    out.info["transparency"] = 0
+    return out
+
+
+def to_palette(img, palette=None, colors=SPRITE_COLORS):
+    # palette가 없으면 이미 colors색 이하인 스프라이트는 그대로, 아니면 자기 팔레트로 양자화
+    rgba = img.convert("RGBA")
+    if palette is None:
+        if len(np.unique(_opaque_pixels([rgba]), axis=0)) <= colors: return _index(rgba)
+        palette = make_palette([rgba], colors)
+    mapped = rgba.convert("RGB").quantize(palette=palette, dither=Image.Dither.NONE).convert("RGBA")
+    mapped.putalpha(rgba.getchannel("A"))
+    return _index(mapped)
+
+
+def save_sprite(img, sprite_dir, bird_id, fmt="png"):
+    # 중간에 멈춰도 반쪽짜리 파일이 남지 않도록 임시 파일에 쓴 뒤 교체. 다른 형식의 옛 파일은 지움
+    path = os.path.join(sprite_dir, f"{bird_id}.{fmt}")
+    if fmt == "webp":
+        img.convert("RGBA").save(path + ".tmp", "WEBP", lossless=True, quality=100, method=6)
+    else:
+        img.save(path + ".tmp", "PNG", optimize=True)
+    os.replace(path + ".tmp", path)
+    for ext in SPRITE_EXTENSIONS:
+        other = os.path.join(sprite_dir, f"{bird_id}{ext}")
+        if other != path and os.path.exists(other): os.remove(other)
+    return path
+
+
+def sprite_bytes(sprite_dir=SPRITE_DIR):
+    return sum(os.path.getsize(p) for p in _sprite_files(sprite_dir).values())
+
+
+def compact_sprites(sprite_dir=SPRITE_DIR, fmt="png", global_colors=0):
+    # 모든 스프라이트를 원래 해상도 팔레트 이미지로 다시 저장. global_colors>0이면 전 종 공용 팔레트 하나로
+    sprites = _load_sprites(sprite_dir)
+    palette = make_palette([img for _, img in sprites], global_colors) if global_colors and sprites else None
+    for bid, img in sprites:
+        save_sprite(to_palette(img, palette), sprite_dir, bid, fmt)
+    return len(sprites)
+
+
+def _pack(sizes, max_width=MAX_WIDTH):
+    # 높이순 선반(shelf) 배치: {id: (x, y, w, h)}, 전체 크기
+    rects, x, y, shelf_h, width = {}, 0, 0, 0, 0
+    for bid, (w, h) in sorted(sizes.items(), key=lambda kv: (-kv[1][1], kv[0])):
+        if x and x + w > max_width:
+            x, y, shelf_h = 0, y + shelf_h + PADDING, 0
+        rects[bid] = (x, y, w, h)
+        x += w + PADDING
+        shelf_h = max(shelf_h, h)
+        width = max(width, x - PADDING)
+    return rects, (max(width, 1), max(y + shelf_h, 1))
+
+
+def silhouette(img):
+    # 알파만 남기고 색을 회색 한 가지로 (미발견 종 표시용)
+    shadow = Image.new("RGBA", img.size, SILHOUETTE_RGB + (0,))
+    shadow.putalpha(img.getchannel("A"))
+    return shadow
+
+
+def build_atlas(sprite_dir=SPRITE_DIR, out_dir=STATIC_DIR):
+    sprites = _load_sprites(sprite_dir)
+    if not sprites: return None
+    rects, size = _pack({bid: img.size for bid, img in sprites})
+    atlas = Image.new("RGBA", size, (0, 0, 0, 0))
+    locked = Image.new("RGBA", size, (0, 0, 0, 0))
+    for bid, img in sprites:
+        x, y, _, _ = rects[bid]
+        atlas.paste(img, (x, y))
+        locked.paste(silhouette(img), (x, y))
+
+    os.makedirs(out_dir, exist_ok=True)
+    # 공용 팔레트를 쓰면 아틀라스도 255색 이하라 P 모드로 저장됨
+    (_index(atlas) or atlas).save(os.path.join(out_dir, ATLAS_FILE), optimize=True)
+    (_index(locked) or locked).save(os.path.join(out_dir, LOCKED_ATLAS_FILE), optimize=True)
+    with open(os.path.join(out_dir, ATLAS_FILE), "rb") as f:
+        version = hashlib.sha1(f.read()).hexdigest()[:10]
+    index = {"version": version, "size": list(size), "sprites": {str(bid): list(r) for bid, r in sorted(rects.items())}}
+    with open(os.path.join(out_dir, INDEX_FILE), "w", encoding="utf-8") as f:
+        json.dump(index, f, separators=(",", ":"))
+    return index
+
+
+def load_atlas_index(out_dir=STATIC_DIR):
+    try:
+        with open(os.path.join(out_dir, INDEX_FILE), encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    index["sprites"] = {int(k): v for k, v in index["sprites"].items()}
+    return index
+
+
+def atlas_url(index, locked=False):
+    return f"{STATIC_URL}/{LOCKED_ATLAS_FILE if locked else ATLAS_FILE}?v={index['version']}"
+
+
+def sprite_html(index, bird_id, box, locked=False):
+    # box x box 칸 안에 비율을 유지해서 그리는 div. 아틀라스에 없는 종이면 None
+    if not index or bird_id not in index["sprites"]: return None
+    x, y, w, h = index["sprites"][bird_id]
+    scale = min(box / w, box / h)
+    atlas_w, atlas_h = index["size"]
+    url = atlas_url(index, locked)
+    return (
+        f"<div style='width:{box}px; height:{box}px; margin:0 auto; display:flex; align-items:center; justify-content:center;'>"
+        f"<div style='width:{w * scale:.1f}px; height:{h * scale:.1f}px; background:url({url}) no-repeat; "
+        f"background-position:-{x * scale:.1f}px -{y * scale:.1f}px; background-size:{atlas_w * scale:.1f}px {atlas_h * scale:.1f}px; "
+        f"image-rendering:pixelated;'></div></div>"
+    )
+
+
+def _atlas_bytes(out_dir=STATIC_DIR):
+    paths = [os.path.join(out_dir, name) for name in (ATLAS_FILE, LOCKED_ATLAS_FILE)]
+    return sum(os.path.getsize(p) for p in paths if os.path.exists(p))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="도감 스프라이트를 팔레트 이미지로 정리하고 아틀라스를 만듭니다.")
+    parser.add_argument("--format", choices=["png", "webp"], default="png")
+    parser.add_argument("--global-palette", type=int, default=0, metavar="N", help="전 종 공용 N색 팔레트 (0이면 종별 팔레트)")
+    args = parser.parse_args()
+
+    if not os.path.isdir(SPRITE_DIR) or not _sprite_files(SPRITE_DIR):
+        print(f"🚨 {SPRITE_DIR}에 스프라이트가 없습니다. 먼저 python setup_all.py 를 실행하세요.")
+        return
+    before, atlas_before = sprite_bytes(), _atlas_bytes()
+    count = compact_sprites(fmt=args.format, global_colors=args.global_palette)
+    index = build_atlas()
+    print(f"💾 스프라이트 {count}개: {before:,} → {sprite_bytes():,} bytes · 아틀라스: {atlas_before:,} → {_atlas_bytes():,} bytes")
+    print(f"✅ {index['size'][0]}x{index['size'][1]} 아틀라스를 만들었습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,481 @@
+import hashlib
+import itertools
+import queue
+import re
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+import tracing
+
+# --- [탐조 기록 저장소] ---
+# get_data / save_data / delete_birds 가 모두 거치는 저장 계층.
+# 구글 시트(GSheetsStore)와 로컬 SQLite(SQLiteStore) 중 하나를 골라 씁니다.
+# 두 저장소 모두 새 행만 이어 붙이므로 기록이 쌓여도 한 마리 등록 비용이 일정합니다.
+# 여러 사용자가 쓰는 배포에서는 for_user(사용자)로 사용자별 파티션(시트는 워크시트, SQLite는 user_id)을 열어
+# 요청 비용이 그 사용자의 기록 수에만 비례하게 하고, 순위표는 사용자별 요약(rollup) 한 줄씩만 읽습니다.
+
+SIGHTING_COLUMNS = ['No', 'bird_name', 'sex', 'date', 'lat', 'lon', 'location']
+ROLLUP_COLUMNS = ['user_id', 'name', 'species', 'records', 'rare', 'achievements', 'level', 'xp', 'updated']
+DATE_FORMAT = "%Y-%m-%d %H:%M"
+USER_SHEET_PREFIX = "u_"
+ROLLUP_SHEET = "rollups"
+
+
+def user_key(user):
+    # 계정(이메일 등) -> 워크시트 이름/파티션 키. 읽을 수 있는 앞부분 + 해시(정리하다 겹치는 이름 구분)
+    if user is None: return None
+    readable = re.sub(r"[^0-9a-z]+", "_", str(user).lower()).strip("_")[:40]
+    return f"{readable}-{hashlib.sha1(str(user).encode()).hexdigest()[:8]}"
+
+
+def empty_frame():
+    return pd.DataFrame(columns=SIGHTING_COLUMNS)
+
+
+def make_row(real_no, bird_name, sex, date, lat=None, lon=None, location=None):
+    return {'No': real_no, 'bird_name': bird_name, 'sex': sex, 'date': date,
+            'lat': lat, 'lon': lon, 'location': location}
+
+
+def storable(df):
+    # 타입을 맞춘 프레임(categorical / datetime / float32)을 저장소에 쓰던 원래 값 형태로 되돌림
+    out = df[[c for c in df.columns if c in SIGHTING_COLUMNS]].copy()
+    for col in out.columns:
+        s = out[col]
+        if isinstance(s.dtype, pd.CategoricalDtype): out[col] = s.astype(object).where(s.notna(), None)
+        elif pd.api.types.is_datetime64_any_dtype(s): out[col] = s.dt.strftime(DATE_FORMAT).astype(object).where(s.notna(), None)
+        elif s.dtype == np.float32: out[col] = s.astype(float).round(6)
+        elif isinstance(s.dtype, pd.Int32Dtype): out[col] = s.astype(object).where(s.notna(), None)
+    return out
+
+
+def _cell(value):
+    # gspread는 JSON 직렬화 가능한 값만 받으므로 NaN/None은 빈 칸으로
+    if value is None: return ""
+    try:
+        if pd.isna(value): return ""
+    except (TypeError, ValueError):
+        pass
+    if hasattr(value, 'item'): return value.item()  # numpy 스칼라
+    return value
+
+
+def _sql_value(value):
+    value = _cell(value)
+    return None if value == "" else value
+
+
+class SightingStore(ABC):
+    # 기본 조회는 이미 읽어온 기록(current_df)을 훑습니다. 인덱스가 있는 저장소는 재정의합니다.
+
+    @abstractmethod
+    def read(self): ...
+
+    def append(self, row):
+        self.append_many([row])
+
+    @abstractmethod
+    def append_many(self, rows): ...
+
+    @abstractmethod
+    def delete_names(self, bird_names, current_df=None): ...
+
+    def _frame(self, current_df):
+        return self.read() if current_df is None else current_df
+
+    def has_bird(self, bird_name, current_df=None):
+        df = self._frame(current_df)
+        return not df.empty and bird_name in df['bird_name'].values
+
+    def records_for(self, bird_name, current_df=None):
+        df = self._frame(current_df)
+        return df[df['bird_name'] == bird_name]
+
+    def count(self, current_df=None):
+        return len(self._frame(current_df))
+
+    # 사용자별 파티션 / 순위표 요약 — 지원하지 않는 저장소는 자기 자신(한 사람용)과 빈 순위표
+    def for_user(self, user):
+        return self
+
+    def claim_legacy(self, user):
+        # 사용자 구분 전 기록(주인 없는 기록)을 user의 파티션으로. 옮긴 행 수
+        return 0
+
+    def put_rollup(self, row):
+        pass
+
+    def rollups(self):
+        return pd.DataFrame(columns=ROLLUP_COLUMNS)
+
+
+class GSheetsStore(SightingStore):
+    # 사용자별 저장소는 같은 스프레드시트의 "u_<사용자 키>" 워크시트 (처음 쓰는 사용자면 헤더만 있는 시트를 만듦)
+    # 연결(st.connection의 gspread 클라이언트)은 모든 사용자 저장소가 하나를 같이 씁니다.
+    def __init__(self, conn, spreadsheet, worksheet=None, create_missing=False):
+        self.conn = conn
+        self.spreadsheet = spreadsheet
+        self.worksheet = worksheet
+        self.create_missing = create_missing
+        self._ws = None
+        self._header = None
+        self._rollup_ws = None
+        self._book = None
+        self.legacy_owner = None
+
+    def for_user(self, user):
+        if user is None or user == self.legacy_owner: return self
+        return GSheetsStore(self.conn, self.spreadsheet, USER_SHEET_PREFIX + user_key(user), create_missing=True)
+
+    def claim_legacy(self, user):
+        # 기존 워크시트를 옮기지 않고 그대로 그 사용자의 파티션으로 씀
+        self.legacy_owner = user
+        return 0
+
+    def _spreadsheet_handle(self):
+        # streamlit_gsheets에는 워크시트를 추가하는 공개 API가 없어서(create는 spreadsheet를 함께 받지 못함)
+        # 기록 추가에 이미 쓰는 _select_worksheet로 첫 워크시트를 열고, gspread 공개 속성(.spreadsheet)으로 문서를 얻음
+        # (비공개 메서드라 requirements.txt에서 st-gsheets-connection==0.1.0으로 고정)
+        if self._book is None:
+            self._book = self.conn.client._select_worksheet(spreadsheet=self.spreadsheet).spreadsheet
+        return self._book
+
+    def _ensure_worksheet(self, title, columns, attempts=3):
+        # 워크시트가 없으면 만들고 1행에 헤더를 씀. 다른 프로세스가 같은 이름으로 먼저 만들면 add_worksheet가
+        # 실패하므로 목록을 다시 읽어 그 시트를 씀 (헤더는 A1에 덮어써서 누가 먼저 써도 같은 결과)
+        book = self._spreadsheet_handle()
+        error = None
+        for attempt in range(attempts):
+            for ws in book.worksheets():
+                if ws.title == title: return ws
+            try: ws = book.add_worksheet(title=title, rows=1, cols=len(columns))
+            except Exception as e:
+                error = e
+                time.sleep(0.2 * (attempt + 1))
+                continue
+            ws.update(range_name="A1", values=[list(columns)])
+            return ws
+        raise error
+
+    def read(self):
+        if self.create_missing and self._ws is None: self._ws = self._ensure_worksheet(self.worksheet, SIGHTING_COLUMNS)
+        with tracing.span("sheet.read") as s:
+            if self.worksheet:
+                df = self.conn.read(spreadsheet=self.spreadsheet, worksheet=self.worksheet, ttl=0)
+            else:
+                df = self.conn.read(spreadsheet=self.spreadsheet, ttl=0)
+            s.tag(rows=0 if df is None else len(df))
+        return df
+
+    def rewrite(self, df):
+        with tracing.span("sheet.update", rows=len(df)):
+            if self.worksheet:
+                self.conn.update(spreadsheet=self.spreadsheet, worksheet=self.worksheet, data=df)
+            else:
+                self.conn.update(spreadsheet=self.spreadsheet, data=df)
+        self._header = list(df.columns)
+
+    def _sheet(self):
+        # gspread 워크시트 핸들은 한 번만 열어서 재사용 (conn.update와 같은 워크시트 선택 규칙)
+        if self._ws is None:
+            if self.create_missing: self._ws = self._ensure_worksheet(self.worksheet, SIGHTING_COLUMNS)
+            else: self._ws = self.conn.client._select_worksheet(spreadsheet=self.spreadsheet, worksheet=self.worksheet)
+        return self._ws
+
+    def _sheet_header(self):
+        if self._header is None:
+            self._header = [h for h in self._sheet().row_values(1) if h]
+        return self._header
+
+    def append_many(self, rows):
+        if not rows: return
+        header = self._sheet_header()
+        if not header or any(c not in header for c in SIGHTING_COLUMNS):
+            # 헤더가 없거나 컬럼이 빠진 옛 시트는 한 번만 전체 재작성으로 맞춰줍니다
+            current = self.read()
+            if current is None or current.empty: current = empty_frame()
+            for col in SIGHTING_COLUMNS:
+                if col not in current.columns: current[col] = None
+            new_rows = pd.DataFrame(rows, columns=SIGHTING_COLUMNS)
+            self.rewrite(pd.concat([current, new_rows], ignore_index=True))
+            return
+        values = [[_cell(r.get(col)) for col in header] for r in rows]
+        with tracing.span("sheet.append", rows=len(values)):
+            self._sheet().append_rows(values, value_input_option="USER_ENTERED")
+
+    def delete_names(self, bird_names, current_df=None):
+        # 삭제는 드물기 때문에 남은 기록으로 시트를 다시 씁니다
+        # ⭐️ 화면용으로 타입을 맞춘 current_df에서 되돌리면 날짜 형식/초/빈 성별/좌표 자릿수가 바뀌므로 항상 시트 원본을 다시 읽어서
+        df = self.read()
+        if df is None or df.empty or 'bird_name' not in df.columns: return
+        self.rewrite(df[~df['bird_name'].isin(bird_names)])
+
+    def put_rollup(self, row):
+        # 순위표 워크시트에서 그 사용자 줄만 고치거나 새로 한 줄 추가
+        if self._rollup_ws is None: self._rollup_ws = self._ensure_worksheet(ROLLUP_SHEET, ROLLUP_COLUMNS)
+        values = [_cell(row.get(c)) for c in ROLLUP_COLUMNS]
+        with tracing.span("sheet.rollup"):
+            cell = self._rollup_ws.find(str(row['user_id']), in_column=1)
+            if cell: self._rollup_ws.update(range_name=f"A{cell.row}", values=[values])
+            else: self._rollup_ws.append_row(values)
+
+    def rollups(self):
+        if self._rollup_ws is None: self._rollup_ws = self._ensure_worksheet(ROLLUP_SHEET, ROLLUP_COLUMNS)
+        with tracing.span("sheet.read", worksheet=ROLLUP_SHEET):
+            df = self.conn.read(spreadsheet=self.spreadsheet, worksheet=ROLLUP_SHEET, ttl=0)
+        return df if df is not None and not df.empty else pd.DataFrame(columns=ROLLUP_COLUMNS)
+
+
+class SQLitePool:
+    # 같은 DB 파일을 여는 연결 몇 개를 모든 사용자 저장소가 나눠 씀 (WAL 모드라 읽기끼리는 동시에 진행)
+    # 빌려 간 연결은 그 스레드만 쓰고 돌려줌. size개를 다 빌려 가면 하나가 돌아올 때까지 기다림
+    def __init__(self, path, size=4, timeout=10):
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def _open(self):
+        db = sqlite3.connect(self.path, check_same_thread=False, timeout=self.timeout)
+        db.execute("PRAGMA journal_mode=WAL")
+        return db
+
+    @contextmanager
+    def connection(self):
+        try: db = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_open = self._opened < self.size
+                if can_open: self._opened += 1
+            db = self._open() if can_open else self._idle.get()
+        try: yield db
+        finally: self._idle.put(db)
+
+
+class SQLiteStore(SightingStore):
+    # 국명/종 번호/날짜에 인덱스를 둔 로컬 저장소. 중복 확인, 종별 기록, 개수 조회가 인덱스 질의가 됩니다.
+    # 사용자별 저장소는 같은 테이블의 user_id 파티션((user_id, bird_name) 인덱스)이고 연결 풀을 같이 씁니다.
+    # user가 None이면 user_id가 비어 있는 기존(한 사람용) 기록입니다.
+
+    def __init__(self, path, user=None, pool=None, pool_size=4):
+        self.path = path
+        self.user = user
+        self.user_id = user_key(user)
+        if pool is None:
+            pool = SQLitePool(path, size=pool_size)
+            self._create_schema(pool)
+        self.pool = pool
+
+    @staticmethod
+    def _create_schema(pool):
+        with pool.connection() as db, db:
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS sightings (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    No INTEGER, bird_name TEXT NOT NULL, sex TEXT, date TEXT,
+                    lat REAL, lon REAL, location TEXT, user_id TEXT
+                )""")
+            # 사용자 구분 전에 만든 DB에는 user_id 컬럼을 덧붙임 (기존 기록은 user_id 없음)
+            if "user_id" not in {row[1] for row in db.execute("PRAGMA table_info(sightings)")}:
+                db.execute("ALTER TABLE sightings ADD COLUMN user_id TEXT")
+            db.execute("CREATE INDEX IF NOT EXISTS idx_sightings_name ON sightings(bird_name)")
+            db.execute("CREATE INDEX IF NOT EXISTS idx_sightings_no ON sightings(No)")
+            db.execute("CREATE INDEX IF NOT EXISTS idx_sightings_date ON sightings(date)")
+            db.execute("CREATE INDEX IF NOT EXISTS idx_sightings_user_name ON sightings(user_id, bird_name)")
+            db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+            db.execute(f"""
+                CREATE TABLE IF NOT EXISTS rollups (
+                    user_id TEXT PRIMARY KEY, {', '.join(f'{c} {"TEXT" if c in ("name", "updated") else "INTEGER"}' for c in ROLLUP_COLUMNS[1:])}
+                )""")
+
+    def for_user(self, user):
+        if user == self.user: return self
+        return SQLiteStore(self.path, user=user, pool=self.pool)
+
+    def claim_legacy(self, user):
+        # user_id가 비어 있는 기존/시트에서 옮겨온 기록에 그 사용자의 키를 찍음 (여러 번 해도 같은 결과)
+        with self.pool.connection() as db, db:
+            return db.execute("UPDATE sightings SET user_id = ? WHERE user_id IS NULL", (user_key(user),)).rowcount
+
+    def _query(self, sql, params=()):
+        with self.pool.connection() as db:
+            return pd.read_sql_query(sql, db, params=params)
+
+    def read(self):
+        return self._query(f"SELECT {', '.join(SIGHTING_COLUMNS)} FROM sightings WHERE user_id IS ? ORDER BY id", (self.user_id,))
+
+    def _insert(self, db, rows):
+        values = [tuple(_sql_value(r.get(c)) for c in SIGHTING_COLUMNS) + (self.user_id,) for r in rows]
+        db.executemany(
+            f"INSERT INTO sightings ({', '.join(SIGHTING_COLUMNS)}, user_id) VALUES ({', '.join('?' * (len(SIGHTING_COLUMNS) + 1))})",
+            values)
+
+    def append_many(self, rows):
+        if not rows: return
+        with self.pool.connection() as db, db:
+            self._insert(db, rows)
+
+    def append_once(self, rows, marker, value):
+        # 행 추가와 meta 표시(marker)를 한 트랜잭션으로. BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡으므로
+        # 동시에 시작한 다른 프로세스는 표시를 보고 건너뜀. 이미 표시가 있으면 False
+        with self.pool.connection() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                if db.execute("SELECT 1 FROM meta WHERE key = ?", (marker,)).fetchone():
+                    db.rollback()
+                    return False
+                if rows: self._insert(db, rows)
+                db.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (marker, str(value)))
+                db.commit()
+                return True
+            except BaseException:
+                db.rollback()
+                raise
+
+    def delete_names(self, bird_names, current_df=None):
+        with self.pool.connection() as db, db:
+            db.executemany("DELETE FROM sightings WHERE user_id IS ? AND bird_name = ?", [(self.user_id, n) for n in bird_names])
+
+    def has_bird(self, bird_name, current_df=None):
+        with self.pool.connection() as db:
+            return db.execute("SELECT 1 FROM sightings WHERE user_id IS ? AND bird_name = ? LIMIT 1", (self.user_id, bird_name)).fetchone() is not None
+
+    def records_for(self, bird_name, current_df=None):
+        return self._query(
+            f"SELECT {', '.join(SIGHTING_COLUMNS)} FROM sightings WHERE user_id IS ? AND bird_name = ? ORDER BY date, id", (self.user_id, bird_name))
+
+    def count(self, current_df=None):
+        with self.pool.connection() as db:
+            return db.execute("SELECT COUNT(*) FROM sightings WHERE user_id IS ?", (self.user_id,)).fetchone()[0]
+
+    def put_rollup(self, row):
+        with self.pool.connection() as db, db:
+            db.execute(f"INSERT OR REPLACE INTO rollups ({', '.join(ROLLUP_COLUMNS)}) VALUES ({', '.join('?' * len(ROLLUP_COLUMNS))})",
+                       tuple(_sql_value(row.get(c)) for c in ROLLUP_COLUMNS))
+
+    def rollups(self):
+        return self._query(f"SELECT {', '.join(ROLLUP_COLUMNS)} FROM rollups")
+
+    def get_meta(self, key):
+        with self.pool.connection() as db:
+            row = db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key, value):
+        with self.pool.connection() as db, db:
+            db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+
+def migrate_from_sheet(source, target):
+    # 구글 시트 기록을 SQLite로 한 번만 옮깁니다. 이미 옮겼다면 아무것도 하지 않음
+    # (시트 읽기는 트랜잭션 밖에서, 행 추가와 완료 표시는 한 트랜잭션으로 — 중간에 죽거나 두 프로세스가 동시에 해도 한 번만)
+    if target.get_meta("migrated_from_sheet"): return 0
+    df = source.read()
+    rows = []
+    if df is not None and not df.empty:
+        for col in SIGHTING_COLUMNS:
+            if col not in df.columns: df[col] = None
+        rows = df[SIGHTING_COLUMNS].to_dict('records')
+    return len(rows) if target.append_once(rows, "migrated_from_sheet", len(rows)) else 0
+
+
+# --- [프로세스 공용 읽기 캐시] ---
+# 데이터 버전으로 구분되는 탐조 기록 캐시. 쓰기(저장/삭제) 시 새 버전으로 갱신되고,
+# max_staleness 초가 지나면 화면을 막지 않고 백그라운드에서 새로 읽어옵니다.
+# 버전 번호는 프로세스 전체에서 유일해서(사용자별 캐시끼리 겹치지 않음) 버전만으로 캐시 키를 삼아도 됩니다.
+
+_versions = itertools.count(1)
+
+
+class SightingsCache:
+    def __init__(self, loader, max_staleness=300):
+        self.loader = loader
+        self.max_staleness = max_staleness
+        self.version = 0
+        self.last_error = None
+        self._df = None
+        self._loaded_at = 0.0
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _same_content(a, b):
+        # write-through로 이어 붙인 프레임은 다시 읽은 프레임과 인덱스/dtype/행 순서가 달라 equals로는 늘 다름
+        # -> 저장 형태(storable)로 되돌려 문자열로 맞춘 뒤 정렬해서 비교
+        a, b = storable(a), storable(b)
+        if list(a.columns) != list(b.columns) or len(a) != len(b): return False
+        a, b = (f.astype(object).where(f.notna(), "").astype(str) for f in (a, b))
+        cols = list(a.columns)
+        return a.sort_values(cols, ignore_index=True).equals(b.sort_values(cols, ignore_index=True))
+
+    def _store(self, df, since_version=None):
+        # 내용이 바뀐 경우에만 버전을 올려서, 버전 기반 캐시들이 불필요하게 깨지지 않도록
+        with self._lock:
+            # 새로고침 도중에 저장/삭제가 있었다면 옛날 데이터로 덮어쓰지 않음
+            if since_version is not None and since_version != self.version: return
+            if self._df is None or not self._same_content(self._df, df): self.version = next(_versions)
+            self._df = df
+            self._loaded_at = time.monotonic()
+
+    def _refresh(self, since_version):
+        try:
+            self._store(self.loader(), since_version)
+            self.last_error = None
+        except Exception as e:
+            self.last_error = e  # 실패하면 기존 데이터를 계속 사용
+        finally:
+            with self._lock: self._refreshing = False
+
+    def get(self):
+        with self._lock:
+            df, version = self._df, self.version
+            # 확인과 표시를 한 잠금 안에서 해야 동시에 들어온 rerun들이 새로고침을 하나만 띄움
+            refresh = df is not None and not self._refreshing and time.monotonic() - self._loaded_at > self.max_staleness
+            if refresh: self._refreshing = True
+        if df is None:
+            self._store(self.loader())
+            with self._lock:
+                df, version = self._df, self.version
+        elif refresh:
+            threading.Thread(target=self._refresh, args=(version,), daemon=True).start()
+        # 호출하는 쪽에서 컬럼을 추가해도 캐시 원본은 그대로 남도록 얕은 복사본을 반환
+        out = df.copy(deep=False)
+        out.attrs['data_version'] = version
+        return out
+
+    def invalidate(self):
+        with self._lock:
+            self._df = None
+            self.version = next(_versions)
+
+    # 방금 쓴 내용을 캐시에도 바로 반영(write-through)해서 저장 직후 시트를 다시 읽지 않습니다.
+    # (이전 버전, 새 버전)을 돌려주므로 증분 계산(업적 엔진 등)이 버전을 맞춰 따라갈 수 있습니다.
+    # merge(기존 프레임, 새 행 목록)을 주면 이어 붙이기를 맡김 (타입을 맞춘 프레임 유지용)
+    def extend(self, rows, merge=None):
+        with self._lock:
+            before = self.version
+            if self._df is None:
+                self.version = next(_versions)
+                return before, self.version
+            if merge:
+                self._df = merge(self._df, rows)
+            else:
+                new = pd.DataFrame(rows)
+                self._df = pd.concat([self._df, new], ignore_index=True) if not self._df.empty else new
+            self.version = next(_versions)
+            return before, self.version
+
+    def drop_names(self, bird_names):
+        with self._lock:
+            before = self.version
+            if self._df is not None:
+                self._df = self._df[~self._df['bird_name'].isin(bird_names)]
+            self.version = next(_versions)
+            return before, self.version
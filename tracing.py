@@ -0,0 +1,234 @@
+import functools
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# --- [rerun 구간 계측] ---
+# rerun 한 번을 구간(span)으로 나눠 잽니다: get_data, 업적 계산, 사이드바, 탭별 화면, AI 판별, 시트 읽기/쓰기, 지도 직렬화.
+# 구간에는 행 수 같은 태그를 붙이고, rerun이 끝나면
+#  - log_path: 회전 로그 (rerun 하나 = JSON 한 줄, 최상위 구간별 ms)
+#  - prom_path: 구간/rerun별 누적 횟수·합계·최댓값을 Prometheus 텍스트 형식으로 (prom_interval초마다 덮어씀)
+# 에 남기고, slow_ms보다 오래 걸린 rerun은 중첩된 구간 전체 내역을 WARNING으로 한 번 더 남깁니다.
+# 설치(install)하지 않으면 span()은 미리 만들어 둔 빈 구간을 돌려줄 뿐이라 비용이 거의 없습니다.
+# rerun 기록은 스크립트 스레드별로 따로 두고, 다른 스레드(동시 AI 판별, 백그라운드 새로고침)의 구간은 누적 통계에만 들어갑니다.
+
+SLOW_MS = 1000
+PROM_INTERVAL_SEC = 5.0
+LOGGER_NAME = "bird_app.trace"
+METRIC_PREFIX = "bird_app"
+
+
+class _NullSpan:
+    def __enter__(self): return self
+    def __exit__(self, *exc): return False
+    def tag(self, **tags): pass
+
+
+NULL_SPAN = _NullSpan()
+
+
+class _Trace:
+    def __init__(self, name):
+        self.name = name
+        self.wall = time.time()
+        self.start = time.perf_counter()
+        self.last_end = self.start
+        self.depth = 0
+        self.spans = []   # (시작 ms, 깊이, 이름, ms, 태그) — 끝나는 순서대로 쌓임
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "tags", "trace", "depth", "start")
+
+    def __init__(self, tracer, name, tags):
+        self.tracer = tracer
+        self.name = name
+        self.tags = tags
+
+    def tag(self, **tags):
+        self.tags.update(tags)
+
+    def __enter__(self):
+        self.trace = trace = self.tracer._current()
+        if trace is not None:
+            self.depth = trace.depth
+            trace.depth += 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        ms = (end - self.start) * 1000
+        if exc_type is not None: self.tags["error"] = exc_type.__name__
+        trace = self.trace
+        if trace is not None:
+            trace.depth = self.depth
+            trace.last_end = end
+            trace.spans.append(((self.start - trace.start) * 1000, self.depth, self.name, ms, self.tags))
+        self.tracer._add("span", self.name, ms)
+        return False
+
+
+class Tracer:
+    def __init__(self, log_path=None, prom_path=None, slow_ms=SLOW_MS, max_bytes=5_000_000, backups=3,
+                 prom_interval=PROM_INTERVAL_SEC):
+        self.slow_ms = slow_ms
+        self.prom_path = prom_path
+        self.prom_interval = prom_interval
+        self.reruns = 0
+        self.slow_reruns = 0
+        self._stats = {}   # (종류, 이름) -> [횟수, 합계 ms, 최대 ms]
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._prom_written = 0.0
+        self.log = None
+        if log_path:
+            os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(log_path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+            self.log = logging.Logger(LOGGER_NAME)   # 앱/스트림릿 로거 설정과 섞이지 않도록 따로 만든 로거
+            self.log.addHandler(handler)
+
+    def _current(self):
+        return getattr(self._local, "trace", None)
+
+    def _add(self, kind, name, ms):
+        with self._lock:
+            stat = self._stats.get((kind, name))
+            if stat is None: self._stats[(kind, name)] = [1, ms, ms]
+            else:
+                stat[0] += 1
+                stat[1] += ms
+                if ms > stat[2]: stat[2] = ms
+
+    def span(self, name, tags):
+        return _Span(self, name, tags)
+
+    def begin(self, name):
+        # st.rerun()/st.stop()으로 끝까지 가지 못한 이전 rerun은 마지막 구간이 끝난 시점까지로 마감
+        previous = self._current()
+        if previous is not None: self._finish(previous, interrupted=True)
+        self._local.trace = _Trace(name)
+
+    def end(self):
+        trace = self._current()
+        if trace is None: return None
+        self._local.trace = None
+        return self._finish(trace)
+
+    @contextmanager
+    def rerun(self, name):
+        # 이미 rerun 기록 중이면 그 안의 구간으로, 아니면(프래그먼트만 다시 실행) 따로 rerun 하나로 기록
+        if self._current() is not None:
+            with _Span(self, name, {}) as s: yield s
+            return
+        self.begin(name)
+        try: yield NULL_SPAN
+        finally: self.end()
+
+    def _finish(self, trace, interrupted=False):
+        total = ((trace.last_end if interrupted else time.perf_counter()) - trace.start) * 1000
+        slow = total >= self.slow_ms
+        self._add("rerun", trace.name, total)
+        with self._lock:
+            self.reruns += 1
+            if slow: self.slow_reruns += 1
+        spans = sorted(trace.spans, key=lambda s: (s[0], s[1]))
+        record = {"rerun": trace.name, "at": round(trace.wall, 3), "ms": round(total, 1), "slow": slow,
+                  "spans": {name: round(ms, 1) for _, depth, name, ms, _ in spans if depth == 0}}
+        if interrupted: record["interrupted"] = True
+        if self.log:
+            self.log.info(json.dumps(record, ensure_ascii=False))
+            if slow: self.log.warning(breakdown(trace.name, total, spans, self.slow_ms))
+        if self.prom_path and time.monotonic() - self._prom_written >= self.prom_interval: self.write_prometheus()
+        return record
+
+    def stats(self):
+        with self._lock:
+            return {key: tuple(value) for key, value in self._stats.items()}
+
+    def prometheus_text(self):
+        stats = self.stats()
+        lines = []
+        for kind, label in (("rerun", "script"), ("span", "span")):
+            metric = f"{METRIC_PREFIX}_{kind}_seconds"
+            lines += [f"# HELP {metric} {kind} 소요 시간", f"# TYPE {metric} summary"]
+            for (k, name), (count, total, _) in sorted(stats.items()):
+                if k != kind: continue
+                lines.append(f'{metric}_count{{{label}="{_label(name)}"}} {count}')
+                lines.append(f'{metric}_sum{{{label}="{_label(name)}"}} {total / 1000:.6f}')
+            lines += [f"# HELP {metric}_max {kind} 최대 소요 시간", f"# TYPE {metric}_max gauge"]
+            for (k, name), (_, _, peak) in sorted(stats.items()):
+                if k == kind: lines.append(f'{metric}_max{{{label}="{_label(name)}"}} {peak / 1000:.6f}')
+        with self._lock: reruns, slow = self.reruns, self.slow_reruns
+        lines += [f"# TYPE {METRIC_PREFIX}_reruns_total counter", f"{METRIC_PREFIX}_reruns_total {reruns}",
+                  f"# TYPE {METRIC_PREFIX}_slow_reruns_total counter", f"{METRIC_PREFIX}_slow_reruns_total {slow}"]
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self):
+        # node_exporter textfile collector 등이 읽다가 반쯤 쓴 파일을 보지 않도록 임시 파일을 바꿔 끼움
+        self._prom_written = time.monotonic()
+        os.makedirs(os.path.dirname(self.prom_path) or ".", exist_ok=True)
+        tmp = f"{self.prom_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f: f.write(self.prometheus_text())
+        os.replace(tmp, self.prom_path)
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def breakdown(name, total, spans, slow_ms):
+    # 느린 rerun 내역: 시작 순서대로, 깊이만큼 들여쓴 구간별 ms + 태그
+    lines = [f"느린 rerun {name} {total:.1f} ms (기준 {slow_ms} ms)"]
+    for start, depth, span_name, ms, tags in spans:
+        tag_text = " ".join(f"{k}={v}" for k, v in tags.items())
+        lines.append(f"  {'  ' * depth}{span_name:<{max(1, 28 - 2 * depth)}} {ms:9.1f} ms  +{start:.0f}ms  {tag_text}".rstrip())
+    return "\n".join(lines)
+
+
+# --- 프로세스 전역 계측기 (앱에서 install로 켬) ---
+_tracer = None
+
+
+def install(tracer):
+    global _tracer
+    _tracer = tracer
+    return tracer
+
+
+def active():
+    return _tracer
+
+
+def span(name, **tags):
+    if _tracer is None: return NULL_SPAN
+    return _Span(_tracer, name, tags)
+
+
+def begin(name):
+    if _tracer is not None: _tracer.begin(name)
+
+
+def end():
+    if _tracer is not None: return _tracer.end()
+
+
+def rerun(name):
+    if _tracer is None: return NULL_SPAN
+    return _tracer.rerun(name)
+
+
+def traced(name):
+    # 프래그먼트 함수용: 앱 전체 rerun 안에서는 구간으로, 프래그먼트만 다시 돌 때는 rerun 하나로 기록
+    def wrap(fn):
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            if _tracer is None: return fn(*args, **kwargs)
+            with _tracer.rerun(name): return fn(*args, **kwargs)
+        return inner
+    return wrap
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlencode
+
+# --- [위키백과 사진 가져오기] ---
+# 스프라이트 파이프라인용 네트워크 계층.
+#  - 문서 이미지 조회는 한 번에 최대 50개 제목씩 묶어서 요청
+#  - 모든 요청은 연결 풀을 가진 requests.Session 하나로
+#  - 응답은 URL 기준으로 디스크에 저장하고, 다음 실행 때 ETag/Last-Modified로 재검증
+#    (offline=True면 저장된 응답만 재생해서 네트워크 없이 동작)
+#  - 이미지 조회 결과는 제목별로도 따로 저장해서, 이어하기로 묶음 구성이 달라져도 재생할 수 있음
+
+API_URL = "https://ko.wikipedia.org/w/api.php"
+HEADERS = {"User-Agent": "BirdApp/2.0"}
+CACHE_DIR = os.path.join(".cache", "http")
+MAX_TITLES = 50
+
+
+class OfflineMiss(Exception):
+    pass
+
+
+class HttpCache:
+    def __init__(self, cache_dir=CACHE_DIR):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.cache_dir, key + ".json"), os.path.join(self.cache_dir, key + ".body")
+
+    def load(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def store(self, url, headers, body):
+        meta_path, body_path = self._paths(url)
+        meta = {"url": url, "etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+        for path, data, mode in [(body_path, body, "wb"), (meta_path, json.dumps(meta), "w")]:
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+                f.write(data)
+            os.replace(tmp, path)
+
+
+class Fetcher:
+    def __init__(self, cache_dir=CACHE_DIR, offline=False, pool_size=16, timeout=15):
+        self.cache = HttpCache(cache_dir)
+        self.offline = offline
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.stats = {"network": 0, "revalidated": 0, "replayed": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name):
+        with self._lock: self.stats[name] += 1
+
+    def get(self, url, params=None):
+        full_url = f"{url}?{urlencode(sorted(params.items()))}" if params else url
+        meta, body = self.cache.load(full_url)
+        if self.offline:
+            if body is None: raise OfflineMiss(full_url)
+            self._count("replayed")
+            return body
+
+        headers = {}
+        if meta and meta.get("etag"): headers["If-None-Match"] = meta["etag"]
+        if meta and meta.get("last_modified"): headers["If-Modified-Since"] = meta["last_modified"]
+        res = self.session.get(full_url, headers=headers, timeout=self.timeout)
+        if res.status_code == 304 and body is not None:
+            self._count("revalidated")
+            return body
+        res.raise_for_status()
+        self._count("network")
+        self.cache.store(full_url, res.headers, res.content)
+        return res.content
+
+    def get_json(self, url, params=None):
+        return json.loads(self.get(url, params))
+
+    def _title_url(self, title, thumb_size):
+        # 제목별 조회 결과를 저장하는 캐시 키 (실제로 요청하는 URL은 아님)
+        return f"{API_URL}#pageimage:{thumb_size}:{title}"
+
+    def lookup_images(self, titles, thumb_size=1000):
+        # 제목 -> 대표 이미지 URL(없으면 None). 50개씩 묶어서 조회
+        result = {}
+        titles = list(titles)
+        if self.offline:
+            # 제목별 기록이 있으면 그대로, 없는 제목만 묶음 응답에서 찾음
+            for title in titles:
+                _, body = self.cache.load(self._title_url(title, thumb_size))
+                if body is not None:
+                    result[title] = json.loads(body)
+                    self._count("replayed")
+            titles = [t for t in titles if t not in result]
+        for i in range(0, len(titles), MAX_TITLES):
+            batch = titles[i:i + MAX_TITLES]
+            params = {"action": "query", "format": "json", "prop": "pageimages", "redirects": 1,
+                      "titles": "|".join(batch), "pithumbsize": thumb_size, "pilimit": MAX_TITLES}
+            try: query = self.get_json(API_URL, params).get("query", {})
+            except OfflineMiss:
+                # 저장된 응답이 없는 묶음은 사진 없음으로 (다음 온라인 실행에서 --retry-missing으로 다시)
+                for title in batch: result[title] = None
+                continue
+            # 요청한 제목이 정규화/넘겨주기로 바뀐 경우 원래 제목으로 되돌려 연결
+            renamed = {}
+            for item in query.get("normalized", []) + query.get("redirects", []):
+                renamed[item["to"]] = renamed.get(item["from"], item["from"])
+            for page in query.get("pages", {}).values():
+                title = page.get("title")
+                source = page.get("thumbnail", {}).get("source")
+                result[renamed.get(title, title)] = source
+            for title in batch:
+                result.setdefault(title, None)
+                self.cache.store(self._title_url(title, thumb_size), {}, json.dumps(result[title]).encode())
+        return result